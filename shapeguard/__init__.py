@@ -37,12 +37,25 @@ ML helpers (see ``shapeguard.ml``):
     def attention(q, k, v): ...
 """
 
-from shapeguard.broadcast import broadcast_shape, explain_broadcast
+from shapeguard.broadcast import (
+    analyze_broadcast,
+    broadcast_shape,
+    broadcast_shapes_batch,
+    explain_broadcast,
+)
+from shapeguard.buckets import bucketed
 from shapeguard.config import config
 from shapeguard.context import ShapeContext
 from shapeguard.core import Batch, Dim, UnificationContext
 from shapeguard.decorator import contract, ensures, expects
-from shapeguard.errors import BroadcastError, OutputShapeError, ShapeGuardError
+from shapeguard.dryrun import dry_run
+from shapeguard.errors import (
+    BroadcastCostWarning,
+    BroadcastError,
+    OutputShapeError,
+    ShapeGuardError,
+)
+from shapeguard.paths import PathSpec
 from shapeguard.spec import check_shape
 
 __version__ = "0.3.0"
@@ -56,15 +69,21 @@ __all__ = [
     "expects",
     "ensures",
     "contract",
+    "bucketed",
     "check_shape",
     "ShapeContext",
+    "PathSpec",
+    "dry_run",
     # Broadcasting
     "broadcast_shape",
+    "broadcast_shapes_batch",
     "explain_broadcast",
+    "analyze_broadcast",
     # Configuration
     "config",
     # Errors
     "ShapeGuardError",
     "OutputShapeError",
     "BroadcastError",
+    "BroadcastCostWarning",
 ]
@@ -7,7 +7,145 @@ and other array-like objects without importing them at module level.
 
 from __future__ import annotations
 
-from typing import Any
+import sys
+from collections.abc import Callable, Iterable
+from typing import Any, cast
+
+# JAX hooks, resolved once on first use after jax has been imported.
+# None means "not resolved yet"; a resolved-but-unavailable hook is a stub.
+_jit_probe: Callable[[], Any] | None = None
+_tracer_type: type | tuple[type, ...] | None = None
+
+
+def _never() -> bool:
+    return False
+
+
+def _resolve_jit_probe() -> Callable[[], Any]:
+    global _jit_probe
+    try:
+        from jax._src.core import unsafe_am_i_under_a_jit
+
+        _jit_probe = unsafe_am_i_under_a_jit
+    except Exception:
+        # JAX internals changed - assume never tracing
+        _jit_probe = _never
+    return _jit_probe
+
+
+def _resolve_tracer_type_if_needed() -> bool:
+    """Resolve the tracer type if jax is imported; True if it is available."""
+    if _tracer_type is None:
+        if "jax" not in sys.modules:
+            return False
+        _resolve_tracer_type()
+    return True
+
+
+def _resolve_tracer_type() -> type | tuple[type, ...]:
+    global _tracer_type
+    try:
+        from jax.core import Tracer
+
+        _tracer_type = Tracer
+    except Exception:
+        # Nothing is an instance of an empty tuple of types
+        _tracer_type = ()
+    return _tracer_type
+
+
+def _generic_shape(x: Any) -> tuple[int, ...]:
+    # Convert to tuple of ints to handle JAX's traced shapes
+    # and numpy's np.int64 dimension values
+    return tuple(int(d) for d in x.shape)
+
+
+def _native_shape(x: Any) -> tuple[int, ...]:
+    # Backends whose .shape is already a tuple of Python ints
+    return x.shape  # type: ignore[no-any-return]
+
+
+def _tuple_shape(x: Any) -> tuple[int, ...]:
+    # torch.Size is a tuple subclass of ints
+    return tuple(x.shape)
+
+
+def _checked_shape(x: Any) -> tuple[int, ...]:
+    # Usually a tuple of ints, but may hold symbolic dims
+    shape = x.shape
+    if type(shape) is tuple and all(type(d) is int for d in shape):
+        return shape
+    return tuple(_to_dim(d) for d in shape)
+
+
+def _to_dim(d: Any) -> Any:
+    # Symbolic dims (jax.export shape polymorphism) have no integer value;
+    # they are kept as-is and compare equal only to the same expression
+    try:
+        return int(d)
+    except Exception:
+        return d
+
+
+# Per-type dispatch: type -> (shape extractor or None, is_array).
+# Only types whose answer cannot vary between instances are cached.
+_TypeInfo = tuple[Callable[[Any], tuple[int, ...]] | None, bool]
+_type_info: dict[type, _TypeInfo] = {}
+
+
+def _known_shape_fn(tp: type) -> Callable[[Any], tuple[int, ...]] | None:
+    """Shape extractor for a known array type, or None if not a known backend."""
+    # Only consult backends that are already imported
+    np = sys.modules.get("numpy")
+    if np is not None and issubclass(tp, np.ndarray | np.generic):
+        return _native_shape
+
+    jax = sys.modules.get("jax")
+    if jax is not None:
+        if _resolve_tracer_type_if_needed() and issubclass(tp, _tracer_type):  # type: ignore[arg-type]
+            # Tracer shapes may be symbolic under shape polymorphism
+            return _checked_shape
+        if issubclass(tp, jax.Array):
+            return _native_shape
+        if issubclass(tp, jax.ShapeDtypeStruct):
+            return _checked_shape
+
+    torch = sys.modules.get("torch")
+    if torch is not None and issubclass(tp, torch.Tensor):
+        return _tuple_shape
+
+    return None
+
+
+def _lookup_type(x: Any) -> _TypeInfo:
+    """Resolve (and, when safe, cache) the dispatch entry for type(x)."""
+    tp = type(x)
+    info = _type_info.get(tp)
+    if info is not None:
+        return info
+
+    shape_fn = _known_shape_fn(tp)
+    if shape_fn is not None:
+        info = (shape_fn, True)
+        _type_info[tp] = info
+        return info
+
+    if hasattr(tp, "shape"):
+        # Declared on the class (property, slot, attribute): same for all instances
+        info = (_generic_shape, hasattr(tp, "dtype") or hasattr(x, "dtype"))
+        if hasattr(tp, "dtype") or not hasattr(x, "__dict__"):
+            _type_info[tp] = info
+        return info
+
+    if not hasattr(x, "__dict__"):
+        # No class-level shape and no per-instance attributes: never an array
+        info = (None, False)
+        _type_info[tp] = info
+        return info
+
+    # Instance attributes decide; don't cache
+    has_shape = hasattr(x, "shape")
+    return (_generic_shape if has_shape else None, has_shape and hasattr(x, "dtype"))
 
 
 def get_shape(x: Any) -> tuple[int, ...]:
@@ -17,6 +155,10 @@ def get_shape(x: Any) -> tuple[int, ...]:
     Works with NumPy arrays, JAX arrays, PyTorch tensors, and any object
     with a `.shape` attribute that returns an iterable of integers.
 
+    Known backends (NumPy, JAX, PyTorch, ``jax.ShapeDtypeStruct``) are
+    dispatched by type and return their native shape tuple without
+    per-dimension conversion.
+
     Args:
         x: Array-like object with a .shape attribute
 
@@ -26,14 +168,12 @@ def get_shape(x: Any) -> tuple[int, ...]:
     Raises:
         TypeError: If x doesn't have a shape attribute
     """
-    if not hasattr(x, "shape"):
+    shape_fn = _lookup_type(x)[0]
+    if shape_fn is None:
         raise TypeError(
             f"Cannot get shape from {type(x).__name__!r}: object has no 'shape' attribute"
         )
-
-    # Convert to tuple of ints to handle JAX's traced shapes
-    # and numpy's np.int64 dimension values
-    return tuple(int(d) for d in x.shape)
+    return shape_fn(x)
 
 
 def is_array(x: Any) -> bool:
@@ -42,8 +182,50 @@ def is_array(x: Any) -> bool:
 
     Returns True if x has both .shape and .dtype attributes,
     which is the common interface for NumPy, JAX, and PyTorch arrays.
+    The answer is cached per type where it cannot vary between instances.
     """
-    return hasattr(x, "shape") and hasattr(x, "dtype")
+    return _lookup_type(x)[1]
+
+
+def array_shape(x: Any) -> tuple[int, ...] | None:
+    """
+    Shape of x if it is an array-like (as ``is_array``), else None.
+
+    Same as ``get_shape(x) if is_array(x) else None`` with a single type
+    dispatch, for loops over many leaves.
+    """
+    shape_fn, array = _lookup_type(x)
+    return shape_fn(x) if array else None  # type: ignore[misc]
+
+
+def normalize_shape(shape_or_array: tuple[int, ...] | Any) -> tuple[int, ...]:
+    """Convert array-like or tuple to a shape tuple."""
+    if isinstance(shape_or_array, tuple):
+        return shape_or_array
+    if is_array(shape_or_array):
+        return get_shape(shape_or_array)
+    # Try to convert to tuple (handles lists, etc.)
+    try:
+        return tuple(shape_or_array)
+    except TypeError as err:
+        raise TypeError(f"Cannot interpret {type(shape_or_array).__name__!r} as a shape") from err
+
+
+def dtype_itemsize(dtype: Any) -> int | None:
+    """Bytes per element of a dtype (NumPy, JAX, PyTorch, a name, or an int), if known."""
+    if dtype is None:
+        return None
+    if isinstance(dtype, int):
+        return dtype
+    itemsize = getattr(dtype, "itemsize", None)
+    if isinstance(itemsize, int):
+        return itemsize
+    try:
+        import numpy as np
+
+        return int(np.dtype(dtype).itemsize)
+    except (ImportError, TypeError):
+        return None
 
 
 def get_array_backend(x: Any) -> str:
@@ -71,24 +253,81 @@ def is_jax_tracing() -> bool:
 
     Returns:
         True if JAX is tracing (inside jit, vmap, etc.), False otherwise.
-        Always returns False if JAX is not installed.
+        Always returns False if JAX is not installed or not yet imported.
 
     Note:
         Uses JAX's internal `unsafe_am_i_under_a_jit` function to detect
-        if we're inside a traced context.
+        if we're inside a traced context. The function is looked up once,
+        the first time this is called after JAX has been imported, so
+        NumPy-only code never imports JAX.
     """
+    probe = _jit_probe
+    if probe is None:
+        if "jax" not in sys.modules:
+            # Nothing can be traced before JAX is imported
+            return False
+        probe = _resolve_jit_probe()
     try:
-        from jax._src.core import unsafe_am_i_under_a_jit
-
-        return bool(unsafe_am_i_under_a_jit())
-    except ImportError:
-        # JAX not installed or API changed
-        return False
+        return bool(probe())
     except Exception:
         # JAX internals changed or other error - assume not tracing
         return False
 
 
+def is_tracer(x: Any) -> bool:
+    """Check if x is a JAX tracer (``jax.core.Tracer`` instance)."""
+    if not _resolve_tracer_type_if_needed():
+        return False
+    return isinstance(x, _tracer_type)  # type: ignore[arg-type]
+
+
+def any_tracer(values: Iterable[Any]) -> bool:
+    """
+    Check if any of the given values is a JAX tracer.
+
+    A cheaper, version-robust alternative to ``is_jax_tracing`` for call
+    arguments: JAX traces every array argument of a jitted function, so a
+    tracer among them means we are under a trace. For dicts, lists and
+    tuples, only the first leaf is inspected.
+    """
+    if not _resolve_tracer_type_if_needed():
+        return False
+
+    # Resolved by the call above
+    tracer_type = cast("type | tuple[type, ...]", _tracer_type)
+    for value in values:
+        # Peek at the first leaf of simple containers
+        while isinstance(value, dict | list | tuple) and value:
+            value = next(iter(value.values())) if isinstance(value, dict) else value[0]
+        if isinstance(value, tracer_type):
+            return True
+    return False
+
+
+_tree_flatten: Callable[[Any], tuple[list[Any], Any]] | None = None
+_tree_flatten_resolved = False
+
+
+def get_tree_flatten() -> Callable[[Any], tuple[list[Any], Any]] | None:
+    """
+    Return ``jax.tree_util.tree_flatten`` if JAX has been imported, else None.
+
+    Resolved once, on the first call after JAX is imported.
+    """
+    global _tree_flatten, _tree_flatten_resolved
+    if not _tree_flatten_resolved:
+        if "jax" not in sys.modules:
+            return None
+        try:
+            from jax.tree_util import tree_flatten
+
+            _tree_flatten = tree_flatten
+        except Exception:
+            _tree_flatten = None
+        _tree_flatten_resolved = True
+    return _tree_flatten
+
+
 def is_jax_installed() -> bool:
     """Check if JAX is available."""
     from importlib.util import find_spec
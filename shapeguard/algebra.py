@@ -0,0 +1,825 @@
+"""
+Symbolic shape algebra.
+
+Shape rules for common array operations (reshape, transpose, concatenate,
+stack, split, squeeze/expand_dims, matmul/dot_general, pad, slicing) that
+work on shapes whose entries are ints, Dims, or ``SymExpr`` polynomials of
+Dims, so the intermediate shapes of a model can be computed and checked
+without running anything.
+
+Every rule takes an optional ``UnificationContext``. Bound Dims are
+substituted by their values, and equalities a rule requires (the inner
+dims of a matmul, the total size of a reshape) bind unbound Dims where
+they determine them, so rules applied in sequence stay consistent with
+each other and with ``@expects``/``check_shape``.
+
+Usage:
+    from shapeguard import Dim
+    from shapeguard import algebra as sa
+
+    B, T, H, K = Dim("B"), Dim("T"), Dim("H"), Dim("K")
+    x = (B, T, sa.sym(H) * K)
+    heads = sa.reshape(x, (B, T, H, -1))           # (B, T, H, K)
+    h = sa.matmul(x, (sa.sym(H) * K, 4096))        # (B, T, 4096)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any, cast
+
+from shapeguard._compat import get_shape, is_array
+from shapeguard.core import Dim, UnificationContext
+from shapeguard.errors import RankMismatchError, ShapeGuardError
+
+# A monomial: Dims multiplied together, in canonical order (repeats are powers)
+_Mono = tuple[Dim, ...]
+_Terms = dict[_Mono, int]
+
+
+def _dim_key(dim: Dim) -> tuple[str, int]:
+    return (dim.name, id(dim))
+
+
+class SymExpr:
+    """
+    A polynomial of Dims with integer coefficients, e.g. ``T*D`` or ``n + m + 2``.
+
+    Results of shape rules that are not a single int or Dim. Supports
+    ``+``, ``-`` and ``*`` with ints, Dims and other expressions; wrap a
+    Dim with ``sym`` to start an expression. Expressions are compared
+    structurally, and one equal to an int or a Dim (``sym(n) == n``)
+    hashes like it.
+
+    Attributes:
+        terms: Monomial (tuple of Dims) -> coefficient
+    """
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms: _Terms) -> None:
+        self.terms = terms
+
+    def __add__(self, other: SymDim) -> SymDim:
+        return _add(self, other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: SymDim) -> SymDim:
+        return _add(self, _scale(other, -1))
+
+    def __rsub__(self, other: SymDim) -> SymDim:
+        return _add(other, _scale(self, -1))
+
+    def __mul__(self, other: SymDim) -> SymDim:
+        return _mul(self, other)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, int | Dim | SymExpr) and not isinstance(other, bool):
+            return _terms(self) == _terms(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Hash as the int or Dim an expression equals, so sym(d) == d hash alike
+        simple = _from_terms(self.terms)
+        if not isinstance(simple, SymExpr):
+            return hash(simple)
+        return hash(frozenset(simple.terms.items()))
+
+    def __repr__(self) -> str:
+        parts: list[str] = []
+        ordered = sorted(
+            self.terms.items(),
+            key=lambda item: (-len(item[0]), [_dim_key(d) for d in item[0]]),
+        )
+        for mono, coeff in ordered:
+            names = "*".join(d.name for d in mono)
+            if not mono:
+                text = str(abs(coeff))
+            elif abs(coeff) == 1:
+                text = names
+            else:
+                text = f"{abs(coeff)}*{names}"
+            if parts:
+                parts.append(f"- {text}" if coeff < 0 else f"+ {text}")
+            else:
+                parts.append(f"-{text}" if coeff < 0 else text)
+        return " ".join(parts)
+
+
+# One entry of a symbolic shape
+SymDim = int | Dim | SymExpr
+SymShape = tuple[SymDim, ...]
+
+
+def sym(value: SymDim) -> SymDim:
+    """
+    Lift an int or Dim into an expression, so arithmetic can be written directly.
+
+    Example:
+        ```python
+        sym(D) * 4      # 4*D
+        sym(n) + m + 1  # n + m + 1
+        ```
+    """
+    terms = _terms(value)
+    return SymExpr(terms) if isinstance(value, Dim) else _from_terms(terms)
+
+
+def _terms(value: Any) -> _Terms:
+    """The polynomial terms of an int, Dim or SymExpr."""
+    if isinstance(value, SymExpr):
+        return dict(value.terms)
+    if isinstance(value, Dim):
+        return {(value,): 1}
+    if isinstance(value, int) and not isinstance(value, bool):
+        return {(): value} if value else {}
+    raise TypeError(f"Invalid shape entry {value!r} (expected int, Dim or SymExpr)")
+
+
+def _from_terms(terms: _Terms) -> SymDim:
+    """Simplify terms to an int or a Dim where possible."""
+    terms = {mono: coeff for mono, coeff in terms.items() if coeff}
+    if not terms:
+        return 0
+    if len(terms) == 1:
+        ((mono, coeff),) = terms.items()
+        if not mono:
+            return coeff
+        if len(mono) == 1 and coeff == 1:
+            return mono[0]
+    return SymExpr(terms)
+
+
+def _add(a: SymDim, b: SymDim) -> SymDim:
+    if type(a) is int and type(b) is int:
+        return a + b
+    terms = _terms(a)
+    for mono, coeff in _terms(b).items():
+        terms[mono] = terms.get(mono, 0) + coeff
+    return _from_terms(terms)
+
+
+def _scale(a: SymDim, factor: int) -> SymDim:
+    return _from_terms({mono: coeff * factor for mono, coeff in _terms(a).items()})
+
+
+def _mul(a: SymDim, b: SymDim) -> SymDim:
+    if type(a) is int and type(b) is int:
+        return a * b
+    terms: _Terms = {}
+    for mono_a, coeff_a in _terms(a).items():
+        for mono_b, coeff_b in _terms(b).items():
+            mono = tuple(sorted(mono_a + mono_b, key=_dim_key))
+            terms[mono] = terms.get(mono, 0) + coeff_a * coeff_b
+    return _from_terms(terms)
+
+
+def _product(values: Iterable[SymDim]) -> SymDim:
+    result: SymDim = 1
+    for value in values:
+        result = _mul(result, value)
+    return result
+
+
+def _divide(a: SymDim, b: SymDim) -> SymDim | None:
+    """Exact quotient a / b for a monomial b, or None if it isn't a polynomial."""
+    divisor = _terms(b)
+    if len(divisor) != 1:
+        return None
+    ((mono_b, coeff_b),) = divisor.items()
+    terms: _Terms = {}
+    for mono, coeff in _terms(a).items():
+        if coeff % coeff_b:
+            return None
+        rest = list(mono)
+        for dim in mono_b:
+            if dim not in rest:
+                return None
+            rest.remove(dim)
+        terms[tuple(rest)] = coeff // coeff_b
+    return _from_terms(terms)
+
+
+def _cancel(a: SymDim, b: SymDim) -> tuple[SymDim, SymDim]:
+    """
+    Divide two monomials by the Dims they share, e.g. ``12*B*T, 4*B*T*H -> 12, 4*H``.
+
+    Assumes the shared Dims are non-zero. Anything but two monomials is
+    returned unchanged.
+    """
+    terms_a, terms_b = _terms(a), _terms(b)
+    if len(terms_a) != 1 or len(terms_b) != 1:
+        return a, b
+    ((mono_a, coeff_a),) = terms_a.items()
+    ((mono_b, coeff_b),) = terms_b.items()
+    rest_b = list(mono_b)
+    rest_a = []
+    for dim in mono_a:
+        if dim in rest_b:
+            rest_b.remove(dim)
+        else:
+            rest_a.append(dim)
+    return _from_terms({tuple(rest_a): coeff_a}), _from_terms({tuple(rest_b): coeff_b})
+
+
+def _substitute(value: SymDim, ctx: UnificationContext) -> SymDim:
+    """Replace bound Dims by their values."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, Dim):
+        bound = ctx.resolve(value)
+        return value if bound is None else bound
+    terms: _Terms = {}
+    for mono, coeff in value.terms.items():
+        rest = []
+        for dim in mono:
+            bound = ctx.resolve(dim)
+            if bound is None:
+                rest.append(dim)
+            else:
+                coeff *= bound
+        key = tuple(rest)
+        terms[key] = terms.get(key, 0) + coeff
+    return _from_terms(terms)
+
+
+def evaluate(shape: Sequence[SymDim], ctx: UnificationContext) -> SymShape:
+    """
+    Substitute bound Dims in a symbolic shape, simplifying to ints where possible.
+
+    Example:
+        ```python
+        ctx = check_shape(x, (B, T, D))
+        evaluate(reshape((B, T, D), (B, -1)), ctx)  # (2, 384)
+        ```
+    """
+    return tuple(_substitute(entry, ctx) for entry in shape)
+
+
+def _unify(a: SymDim, b: SymDim, ctx: UnificationContext, what: str) -> SymDim:
+    """
+    Require a == b, binding a Dim when the equation determines it.
+
+    Returns the simplified common value.
+
+    Raises:
+        ShapeGuardError: If a != b, or equality can't be decided
+        UnificationError: If solving contradicts an existing binding
+    """
+    a, b = _substitute(a, ctx), _substitute(b, ctx)
+    if a is b or (type(a) is int and a == b):
+        return a
+    if type(b) is int and b >= 0 and isinstance(a, Dim):
+        ctx.bind(a, b, what)
+        return b
+    if type(a) is int and a >= 0 and isinstance(b, Dim):
+        ctx.bind(b, a, what)
+        return a
+    diff = _terms(_add(a, _scale(b, -1)))
+    if not diff:
+        return a
+    unknowns = {dim for mono in diff for dim in mono}
+    if not unknowns:
+        raise ShapeGuardError(
+            f"{what}: {a} != {b}",
+            expected=a,
+            actual=b,
+            reason=f"{what}: sizes {a} and {b} differ",
+        )
+    if len(unknowns) == 1:
+        (dim,) = unknowns
+        linear = diff.get((dim,), 0)
+        if linear and set(diff) <= {(dim,), ()}:
+            # linear * dim + constant == 0
+            value, remainder = divmod(-diff.get((), 0), linear)
+            if remainder or value < 0:
+                raise ShapeGuardError(
+                    f"{what}: {a} == {b} has no size solution for {dim.name}",
+                    expected=a,
+                    actual=b,
+                    reason=f"{what}: {a} and {b} cannot be equal",
+                )
+            ctx.bind(dim, value, what)
+            return _substitute(a, ctx)
+    raise ShapeGuardError(
+        f"{what}: cannot prove {a} == {b}",
+        expected=a,
+        actual=b,
+        reason=f"{what}: cannot prove {a} == {b}; use the same Dim or bind the dims first",
+    )
+
+
+def _shape(shape: Sequence[SymDim] | Any) -> SymShape:
+    """A symbolic shape from a tuple/list of entries or an array."""
+    if is_array(shape):
+        return get_shape(shape)
+    result = tuple(shape)
+    for entry in result:
+        if type(entry) is not int and not isinstance(entry, Dim | SymExpr):
+            _terms(entry)  # raises for an invalid entry
+    return result
+
+
+def _axis(axis: int, ndim: int, op: str) -> int:
+    if not -ndim <= axis < ndim:
+        raise ValueError(f"{op}: axis {axis} is out of bounds for rank {ndim}")
+    return axis % ndim
+
+
+def _context(ctx: UnificationContext | None) -> UnificationContext:
+    return ctx if ctx is not None else UnificationContext()
+
+
+def check(
+    x: Any,
+    shape: Sequence[SymDim],
+    name: str = "array",
+    *,
+    ctx: UnificationContext | None = None,
+) -> UnificationContext:
+    """
+    Check an array's shape (or a concrete shape tuple) against a symbolic shape.
+
+    Like ``check_shape``, but entries may be ``SymExpr``; an expression
+    with a single unbound Dim in a linear term binds it (``T*D`` against
+    12 with ``T`` bound to 3 binds ``D`` to 4).
+
+    Returns:
+        The unification context (useful for chaining checks)
+
+    Raises:
+        ShapeGuardError: If the shape doesn't match
+    """
+    ctx = _context(ctx)
+    actual = _shape(x)
+    expected = tuple(shape)
+    if len(actual) != len(expected):
+        raise RankMismatchError(
+            argument=name,
+            expected_rank=len(expected),
+            actual_rank=len(actual),
+            expected_shape=expected,
+            actual_shape=actual,  # type: ignore[arg-type]
+            bindings=ctx.format_bindings(),
+        )
+    for i, (entry, size) in enumerate(zip(expected, actual, strict=True)):
+        try:
+            _unify(entry, size, ctx, f"{name}[{i}]")
+        except ShapeGuardError as e:
+            e.argument = name
+            if e.bindings is None:
+                e.bindings = ctx.format_bindings()
+            raise
+    return ctx
+
+
+# ---------------------------------------------------------------------------
+# Shape rules
+# ---------------------------------------------------------------------------
+
+
+def reshape(
+    shape: Sequence[SymDim] | Any,
+    new_shape: Sequence[SymDim | int],
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape after ``reshape``; one entry of ``new_shape`` may be -1.
+
+    Without a -1, the total sizes must be equal. Dims on both sides cancel
+    (assuming they are non-zero), and an unknown factor left alone on one
+    side is solved for: ``(B, T, 12) -> (B, T, H, 4)`` binds ``H`` to 3.
+
+    Raises:
+        ValueError: If ``new_shape`` has more than one -1
+        ShapeGuardError: If the sizes differ, or -1 can't be inferred exactly
+    """
+    ctx = _context(ctx)
+    old = evaluate(_shape(shape), ctx)
+    new = evaluate(_shape(new_shape), ctx)
+    unknown = [i for i, entry in enumerate(new) if isinstance(entry, int) and entry == -1]
+    if len(unknown) > 1:
+        raise ValueError(f"reshape: can only specify one unknown dimension, got {new_shape}")
+
+    total = _product(old)
+    if not unknown:
+        _unify(*_cancel(total, _product(new)), ctx, "reshape size")
+        return evaluate(new, ctx)
+
+    (index,) = unknown
+    known = _product(entry for i, entry in enumerate(new) if i != index)
+    inferred = _divide(total, known)
+    if inferred is None:
+        raise ShapeGuardError(
+            f"reshape: cannot infer -1 from {old} to {new}",
+            expected=new,
+            actual=old,
+            reason=f"reshape: size {total} is not a multiple of {known}",
+        )
+    return new[:index] + (inferred,) + new[index + 1 :]
+
+
+def transpose(
+    shape: Sequence[SymDim] | Any,
+    axes: Sequence[int] | None = None,
+) -> SymShape:
+    """
+    Shape after ``transpose``/``permute``; reverses the axes if ``axes`` is None.
+
+    Raises:
+        ValueError: If ``axes`` is not a permutation of the axes
+    """
+    dims = _shape(shape)
+    if axes is None:
+        return dims[::-1]
+    normalized = [_axis(axis, len(dims), "transpose") for axis in axes]
+    if sorted(normalized) != list(range(len(dims))):
+        raise ValueError(f"transpose: axes {tuple(axes)} are not a permutation of rank {len(dims)}")
+    return tuple(dims[axis] for axis in normalized)
+
+
+def concatenate(
+    shapes: Sequence[Sequence[SymDim] | Any],
+    axis: int = 0,
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape after ``concatenate`` along ``axis``: other dims must be equal.
+
+    Raises:
+        ValueError: If no shapes are given or ranks differ
+        ShapeGuardError: If a non-concatenated dim differs
+    """
+    ctx = _context(ctx)
+    parts = [evaluate(_shape(s), ctx) for s in shapes]
+    if not parts:
+        raise ValueError("concatenate: need at least one shape")
+    ndim = len(parts[0])
+    if any(len(part) != ndim for part in parts):
+        raise ValueError(f"concatenate: all shapes must have the same rank, got {parts}")
+    axis = _axis(axis, ndim, "concatenate")
+
+    result = list(parts[0])
+    for k, part in enumerate(parts[1:], start=1):
+        for i in range(ndim):
+            if i == axis:
+                result[i] = _add(result[i], part[i])
+            else:
+                result[i] = _unify(result[i], part[i], ctx, f"concatenate shape {k} dim {i}")
+    return evaluate(result, ctx)
+
+
+def stack(
+    shapes: Sequence[Sequence[SymDim] | Any],
+    axis: int = 0,
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape after ``stack``: all shapes must be equal; a new axis of their count is inserted.
+
+    Raises:
+        ValueError: If no shapes are given or ranks differ
+        ShapeGuardError: If shapes differ
+    """
+    ctx = _context(ctx)
+    parts = [evaluate(_shape(s), ctx) for s in shapes]
+    if not parts:
+        raise ValueError("stack: need at least one shape")
+    ndim = len(parts[0])
+    if any(len(part) != ndim for part in parts):
+        raise ValueError(f"stack: all shapes must have the same rank, got {parts}")
+    result = list(parts[0])
+    for k, part in enumerate(parts[1:], start=1):
+        for i in range(ndim):
+            result[i] = _unify(result[i], part[i], ctx, f"stack shape {k} dim {i}")
+    axis = _axis(axis, ndim + 1, "stack")
+    result.insert(axis, len(parts))
+    return evaluate(result, ctx)
+
+
+def split(
+    shape: Sequence[SymDim] | Any,
+    indices_or_sections: int | Sequence[int],
+    axis: int = 0,
+    *,
+    ctx: UnificationContext | None = None,
+) -> list[SymShape]:
+    """
+    Shapes after ``split`` into equal sections, or at the given indices.
+
+    Raises:
+        ValueError: If sections is not positive or indices are decreasing
+        ShapeGuardError: If the axis isn't divisible into equal sections
+    """
+    ctx = _context(ctx)
+    dims = evaluate(_shape(shape), ctx)
+    axis = _axis(axis, len(dims), "split")
+    size = dims[axis]
+
+    if isinstance(indices_or_sections, int):
+        sections = indices_or_sections
+        if sections < 1:
+            raise ValueError(f"split: number of sections must be positive, got {sections}")
+        piece = _divide(size, sections)
+        if piece is None:
+            raise ShapeGuardError(
+                f"split: {size} does not divide into {sections} equal sections",
+                actual=size,
+                reason=f"split: size {size} is not a multiple of {sections}",
+            )
+        sizes: list[SymDim] = [piece] * sections
+    else:
+        bounds = [0, *indices_or_sections]
+        if any(b < a for a, b in zip(bounds, bounds[1:], strict=False)):
+            raise ValueError(f"split: indices must be increasing, got {indices_or_sections}")
+        sizes = [b - a for a, b in zip(bounds, bounds[1:], strict=False)]
+        remainder = _add(size, -bounds[-1])
+        if isinstance(remainder, int) and remainder < 0:
+            raise ShapeGuardError(
+                f"split: index {bounds[-1]} is past the end of axis of size {size}",
+                actual=size,
+                reason=f"split: index {bounds[-1]} exceeds size {size}",
+            )
+        sizes.append(remainder)
+
+    return [dims[:axis] + (piece_size,) + dims[axis + 1 :] for piece_size in sizes]
+
+
+def squeeze(
+    shape: Sequence[SymDim] | Any,
+    axis: int | Sequence[int] | None = None,
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape after ``squeeze``.
+
+    With ``axis=None``, removes dims known to be 1 (unbound Dims are kept).
+    With axes, those dims must be 1, which binds unbound Dims to 1.
+
+    Raises:
+        ShapeGuardError: If a squeezed dim is not 1
+    """
+    ctx = _context(ctx)
+    dims = evaluate(_shape(shape), ctx)
+    if axis is None:
+        return tuple(d for d in dims if not (isinstance(d, int) and d == 1))
+    axes = {_axis(a, len(dims), "squeeze") for a in ([axis] if isinstance(axis, int) else axis)}
+    for a in sorted(axes):
+        _unify(dims[a], 1, ctx, f"squeeze dim {a}")
+    return tuple(d for i, d in enumerate(evaluate(dims, ctx)) if i not in axes)
+
+
+def expand_dims(shape: Sequence[SymDim] | Any, axis: int | Sequence[int]) -> SymShape:
+    """
+    Shape after ``expand_dims``: size-1 dims inserted at ``axis`` (in the result).
+
+    Raises:
+        ValueError: If an axis is out of range or repeated
+    """
+    dims = _shape(shape)
+    axes = [axis] if isinstance(axis, int) else list(axis)
+    ndim = len(dims) + len(axes)
+    normalized = {_axis(a, ndim, "expand_dims") for a in axes}
+    if len(normalized) != len(axes):
+        raise ValueError(f"expand_dims: repeated axis in {tuple(axes)}")
+    rest = iter(dims)
+    return tuple(1 if i in normalized else next(rest) for i in range(ndim))
+
+
+def broadcast(
+    *shapes: Sequence[SymDim] | Any,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Broadcast symbolic shapes (NumPy rules).
+
+    Only a literal (or bound) 1 broadcasts; Dims that are not bound are
+    assumed not to be 1, so they must equal the other sizes in their column.
+
+    Raises:
+        ShapeGuardError: If a column has different sizes other than 1
+    """
+    ctx = _context(ctx)
+    parts = [evaluate(_shape(s), ctx) for s in shapes]
+    ndim = max((len(part) for part in parts), default=0)
+    result: list[SymDim] = []
+    for offset in range(ndim, 0, -1):
+        size: SymDim = 1
+        for k, part in enumerate(parts):
+            if len(part) < offset:
+                continue
+            entry = part[-offset]
+            if isinstance(entry, int) and entry == 1:
+                continue
+            if isinstance(size, int) and size == 1:
+                size = entry
+            else:
+                size = _unify(size, entry, ctx, f"broadcast shape {k} dim {-offset}")
+        result.append(size)
+    return evaluate(result, ctx)
+
+
+def matmul(
+    a: Sequence[SymDim] | Any,
+    b: Sequence[SymDim] | Any,
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape of ``a @ b`` (NumPy ``matmul`` rules, including 1-D operands and batch broadcasting).
+
+    Raises:
+        ValueError: If an operand is 0-D
+        ShapeGuardError: If the inner dims differ or the batch dims don't broadcast
+    """
+    ctx = _context(ctx)
+    lhs, rhs = evaluate(_shape(a), ctx), evaluate(_shape(b), ctx)
+    if not lhs or not rhs:
+        raise ValueError("matmul: operands must be at least 1-D")
+    lhs_2d = lhs if len(lhs) > 1 else (1, *lhs)
+    rhs_2d = rhs if len(rhs) > 1 else (*rhs, 1)
+
+    _unify(lhs_2d[-1], rhs_2d[-2], ctx, "matmul inner dim")
+    batch = broadcast(lhs_2d[:-2], rhs_2d[:-2], ctx=ctx)
+    result = list(batch)
+    if len(lhs) > 1:
+        result.append(lhs_2d[-2])
+    if len(rhs) > 1:
+        result.append(rhs_2d[-1])
+    return evaluate(result, ctx)
+
+
+def dot_general(
+    lhs: Sequence[SymDim] | Any,
+    rhs: Sequence[SymDim] | Any,
+    dimension_numbers: tuple[
+        tuple[Sequence[int], Sequence[int]], tuple[Sequence[int], Sequence[int]]
+    ],
+    *,
+    ctx: UnificationContext | None = None,
+) -> SymShape:
+    """
+    Shape of ``jax.lax.dot_general``: batch dims, then lhs free dims, then rhs free dims.
+
+    Args:
+        lhs: Left operand shape
+        rhs: Right operand shape
+        dimension_numbers: ``((lhs_contracting, rhs_contracting), (lhs_batch, rhs_batch))``
+        ctx: Optional unification context
+
+    Raises:
+        ValueError: If the dimension numbers are malformed
+        ShapeGuardError: If paired contracting or batch dims differ
+    """
+    ctx = _context(ctx)
+    left, right = evaluate(_shape(lhs), ctx), evaluate(_shape(rhs), ctx)
+    (lhs_contract, rhs_contract), (lhs_batch, rhs_batch) = dimension_numbers
+    if len(lhs_contract) != len(rhs_contract) or len(lhs_batch) != len(rhs_batch):
+        raise ValueError(f"dot_general: unpaired dimension numbers {dimension_numbers}")
+
+    lc = [_axis(i, len(left), "dot_general") for i in lhs_contract]
+    rc = [_axis(i, len(right), "dot_general") for i in rhs_contract]
+    lb = [_axis(i, len(left), "dot_general") for i in lhs_batch]
+    rb = [_axis(i, len(right), "dot_general") for i in rhs_batch]
+    if len(set(lc + lb)) != len(lc + lb) or len(set(rc + rb)) != len(rc + rb):
+        raise ValueError(f"dot_general: repeated dimension in {dimension_numbers}")
+
+    for i, j in zip(lc, rc, strict=True):
+        _unify(left[i], right[j], ctx, f"dot_general contracting lhs[{i}] rhs[{j}]")
+    batch = [
+        _unify(left[i], right[j], ctx, f"dot_general batch lhs[{i}] rhs[{j}]")
+        for i, j in zip(lb, rb, strict=True)
+    ]
+    lhs_free = [d for i, d in enumerate(left) if i not in lc and i not in lb]
+    rhs_free = [d for j, d in enumerate(right) if j not in rc and j not in rb]
+    return evaluate(batch + lhs_free + rhs_free, ctx)
+
+
+def pad(
+    shape: Sequence[SymDim] | Any,
+    pad_width: int | Sequence[int] | Sequence[Sequence[int]],
+) -> SymShape:
+    """
+    Shape after ``numpy.pad``/``jnp.pad``.
+
+    ``pad_width`` is an int (both sides of every axis), a ``(before, after)``
+    pair for every axis, or one pair per axis.
+
+    Raises:
+        ValueError: If ``pad_width`` doesn't fit the rank or is negative
+    """
+    dims = _shape(shape)
+    widths: list[tuple[int, ...]]
+    if isinstance(pad_width, int):
+        widths = [(pad_width, pad_width)] * len(dims)
+    elif pad_width and all(isinstance(w, int) for w in pad_width):
+        if len(pad_width) != 2:
+            raise ValueError(f"pad: expected a (before, after) pair, got {pad_width}")
+        widths = [tuple(cast("Sequence[int]", pad_width))] * len(dims)
+    else:
+        widths = [tuple(w) for w in cast("Sequence[Sequence[int]]", pad_width)]
+        if len(widths) != len(dims) or any(len(w) != 2 for w in widths):
+            raise ValueError(f"pad: expected {len(dims)} (before, after) pairs, got {pad_width}")
+    if any(w < 0 for pair in widths for w in pair):
+        raise ValueError(f"pad: negative pad width in {pad_width}")
+    return tuple(_add(d, before + after) for d, (before, after) in zip(dims, widths, strict=True))
+
+
+def _slice_size(size: SymDim, s: slice, axis: int) -> SymDim:
+    """Length of ``size[s]``; symbolic sizes need a unit step and are assumed long enough."""
+    if isinstance(size, int):
+        return len(range(*s.indices(size)))
+    step = 1 if s.step is None else s.step
+    if step != 1:
+        raise ShapeGuardError(
+            f"slice: step {step} on symbolic dim {size} (axis {axis})",
+            actual=size,
+            reason=f"slice: cannot slice symbolic dim {size} with step {step}; bind it first",
+        )
+    start = 0 if s.start is None else s.start
+    stop = s.stop
+    # Resolve negative (from-the-end) bounds against the symbolic size
+    begin: SymDim = _add(size, start) if start < 0 else start
+    if stop is None:
+        end: SymDim = size
+    elif stop < 0:
+        end = _add(size, stop)
+    else:
+        end = stop
+    return _add(end, _scale(begin, -1))
+
+
+def slice_shape(shape: Sequence[SymDim] | Any, index: Any) -> SymShape:
+    """
+    Shape after basic indexing ``x[index]``: ints, slices, None and ``...``.
+
+    Integer indices drop their axis; None inserts a size-1 axis. Slices of
+    symbolic dims must have a unit step, and their bounds are assumed to
+    lie within the dim.
+
+    Raises:
+        ValueError: If there are too many indices, more than one ellipsis,
+            or an unsupported index type
+        IndexError: If an integer index is out of bounds for a known size
+    """
+    dims = _shape(shape)
+    items = index if isinstance(index, tuple) else (index,)
+    if sum(item is Ellipsis for item in items) > 1:
+        raise ValueError("slice: an index can only have a single ellipsis")
+    consumed = sum(1 for item in items if item is not None and item is not Ellipsis)
+    if consumed > len(dims):
+        raise ValueError(f"slice: too many indices for rank {len(dims)}: {index!r}")
+    if Ellipsis not in items:
+        items = (*items, Ellipsis)
+
+    result: list[SymDim] = []
+    axis = 0
+    for item in items:
+        if item is None:
+            result.append(1)
+        elif item is Ellipsis:
+            skip = len(dims) - consumed
+            result.extend(dims[axis : axis + skip])
+            axis += skip
+        elif isinstance(item, slice):
+            result.append(_slice_size(dims[axis], item, axis))
+            axis += 1
+        elif isinstance(item, int) and not isinstance(item, bool):
+            size = dims[axis]
+            if isinstance(size, int) and not -size <= item < size:
+                raise IndexError(
+                    f"slice: index {item} is out of bounds for axis {axis} of size {size}"
+                )
+            axis += 1
+        else:
+            raise ValueError(f"slice: unsupported index {item!r} (int, slice, None or ...)")
+    return tuple(result)
+
+
+__all__ = [
+    "SymExpr",
+    "SymDim",
+    "SymShape",
+    "sym",
+    "evaluate",
+    "check",
+    "reshape",
+    "transpose",
+    "concatenate",
+    "stack",
+    "split",
+    "squeeze",
+    "expand_dims",
+    "broadcast",
+    "matmul",
+    "dot_general",
+    "pad",
+    "slice_shape",
+]
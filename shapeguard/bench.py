@@ -0,0 +1,327 @@
+"""
+Micro-benchmarks for contract overhead.
+
+Measures the per-call cost that @expects, @ensures, @contract, check_shape
+and ShapeContext add on top of calling the undecorated function, across
+spec rank, argument count, ellipsis, PyTree depth/width and jit_mode.
+
+Usage:
+    python -m shapeguard.bench
+    python -m shapeguard.bench --filter expects --save baseline.json
+    python -m shapeguard.bench --compare baseline.json
+
+Reported per case:
+    ns/call      Time per call of the decorated function
+    overhead     ns/call minus the undecorated baseline
+    tracemalloc bytes/call
+                 Peak transient memory traced by tracemalloc during one call,
+                 minus the undecorated baseline. This is bytes, not an
+                 allocation count: zero means no allocation raised the
+                 high-water mark, not that nothing was allocated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from shapeguard.config import JitMode
+from shapeguard.context import ShapeContext
+from shapeguard.core import Dim
+from shapeguard.decorator import contract, ensures, expects
+from shapeguard.spec import check_shape
+
+
+class _Array:
+    """Minimal array stand-in used when NumPy is not installed."""
+
+    __slots__ = ("shape", "dtype")
+
+    def __init__(self, shape: tuple[int, ...]) -> None:
+        self.shape = shape
+        self.dtype = "float32"
+
+
+def _make_array(shape: tuple[int, ...]) -> Any:
+    try:
+        import numpy as np
+    except ImportError:
+        return _Array(shape)
+    return np.zeros(shape, dtype=np.float32)
+
+
+@dataclass
+class Case:
+    """A benchmark: call ``fn(*args)`` and compare against ``baseline(*args)``."""
+
+    name: str
+    fn: Callable[..., Any]
+    baseline: Callable[..., Any]
+    args: tuple[Any, ...]
+
+
+@dataclass
+class Result:
+    """Timing and memory for one case."""
+
+    name: str
+    ns_per_call: float
+    overhead_ns: float
+    bytes_per_call: float
+
+
+def _identity(*args: Any) -> Any:
+    return args[0] if args else None
+
+
+def _varargs_fn(n_args: int) -> Callable[..., Any]:
+    """Return a fresh function with parameters a0..a{n-1} (decorators need real names)."""
+    if n_args == 1:
+
+        def f1(a0: Any) -> Any:
+            return a0
+
+        return f1
+    if n_args == 2:
+
+        def f2(a0: Any, a1: Any) -> Any:
+            return a0
+
+        return f2
+    if n_args == 4:
+
+        def f4(a0: Any, a1: Any, a2: Any, a3: Any) -> Any:
+            return a0
+
+        return f4
+    if n_args == 8:
+
+        def f8(a0: Any, a1: Any, a2: Any, a3: Any, a4: Any, a5: Any, a6: Any, a7: Any) -> Any:
+            return a0
+
+        return f8
+    raise ValueError(f"no benchmark function with {n_args} arguments")
+
+
+def _nested_spec(depth: int, width: int, leaf: tuple[Any, ...]) -> Any:
+    if depth == 0:
+        return leaf
+    return {f"k{i}": _nested_spec(depth - 1, width, leaf) for i in range(width)}
+
+
+def _nested_value(depth: int, width: int, make_leaf: Callable[[], Any]) -> Any:
+    if depth == 0:
+        return make_leaf()
+    return {f"k{i}": _nested_value(depth - 1, width, make_leaf) for i in range(width)}
+
+
+def default_cases() -> list[Case]:
+    """Build the standard benchmark matrix."""
+    cases: list[Case] = []
+    dims = [Dim(f"d{i}") for i in range(8)]
+
+    # Spec rank, single argument
+    for rank in (1, 2, 4, 8):
+        spec = tuple(dims[:rank])
+        x = _make_array((2,) * rank)
+        f = _varargs_fn(1)
+        cases.append(Case(f"expects/rank={rank}", expects(a0=spec)(f), f, (x,)))
+
+    # Number of arguments sharing dims
+    for n_args in (1, 2, 4, 8):
+        spec = (dims[0], dims[1])
+        x = _make_array((3, 4))
+        f = _varargs_fn(n_args)
+        specs: dict[str, Any] = {f"a{i}": spec for i in range(n_args)}
+        decorated = expects(**specs)(f)
+        cases.append(Case(f"expects/args={n_args}", decorated, f, (x,) * n_args))
+
+    # Ellipsis vs fixed rank
+    x = _make_array((2, 3, 4, 5))
+    f = _varargs_fn(1)
+    with_ellipsis: tuple[Any, ...] = (..., dims[0], dims[1])
+    cases.append(Case("expects/ellipsis", expects(a0=with_ellipsis)(f), f, (x,)))
+    cases.append(
+        Case("expects/no-ellipsis", expects(a0=(None, None, dims[0], dims[1]))(f), f, (x,))
+    )
+
+    # PyTree depth and width
+    for depth, width in ((1, 2), (1, 8), (2, 4), (3, 4)):
+        spec = _nested_spec(depth, width, (dims[0], dims[1]))
+        value = _nested_value(depth, width, lambda: _make_array((3, 4)))
+        f = _varargs_fn(1)
+        cases.append(Case(f"expects/pytree={depth}x{width}", expects(a0=spec)(f), f, (value,)))
+
+    # jit_mode (outside JAX: measures the gating cost itself)
+    modes: tuple[JitMode, ...] = ("check", "warn", "skip", "trace")
+    for mode in modes:
+        f = _varargs_fn(1)
+        decorated = expects(a0=(dims[0], dims[1]), jit_mode=mode)(f)
+        cases.append(Case(f"expects/jit_mode={mode}", decorated, f, (_make_array((3, 4)),)))
+
+    # Output and combined contracts
+    x = _make_array((3, 4))
+    f = _varargs_fn(1)
+    cases.append(Case("ensures", ensures(result=(dims[0], dims[1]))(f), f, (x,)))
+    cases.append(
+        Case(
+            "expects+ensures",
+            expects(a0=(dims[0], dims[1]))(ensures(result=(dims[0], dims[1]))(f)),
+            f,
+            (x,),
+        )
+    )
+    cases.append(
+        Case(
+            "contract",
+            contract(inputs={"a0": (dims[0], dims[1])}, output=(dims[0], dims[1]))(f),
+            f,
+            (x,),
+        )
+    )
+
+    # Standalone checks
+    spec2 = (dims[0], dims[1])
+    cases.append(Case("check_shape", lambda a: check_shape(a, spec2, "x"), _identity, (x,)))
+
+    def shape_context(a: Any) -> Any:
+        return ShapeContext().check(a, spec2, "x").check(a, spec2, "y")
+
+    cases.append(Case("ShapeContext/2-checks", shape_context, _identity, (x,)))
+
+    return cases
+
+
+def _time_ns(
+    fn: Callable[..., Any], args: tuple[Any, ...], number: int | None, repeat: int
+) -> float:
+    timer = timeit.Timer(lambda: fn(*args))
+    if number is None:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def _bytes_per_call(fn: Callable[..., Any], args: tuple[Any, ...], calls: int = 50) -> float:
+    fn(*args)  # warm caches so one-time setup isn't counted
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - start
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def run(
+    cases: Iterable[Case],
+    *,
+    number: int | None = None,
+    repeat: int = 5,
+) -> list[Result]:
+    """
+    Run benchmark cases.
+
+    Args:
+        cases: Cases to run (see ``default_cases``)
+        number: Calls per timing loop; chosen automatically if None
+        repeat: Timing loops per case; the fastest is reported
+
+    Returns:
+        One Result per case
+    """
+    results = []
+    for case in cases:
+        base = _time_ns(case.baseline, case.args, number, repeat)
+        ns = _time_ns(case.fn, case.args, number, repeat)
+        base_bytes = _bytes_per_call(case.baseline, case.args)
+        results.append(
+            Result(
+                name=case.name,
+                ns_per_call=ns,
+                overhead_ns=ns - base,
+                bytes_per_call=max(0.0, _bytes_per_call(case.fn, case.args) - base_bytes),
+            )
+        )
+    return results
+
+
+def format_results(results: list[Result], baseline: dict[str, Result] | None = None) -> str:
+    """Format results as a table, with a delta column if a baseline is given."""
+    header = f"{'case':<28} {'ns/call':>10} {'overhead':>10} {'tracemalloc bytes/call':>22}"
+    if baseline is not None:
+        header += f" {'vs baseline':>12}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = (
+            f"{r.name:<28} {r.ns_per_call:>10.0f} {r.overhead_ns:>10.0f} {r.bytes_per_call:>22.0f}"
+        )
+        if baseline is not None:
+            old = baseline.get(r.name)
+            if old is None or old.overhead_ns <= 0:
+                line += f" {'n/a':>12}"
+            else:
+                change = (r.overhead_ns - old.overhead_ns) / old.overhead_ns * 100
+                line += f" {change:>+11.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def save_results(results: list[Result], path: str) -> None:
+    """Save results as a JSON baseline."""
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path: str) -> dict[str, Result]:
+    """Load a JSON baseline saved by ``save_results``, keyed by case name."""
+    with open(path) as f:
+        data = json.load(f)
+    return {r["name"]: Result(**r) for r in data["results"]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m shapeguard.bench",
+        description="Measure per-call overhead of shapeguard contracts.",
+    )
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--number", type=int, default=None, help="calls per timing loop")
+    parser.add_argument("--repeat", type=int, default=5, help="timing loops per case")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in default_cases() if args.filter in c.name]
+    if not cases:
+        print(f"No benchmark cases match {args.filter!r}", file=sys.stderr)
+        return 1
+
+    results = run(cases, number=args.number, repeat=args.repeat)
+    baseline = load_results(args.compare) if args.compare else None
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_results(results, args.save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
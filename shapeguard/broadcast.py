@@ -2,64 +2,97 @@
 
 from __future__ import annotations
 
-from typing import Any
+import functools
+import math
+import warnings
+from dataclasses import dataclass
+from typing import Any, cast
+
+from shapeguard._compat import array_shape, dtype_itemsize, normalize_shape
+from shapeguard.config import config
+from shapeguard.core import Dim, UnificationContext
+from shapeguard.errors import (
+    BroadcastCostWarning,
+    BroadcastError,
+    DimensionMismatchError,
+    RankMismatchError,
+)
+from shapeguard.spec import CompiledSpec, ShapeSpec
+
+
+def _broadcast_error(shapes: tuple[tuple[int, ...], ...]) -> BroadcastError:
+    """
+    Build the error for incompatible shapes.
 
-from shapeguard._compat import get_shape, is_array
-from shapeguard.errors import BroadcastError
+    Reports the conflict that folding the shapes left to right would hit
+    first: the earliest shape that conflicts with the broadcast of the ones
+    before it, and within that shape the leftmost conflicting dimension.
+    ``dim_values`` are that partial result's size and the shape's size.
+    """
+    max_len = max(len(shape) for shape in shapes)
+    first: tuple[int, int, int, int] | None = None  # (shape index, offset, running, size)
+    for offset in range(1, max_len + 1):
+        running = 1
+        for k, shape in enumerate(shapes):
+            size = shape[-offset] if len(shape) >= offset else 1
+            if size == 1 or size == running:
+                continue
+            if running == 1:
+                running = size
+                continue
+            # Earlier shape wins; for the same shape, the larger offset is further left
+            if first is None or k < first[0] or (k == first[0] and offset > first[1]):
+                first = (k, offset, running, size)
+            break
+
+    assert first is not None
+    _, offset, running, size = first
+    return BroadcastError(shapes=list(shapes), dim_index=-offset, dim_values=[running, size])
+
+
+@functools.lru_cache(maxsize=1024)
+def _broadcast_cached(
+    shapes: tuple[tuple[int, ...], ...], types: tuple[tuple[type, ...], ...]
+) -> tuple[int, ...]:
+    """Broadcast all shapes in one pass over the aligned dimensions."""
+    # types is part of the key: (2.0, 3) == (2, 3), but must not share a result
+    max_len = max(len(shape) for shape in shapes)
+    result = [1] * max_len
+    for shape in shapes:
+        offset = max_len - len(shape)
+        for i, size in enumerate(shape):
+            current = result[offset + i]
+            if size == current or size == 1:
+                continue
+            if current == 1:
+                result[offset + i] = size
+            else:
+                raise _broadcast_error(shapes)
+    return tuple(result)
 
 
-def _normalize_shape(shape_or_array: tuple[int, ...] | Any) -> tuple[int, ...]:
-    """Convert array-like or tuple to a shape tuple."""
-    if isinstance(shape_or_array, tuple):
-        return shape_or_array
-    if is_array(shape_or_array):
-        return get_shape(shape_or_array)
-    # Try to convert to tuple (handles lists, etc.)
+def _broadcast(shapes: tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    """``_broadcast_cached``, bypassing the cache for unhashable dimension values."""
     try:
-        return tuple(shape_or_array)
-    except TypeError as err:
-        raise TypeError(f"Cannot interpret {type(shape_or_array).__name__!r} as a shape") from err
-
-
-def _broadcast_two_shapes(
-    shape1: tuple[int, ...],
-    shape2: tuple[int, ...],
-) -> tuple[int, ...]:
-    """
-    Broadcast two shapes following NumPy rules.
-
-    Raises BroadcastError on incompatibility.
-    """
-    # Align shapes from the right by padding the shorter one with 1s
-    len1, len2 = len(shape1), len(shape2)
-    max_len = max(len1, len2)
+        return _broadcast_cached(shapes, tuple(tuple(map(type, shape)) for shape in shapes))
+    except TypeError:
+        return _broadcast_cached.__wrapped__(shapes, ())
 
-    # Pad shapes on the left with 1s
-    padded1 = (1,) * (max_len - len1) + shape1
-    padded2 = (1,) * (max_len - len2) + shape2
 
-    result = []
-    for i, (d1, d2) in enumerate(zip(padded1, padded2, strict=True)):
-        if d1 == d2:
-            result.append(d1)
-        elif d1 == 1:
-            result.append(d2)
-        elif d2 == 1:
-            result.append(d1)
-        else:
-            # Incompatible dimensions
-            # Convert index to negative (from right) for clearer error
-            dim_index = i - max_len
-            raise BroadcastError(
-                shapes=[shape1, shape2],
-                dim_index=dim_index,
-                dim_values=[d1, d2],
-            )
+def _broadcast_numpy(shapes: tuple[tuple[int, ...], ...]) -> tuple[int, ...] | None:
+    """``numpy.broadcast_shapes``, or None if NumPy is missing or the shapes don't broadcast."""
+    try:
+        import numpy as np
 
-    return tuple(result)
+        return tuple(int(d) for d in np.broadcast_shapes(*shapes))
+    except (ImportError, ValueError, TypeError):
+        return None
 
 
-def broadcast_shape(*shapes: tuple[int, ...] | Any) -> tuple[int, ...]:
+def broadcast_shape(
+    *shapes: tuple[int, ...] | Any,
+    use_numpy: bool = False,
+) -> tuple[int, ...]:
     """
     Compute the result shape from broadcasting multiple shapes.
 
@@ -68,8 +101,15 @@ def broadcast_shape(*shapes: tuple[int, ...] | Any) -> tuple[int, ...]:
     - Dimensions match if equal or one is 1
     - Missing dims on left treated as 1
 
+    All shapes are broadcast in a single pass, and results for recently
+    seen combinations of shapes are cached, so repeated calls in per-sample
+    code cost a dictionary lookup.
+
     Args:
         *shapes: Shapes as tuples or array-like objects
+        use_numpy: Delegate to ``numpy.broadcast_shapes`` when NumPy is
+            importable. Worth it only for many or very long shapes; errors
+            are still reported by ShapeGuard, identically.
 
     Returns:
         The broadcast result shape
@@ -78,6 +118,10 @@ def broadcast_shape(*shapes: tuple[int, ...] | Any) -> tuple[int, ...]:
         BroadcastError: If shapes are not broadcast-compatible
         ValueError: If no shapes are provided
 
+    Warns:
+        BroadcastCostWarning: If ``config.broadcast_max_bytes`` is set and
+            the result, at the inputs' dtypes, would exceed it
+
     Example:
         ```python
         >>> broadcast_shape((3, 1), (1, 4))
@@ -92,25 +136,385 @@ def broadcast_shape(*shapes: tuple[int, ...] | Any) -> tuple[int, ...]:
         raise ValueError("broadcast_shape requires at least one shape")
 
     # Normalize all inputs to tuples
-    normalized = [_normalize_shape(s) for s in shapes]
-
-    # Start with first shape and broadcast pairwise
-    result = normalized[0]
-    for shape in normalized[1:]:
-        try:
-            result = _broadcast_two_shapes(result, shape)
-        except BroadcastError as e:
-            # Re-raise with all original shapes for better error message
-            raise BroadcastError(
-                shapes=[_normalize_shape(s) for s in shapes],
-                dim_index=e.dim_index,
-                dim_values=e.dim_values,
-            ) from None
+    normalized = tuple(normalize_shape(s) for s in shapes)
+    if len(normalized) == 1:
+        return normalized[0]
+
+    result = _broadcast_numpy(normalized) if use_numpy else None
+    if result is None:
+        result = _broadcast(normalized)
 
+    if config._broadcast_max_bytes is not None:
+        _warn_if_costly(shapes, normalized, result, config._broadcast_max_bytes)
     return result
 
 
-def explain_broadcast(*shapes: tuple[int, ...] | Any) -> str:
+@dataclass(frozen=True)
+class BatchBroadcast:
+    """
+    Result of ``broadcast_shapes_batch``: one row per shape set.
+
+    Attributes:
+        shapes: ``(n, rank)`` int array of broadcast results, right-aligned
+            to the longest operand. Rows that fail to broadcast hold -1 in
+            their incompatible dimensions.
+        ok: ``(n,)`` bool mask, True where the row broadcasts.
+        incompatible: ``(n, rank)`` bool mask of conflicting dimensions.
+        dim_index: ``(n,)`` int array with the leftmost conflicting
+            dimension as a negative index (as ``BroadcastError.dim_index``),
+            0 where the row broadcasts.
+        operands: The input matrices, as passed in.
+    """
+
+    shapes: Any
+    ok: Any
+    incompatible: Any
+    dim_index: Any
+    operands: tuple[Any, ...]
+
+    def __len__(self) -> int:
+        return len(self.ok)
+
+    @property
+    def all_ok(self) -> bool:
+        """True if every row broadcasts."""
+        return bool(self.ok.all())
+
+    def failures(self) -> Any:
+        """Indices of the rows that fail to broadcast."""
+        return (~self.ok).nonzero()[0]
+
+    def row_shapes(self, row: int) -> tuple[tuple[int, ...], ...]:
+        """The input shapes of one row, as tuples."""
+        return tuple(tuple(int(d) for d in operand[row]) for operand in self.operands)
+
+    def error(self, row: int) -> BroadcastError | None:
+        """The ``BroadcastError`` ``broadcast_shape`` would raise for a row, or None."""
+        if self.ok[row]:
+            return None
+        return _broadcast_error(self.row_shapes(row))
+
+    def raise_if_any(self) -> None:
+        """
+        Raise the error of the first failing row, if any.
+
+        Raises:
+            BroadcastError: For the first failing row, its number in the reason
+        """
+        failures = self.failures()
+        if len(failures):
+            row = int(failures[0])
+            err = _broadcast_error(self.row_shapes(row))
+            err.reason = f"row {row} of {len(self)}: {err.reason}"
+            raise err
+
+
+def broadcast_shapes_batch(*operands: Any) -> BatchBroadcast:
+    """
+    Broadcast many shape sets at once, vectorized with NumPy.
+
+    Each operand is an ``(n, rank)`` integer matrix holding one shape per
+    row, e.g. the feature shapes of ``n`` examples; row ``i`` of every
+    operand forms one shape set. Operands may have different ranks and are
+    right-aligned as in ``broadcast_shape``. All rows are checked in a few
+    array operations instead of ``n`` Python calls, and failing rows are
+    reported through masks rather than exceptions.
+
+    Args:
+        *operands: Integer array-likes of shape ``(n, rank)``, all with the
+            same ``n``. A shape of lower rank can be padded on the left
+            with 1s to fit its matrix.
+
+    Returns:
+        A ``BatchBroadcast`` with per-row results, masks and failing dims
+
+    Raises:
+        ImportError: If NumPy is not installed
+        ValueError: If no operands are given, an operand is not a 2-D
+            matrix of non-negative integers, or the row counts differ
+
+    Example:
+        ```python
+        >>> features = np.array([[32, 1], [32, 10], [7, 3]])
+        >>> labels = np.array([[10], [10], [4]])
+        >>> batch = broadcast_shapes_batch(features, labels)
+        >>> batch.ok
+        array([ True,  True, False])
+        >>> batch.dim_index
+        array([ 0,  0, -1])
+        >>> batch.shapes[0]
+        array([32, 10])
+        ```
+    """
+    if not operands:
+        raise ValueError("broadcast_shapes_batch requires at least one operand")
+    try:
+        import numpy as np
+    except ImportError as err:
+        raise ImportError("broadcast_shapes_batch requires NumPy") from err
+
+    matrices = []
+    for i, operand in enumerate(operands):
+        matrix = np.asarray(operand)
+        if matrix.ndim != 2:
+            raise ValueError(
+                f"Operand {i} must be an (n, rank) matrix of shapes, got ndim={matrix.ndim}"
+            )
+        if matrix.size and not np.issubdtype(matrix.dtype, np.integer):
+            raise ValueError(f"Operand {i} must hold integers, got dtype {matrix.dtype}")
+        if matrix.size and matrix.min() < 0:
+            raise ValueError(f"Operand {i} holds negative dimension sizes")
+        matrices.append(matrix)
+
+    n = len(matrices[0])
+    for i, matrix in enumerate(matrices[1:], start=1):
+        if len(matrix) != n:
+            raise ValueError(f"Operand {i} has {len(matrix)} rows, expected {n}")
+
+    rank = max(matrix.shape[1] for matrix in matrices)
+    if rank == 0:
+        # Scalars only: every row broadcasts to ()
+        return BatchBroadcast(
+            shapes=np.ones((n, 0), dtype=np.int64),
+            ok=np.ones(n, dtype=bool),
+            incompatible=np.zeros((n, 0), dtype=bool),
+            dim_index=np.zeros(n, dtype=np.int64),
+            operands=tuple(operands),
+        )
+    # (operands, n, rank), right-aligned with 1s on the left
+    stacked = np.ones((len(matrices), n, rank), dtype=np.int64)
+    for k, matrix in enumerate(matrices):
+        if matrix.shape[1]:
+            stacked[k, :, rank - matrix.shape[1] :] = matrix
+
+    non_one = stacked != 1
+    has_size = non_one.any(axis=0)
+    # Sizes other than 1 must all agree: compare their max and min
+    high = np.where(non_one, stacked, -1).max(axis=0)
+    low = np.where(non_one, stacked, np.iinfo(np.int64).max).min(axis=0)
+    incompatible = has_size & (high != low)
+
+    shapes = np.where(has_size, high, 1)
+    shapes[incompatible] = -1
+    ok = ~incompatible.any(axis=1)
+    # Leftmost conflicting column, as a negative index
+    dim_index = np.where(ok, 0, incompatible.argmax(axis=1) - rank)
+
+    return BatchBroadcast(
+        shapes=shapes,
+        ok=ok,
+        incompatible=incompatible,
+        dim_index=dim_index,
+        operands=tuple(operands),
+    )
+
+
+def _format_bytes(n: int) -> str:
+    """Format a byte count with a binary unit, e.g. ``1.5 GiB``."""
+    size = float(n)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            return f"{n} B" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    raise AssertionError("unreachable")
+
+
+@dataclass(frozen=True)
+class InputExpansion:
+    """
+    How much one input is expanded by a broadcast.
+
+    Attributes:
+        shape: The input shape
+        elements: Number of elements in the input
+        expansion: Result elements per input element (1.0 if not expanded)
+        expanded_dims: Result dims (negative indices) where this input is
+            stretched from size 1 or missing
+        nbytes: Input size in bytes, if its dtype is known
+    """
+
+    shape: tuple[int, ...]
+    elements: int
+    expansion: float
+    expanded_dims: tuple[int, ...]
+    nbytes: int | None
+
+
+@dataclass(frozen=True)
+class BroadcastAnalysis:
+    """
+    Cost of materializing a broadcast result, from ``analyze_broadcast``.
+
+    Attributes:
+        shape: The broadcast result shape
+        elements: Number of elements in the result
+        itemsize: Bytes per result element, if known
+        nbytes: Result size in bytes, if the itemsize is known
+        inputs: Expansion of each input, in order
+        max_bytes: Threshold the result was compared against, if any
+    """
+
+    shape: tuple[int, ...]
+    elements: int
+    itemsize: int | None
+    nbytes: int | None
+    inputs: tuple[InputExpansion, ...]
+    max_bytes: int | None = None
+
+    @property
+    def max_expansion(self) -> float:
+        """The largest expansion ratio among the inputs."""
+        return max((item.expansion for item in self.inputs), default=1.0)
+
+    @property
+    def exceeds(self) -> bool:
+        """True if the result's size in bytes is known and above ``max_bytes``."""
+        return (
+            self.max_bytes is not None and self.nbytes is not None and self.nbytes > self.max_bytes
+        )
+
+    def format(self) -> list[str]:
+        """Report lines (unindented), as in ``explain_broadcast(..., costs=True)``."""
+        lines = []
+        for item in self.inputs:
+            if item.expanded_dims:
+                dims = ", ".join(str(d) for d in item.expanded_dims)
+                how = f"x{item.expansion:g}, stretched on dim {dims}"
+            else:
+                how = "not expanded"
+            size = f" ({_format_bytes(item.nbytes)})" if item.nbytes is not None else ""
+            lines.append(f"{item.shape}: {item.elements} elements{size} ({how})")
+
+        result = f"Result: {self.elements} elements"
+        if self.nbytes is not None:
+            result += f", {_format_bytes(self.nbytes)} at {self.itemsize} B/element"
+        else:
+            result += ", bytes unknown (pass dtype=)"
+        lines.append(result)
+        if self.exceeds:
+            assert self.max_bytes is not None
+            lines.append(f"WARNING: result exceeds the {_format_bytes(self.max_bytes)} threshold")
+        return lines
+
+
+def analyze_broadcast(
+    *shapes: tuple[int, ...] | Any,
+    dtype: Any = None,
+    max_bytes: int | None = None,
+) -> BroadcastAnalysis:
+    """
+    Report how much a broadcast expands each input, and what it costs.
+
+    Materializing a broadcast (``a + b`` with ``a`` of shape ``(B, 1, D)``
+    and ``b`` of shape ``(1, T, D)``) allocates the full result. This
+    reports, per input, the ratio of result elements to input elements and
+    the dims it is stretched on, plus the result's size in bytes when the
+    dtype is known.
+
+    Args:
+        *shapes: Shapes as tuples or array-like objects
+        dtype: Result dtype (NumPy/JAX/PyTorch dtype, name, or itemsize in
+            bytes). Defaults to the widest dtype among array inputs.
+        max_bytes: Threshold for ``BroadcastAnalysis.exceeds``. Defaults to
+            ``config.broadcast_max_bytes``.
+
+    Returns:
+        A ``BroadcastAnalysis``
+
+    Raises:
+        BroadcastError: If shapes are not broadcast-compatible
+        ValueError: If no shapes are provided
+
+    Example:
+        ```python
+        >>> report = analyze_broadcast((32, 1, 64), (1, 4096, 64), dtype="float32")
+        >>> report.inputs[0].expansion
+        4096.0
+        >>> report.nbytes
+        33554432
+        ```
+    """
+    if not shapes:
+        raise ValueError("analyze_broadcast requires at least one shape")
+    normalized = tuple(normalize_shape(s) for s in shapes)
+    result = broadcast_shape(*normalized)
+    return _analyze(shapes, normalized, result, dtype, max_bytes)
+
+
+def _analyze(
+    shapes: tuple[Any, ...],
+    normalized: tuple[tuple[int, ...], ...],
+    result: tuple[int, ...],
+    dtype: Any,
+    max_bytes: int | None,
+) -> BroadcastAnalysis:
+    elements = math.prod(result)
+    input_itemsizes = [
+        dtype_itemsize(getattr(s, "dtype", None)) if not isinstance(s, tuple) else None
+        for s in shapes
+    ]
+    itemsize = dtype_itemsize(dtype)
+    if itemsize is None:
+        itemsize = max((i for i in input_itemsizes if i is not None), default=None)
+
+    inputs = []
+    for shape, input_itemsize in zip(normalized, input_itemsizes, strict=True):
+        input_elements = math.prod(shape)
+        offset = len(result) - len(shape)
+        expanded = tuple(
+            i - len(result)
+            for i, size in enumerate(result)
+            if size != 1 and (i < offset or shape[i - offset] == 1)
+        )
+        inputs.append(
+            InputExpansion(
+                shape=shape,
+                elements=input_elements,
+                expansion=elements / input_elements if input_elements else 1.0,
+                expanded_dims=expanded,
+                nbytes=input_elements * input_itemsize if input_itemsize is not None else None,
+            )
+        )
+
+    return BroadcastAnalysis(
+        shape=result,
+        elements=elements,
+        itemsize=itemsize,
+        nbytes=elements * itemsize if itemsize is not None else None,
+        inputs=tuple(inputs),
+        max_bytes=config._broadcast_max_bytes if max_bytes is None else max_bytes,
+    )
+
+
+def _warn_if_costly(
+    shapes: tuple[Any, ...],
+    normalized: tuple[tuple[int, ...], ...],
+    result: tuple[int, ...],
+    max_bytes: int,
+) -> None:
+    """Warn if broadcasting array inputs would materialize more than max_bytes."""
+    if all(isinstance(s, tuple) for s in shapes):
+        # No dtypes to size the result with
+        return
+    report = _analyze(shapes, normalized, result, None, max_bytes)
+    if report.exceeds:
+        assert report.nbytes is not None
+        warnings.warn(
+            f"Broadcasting {', '.join(str(s) for s in normalized)} materializes "
+            f"{result} = {_format_bytes(report.nbytes)}, above "
+            f"config.broadcast_max_bytes ({_format_bytes(max_bytes)}); "
+            f"largest input expansion x{report.max_expansion:g}",
+            BroadcastCostWarning,
+            stacklevel=3,
+        )
+
+
+def explain_broadcast(
+    *shapes: tuple[int, ...] | Any,
+    costs: bool = False,
+    dtype: Any = None,
+    max_bytes: int | None = None,
+) -> str:
     """
     Return human-readable explanation of broadcast operation.
 
@@ -119,6 +523,12 @@ def explain_broadcast(*shapes: tuple[int, ...] | Any) -> str:
 
     Args:
         *shapes: Shapes as tuples or array-like objects
+        costs: Add a step reporting how much each input is expanded and
+            the result's size (see ``analyze_broadcast``). Implied by
+            ``dtype`` or ``max_bytes``.
+        dtype: Result dtype for the size in bytes (as in ``analyze_broadcast``)
+        max_bytes: Flag results larger than this many bytes. Defaults to
+            ``config.broadcast_max_bytes``.
 
     Returns:
         Multi-line string explaining the broadcast process
@@ -135,13 +545,20 @@ def explain_broadcast(*shapes: tuple[int, ...] | Any) -> str:
             dim -2: 1 → 5 (broadcast)
             dim -1: 4 = 4 (match)
           Result: (3, 5, 4)
+
+        >>> print(explain_broadcast((32, 1, 64), (1, 4096, 64), dtype="float32"))
+        ...
+          Step 3: Expansion cost
+            (32, 1, 64): 2048 elements (x4096, stretched on dim -2)
+            (1, 4096, 64): 262144 elements (x32, stretched on dim -3)
+            Result: 8388608 elements, 32.0 MiB at 4 B/element
         ```
     """
     if not shapes:
         return "No shapes provided"
 
     # Normalize all inputs
-    normalized = [_normalize_shape(s) for s in shapes]
+    normalized = [normalize_shape(s) for s in shapes]
 
     if len(normalized) == 1:
         return f"Single shape {normalized[0]}, no broadcasting needed"
@@ -212,4 +629,187 @@ def explain_broadcast(*shapes: tuple[int, ...] | Any) -> str:
         result_str = "(" + ", ".join(str(d) for d in result_dims) + ")"
         lines.append(f"  Result: {result_str}")
 
+        if costs or dtype is not None or max_bytes is not None:
+            report = _analyze(
+                shapes,
+                tuple(normalized),
+                # No dim is None without an incompatibility
+                cast("tuple[int, ...]", tuple(result_dims)),
+                dtype,
+                max_bytes,
+            )
+            lines.append("  Step 3: Expansion cost")
+            lines.extend(f"    {line}" for line in report.format())
+
     return "\n".join(lines)
+
+
+class BroadcastSpec(CompiledSpec):
+    """
+    A compiled spec matched under broadcasting rules.
+
+    Every dimension may also be 1, and a shape may omit leading dimensions
+    (treated as 1) unless the spec has an ellipsis. Slots are addressed
+    from the end, as broadcasting aligns shapes from the right. A size of 1
+    never binds a Dim, so Dims bind to the broadcast size; a Dim that only
+    ever sees 1 is bound to 1 by ``CompiledBroadcast.check``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, spec: ShapeSpec) -> None:
+        super().__init__(spec)
+        if not self.has_ellipsis:
+            # Right-align, so shapes of lower rank line up
+            self._steps = tuple(
+                (index - self.rank, dim, value) for index, dim, value in self._steps
+            )
+
+    def match(
+        self,
+        actual: tuple[int, ...],
+        ctx: UnificationContext,
+        source: str,
+    ) -> None:
+        """
+        Match an actual shape, accepting 1 for any dimension.
+
+        Raises:
+            RankMismatchError: If the shape has more dimensions than the spec
+                (or fewer than a spec with an ellipsis requires)
+            DimensionMismatchError: If a concrete dimension is neither its value nor 1
+            UnificationError: If a symbolic dimension conflicts with prior binding
+        """
+        n = len(actual)
+        if n > self.rank if not self.has_ellipsis else n < self.rank:
+            raise RankMismatchError(
+                expected_rank=f"{self.rank}+" if self.has_ellipsis else f"<={self.rank}",
+                actual_rank=n,
+                expected_shape=self.spec,
+                actual_shape=actual,
+                bindings=ctx.format_bindings(),
+            )
+
+        for index, dim, value in self._steps:
+            if index < -n:
+                # Missing leading dimension
+                continue
+            actual_dim = actual[index]
+            if actual_dim == 1:
+                continue
+            if dim is None:
+                if actual_dim != value:
+                    raise DimensionMismatchError(
+                        dim_index=index % n,
+                        expected_value=value,
+                        actual_value=actual_dim,
+                        expected_shape=self.spec,
+                        actual_shape=actual,
+                        bindings=ctx.format_bindings(),
+                    )
+            else:
+                ctx.bind_indexed(dim, actual_dim, source, index % n)
+
+    def __repr__(self) -> str:
+        return f"Broadcast{super().__repr__()}"
+
+
+class CompiledBroadcast:
+    """
+    The broadcast rule of a contract, compiled once per decorated function.
+
+    Arguments in the group are matched with ``BroadcastSpec`` plans. After
+    they bind their Dims, ``check`` verifies the group is mutually
+    broadcastable. Columns (aligned from the right) where every spec has
+    the same Dim or the same size are compatible by construction and are
+    skipped; only the remaining columns are compared at run time. Groups
+    with an ellipsis spec fall back to a full ``broadcast_shape``.
+
+    Attributes:
+        names: Argument names in the group
+        positions: Index of each argument among the checked arguments
+        plans: The ``BroadcastSpec`` of each argument
+    """
+
+    __slots__ = ("names", "positions", "plans", "_columns", "_dynamic", "_dims")
+
+    def __init__(self, plans: dict[str, BroadcastSpec], positions: tuple[int, ...]) -> None:
+        self.names = tuple(plans)
+        self.positions = positions
+        self.plans = tuple(plans.values())
+        self._dynamic = any(plan.has_ellipsis for plan in self.plans)
+        # Dim -> its (group index, step index) slots, to bind it to 1 if no
+        # argument bound it
+        dims: dict[Dim, list[tuple[int, int]]] = {}
+        for k, plan in enumerate(self.plans):
+            for index, dim, _ in plan._steps:
+                if dim is not None:
+                    dims.setdefault(dim, []).append((k, index))
+        self._dims = tuple((dim, tuple(slots)) for dim, slots in dims.items())
+
+        columns: list[tuple[int, tuple[int, ...]]] = []
+        if not self._dynamic:
+            max_rank = max((plan.rank for plan in self.plans), default=0)
+            for column in range(-max_rank, 0):
+                members = [k for k, plan in enumerate(self.plans) if plan.rank >= -column]
+                elements = {_column_element(self.plans[k], column) for k in members}
+                if len(members) > 1 and (len(elements) > 1 or None in elements):
+                    columns.append((column, tuple(members)))
+        self._columns = tuple(columns)
+
+    def check(self, values: list[Any], ctx: UnificationContext) -> None:
+        """
+        Verify the group's shapes broadcast together, after their specs matched.
+
+        Non-array values are skipped, as in input validation.
+
+        Raises:
+            BroadcastError: If the shapes are not mutually broadcastable
+        """
+        for dim, slots in self._dims:
+            if ctx.resolve(dim) is None:
+                self._bind_ones(dim, slots, values, ctx)
+        if not self._columns and not self._dynamic:
+            return
+
+        shapes = [array_shape(values[position]) for position in self.positions]
+        if self._dynamic:
+            present = tuple(shape for shape in shapes if shape is not None)
+            if len(present) > 1:
+                _broadcast(present)
+            return
+
+        for column, members in self._columns:
+            size = 1
+            for k in members:
+                shape = shapes[k]
+                if shape is None or len(shape) < -column:
+                    continue
+                actual = shape[column]
+                if actual == 1 or actual == size:
+                    continue
+                if size != 1:
+                    raise _broadcast_error(tuple(shape for shape in shapes if shape is not None))
+                size = actual
+
+    def _bind_ones(
+        self,
+        dim: Dim,
+        slots: tuple[tuple[int, int], ...],
+        values: list[Any],
+        ctx: UnificationContext,
+    ) -> None:
+        """Bind a Dim that was only ever seen as 1 (at a present slot) to 1."""
+        for k, index in slots:
+            shape = array_shape(values[self.positions[k]])
+            if shape is not None and index >= -len(shape):
+                ctx.bind_indexed(dim, 1, self.names[k], index % len(shape))
+                return
+
+    def __repr__(self) -> str:
+        return f"CompiledBroadcast({', '.join(self.names)})"
+
+
+def _column_element(plan: BroadcastSpec, column: int) -> Dim | int | None:
+    """The spec element of a right-aligned, ellipsis-free plan at a column."""
+    return plan.spec[plan.rank + column]  # type: ignore[return-value]
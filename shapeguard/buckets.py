@@ -0,0 +1,248 @@
+"""
+Padding to bucketed dimension sizes.
+
+A Dim can declare a set of bucket sizes. ``@bucketed`` pads the arguments
+of a shape-checked function along every bucketed dimension up to the
+next bucket before calling it, so a function behind ``jax.jit`` sees at
+most one shape per bucket instead of one per input length.
+
+Usage:
+    from shapeguard import Batch, Dim, expects
+    from shapeguard.buckets import bucketed
+
+    B, D = Batch(), Dim("D")
+    T = Dim("T", buckets=(128, 256, 512, 1024))
+
+    @bucketed(lengths="lengths")
+    @expects(x=(B, T, D), mask=(B, T))
+    @jax.jit
+    def encode(x, mask, lengths):
+        ...   # x.shape[1] is 128, 256, 512 or 1024; lengths["T"] is the true length
+
+    encode(x_of_length_300, mask)   # padded to T=512
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+from shapeguard._compat import get_array_backend, get_shape, is_array
+from shapeguard.core import Dim, UnificationContext
+from shapeguard.errors import ShapeGuardError
+from shapeguard.pytree import is_pytree_spec
+from shapeguard.spec import CompiledSpec, compile_spec
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (axis, Dim) of a bucketed dimension in a spec; axes after ``...`` are negative
+_Step = tuple[int, Dim]
+
+
+def pad_to_shape(x: Any, shape: tuple[int, ...], value: Any = 0) -> Any:
+    """
+    Pad an array at the end of each axis up to ``shape``, in one allocation.
+
+    Returns x itself if it already has that shape. Supports NumPy, JAX
+    (including tracers) and PyTorch arrays.
+
+    Args:
+        x: Array to pad
+        shape: Target shape, same rank as x and no smaller along any axis
+        value: Fill value for the padding
+
+    Raises:
+        ValueError: If shape has a different rank or a smaller size than x
+        TypeError: If x is not an array of a supported backend
+    """
+    current = get_shape(x)
+    if current == shape:
+        return x
+    if len(current) != len(shape) or any(t < n for n, t in zip(current, shape, strict=True)):
+        raise ValueError(f"Cannot pad shape {current} to {shape}")
+
+    backend = get_array_backend(x)
+    if backend == "numpy":
+        np = sys.modules["numpy"]
+        out = np.zeros(shape, x.dtype) if value == 0 else np.full(shape, value, x.dtype)
+        out[tuple(slice(0, n) for n in current)] = x
+        return out
+    if backend == "jax":
+        jnp = sys.modules["jax"].numpy
+        widths = [(0, t - n) for n, t in zip(current, shape, strict=True)]
+        return jnp.pad(x, widths, constant_values=value)
+    if backend == "torch":
+        functional = sys.modules["torch"].nn.functional
+        # torch pads from the last axis backwards, as (before, after) pairs
+        pads = [w for n, t in reversed(list(zip(current, shape, strict=True))) for w in (0, t - n)]
+        return functional.pad(x, pads, value=value)
+    raise TypeError(f"Cannot pad {type(x).__name__!r}: not a NumPy, JAX or PyTorch array")
+
+
+def _bucket_plans(specs: dict[str, Any]) -> dict[str, tuple[CompiledSpec, tuple[_Step, ...]]]:
+    """For each argument with a flat spec, its plan and (axis, Dim) pairs that have buckets."""
+    plans = {}
+    for name, spec in specs.items():
+        if not isinstance(spec, tuple) or is_pytree_spec(spec):
+            continue
+        plan = compile_spec(spec)
+        steps = tuple(
+            (index, dim)
+            for index, dim, _ in plan._steps
+            if dim is not None and dim.buckets is not None
+        )
+        if steps:
+            plans[name] = (plan, steps)
+    return plans
+
+
+def bucketed(
+    fn: F | None = None,
+    *,
+    lengths: str | None = None,
+    value: Any = 0,
+) -> F | Callable[[F], F]:
+    """
+    Pad arguments up to the buckets of their Dims before calling the function.
+
+    Place it above ``@expects``/``@contract``: it reads their specs, finds
+    the axes whose Dim declares ``buckets``, and pads each such argument
+    once, along all its bucketed axes, to the smallest bucket holding the
+    input size. The contract then validates the padded arrays.
+
+    Arguments sharing a bucketed Dim must agree on its size before padding
+    (otherwise padding would hide the mismatch). Only flat shape specs are
+    padded; PyTree arguments are passed through.
+
+    Args:
+        fn: Function decorated with ``@expects`` or ``@contract``
+        lengths: Name of a parameter of fn that receives the unpadded sizes,
+            as a dict of Dim name -> int, e.g. to build a mask. Keys are
+            names rather than Dims so that ``jax.jit`` can sort them.
+        value: Fill value for the padding
+
+    Raises:
+        ValueError: At decoration time, if fn has no specs, no spec uses a
+            Dim with buckets, ``lengths`` is not a parameter of fn, or (with
+            ``lengths``) two bucketed Dims share a name
+        UnificationError: If arguments disagree on a bucketed Dim's size
+        ShapeGuardError: If a size exceeds its Dim's largest bucket
+
+    Example:
+        ```python
+        T = Dim("T", buckets=(128, 256, 512))
+
+        @bucketed(lengths="lengths")
+        @expects(tokens=(B, T))
+        def embed(tokens, lengths):
+            mask = jnp.arange(tokens.shape[1]) < lengths["T"]
+            ...
+        ```
+    """
+
+    def decorator(fn: F) -> F:
+        fn_name = getattr(fn, "__qualname__", str(fn))
+        specs = getattr(fn, "__shapeguard_specs__", None)
+        if specs is None:
+            raise ValueError(
+                f"@bucketed: {fn_name} has no shape specs; "
+                "place @bucketed above @expects or @contract"
+            )
+        plans = _bucket_plans(specs)
+        if not plans:
+            raise ValueError(f"@bucketed: no spec of {fn_name} uses a Dim with buckets")
+        sig = inspect.signature(fn)
+        if lengths is not None and lengths not in sig.parameters:
+            raise ValueError(
+                f"@bucketed: lengths={lengths!r} is not a parameter of {fn_name}. "
+                f"Valid parameters: {sorted(sig.parameters)}"
+            )
+        if lengths is not None:
+            names: dict[str, Dim] = {}
+            for _, steps in plans.values():
+                for _, dim in steps:
+                    if names.setdefault(dim.name, dim) is not dim:
+                        raise ValueError(
+                            f"@bucketed: two bucketed Dims of {fn_name} are named "
+                            f"{dim.name!r}; lengths= is keyed by name"
+                        )
+        plan_items = tuple(plans.items())
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                bound = sig.bind_partial(*args, **kwargs)
+            except TypeError:
+                return fn(*args, **kwargs)
+            arguments = bound.arguments
+
+            # Unpadded size of every bucketed Dim, checked across arguments
+            ctx = UnificationContext()
+            shapes = {}
+            origin: dict[Dim, str] = {}
+            try:
+                for name, (plan, steps) in plan_items:
+                    x = arguments.get(name)
+                    if x is None or not is_array(x):
+                        continue
+                    shape = get_shape(x)
+                    n = len(shape)
+                    if n != plan.rank and (not plan.has_ellipsis or n < plan.rank):
+                        continue  # the contract reports the rank mismatch
+                    shapes[name] = shape
+                    for index, dim in steps:
+                        ctx.bind_indexed(dim, shape[index], name, index % n)
+                        origin.setdefault(dim, name)
+            except ShapeGuardError as e:
+                e.function = fn_name
+                raise
+
+            sizes = {dim: ctx.resolve(dim) for _, (_, steps) in plan_items for _, dim in steps}
+            targets = {}
+            for dim, size in sizes.items():
+                if size is None:
+                    continue
+                try:
+                    targets[dim] = dim.bucket(size)
+                except ValueError:
+                    # Plans only hold Dims that have buckets
+                    largest = cast("tuple[int, ...]", dim.buckets)[-1]
+                    raise ShapeGuardError(
+                        f"{dim.name}={size} exceeds the largest bucket {largest}",
+                        function=fn_name,
+                        argument=origin[dim],
+                        expected=f"{dim.name} <= {largest}",
+                        actual=size,
+                        reason=(
+                            f"{dim.name}={size} (from {ctx.get_binding_source(dim)}) exceeds "
+                            f"its largest bucket {largest}"
+                        ),
+                    ) from None
+
+            for name, (_, steps) in plan_items:
+                unpadded = shapes.get(name)
+                if unpadded is None:
+                    continue
+                padded = list(unpadded)
+                for index, dim in steps:
+                    padded[index] = targets[dim]
+                arguments[name] = pad_to_shape(arguments[name], tuple(padded), value)
+
+            if lengths is not None:
+                arguments[lengths] = {
+                    dim.name: size for dim, size in sizes.items() if size is not None
+                }
+            return fn(*bound.args, **bound.kwargs)
+
+        wrapper.__shapeguard_buckets__ = {name: steps for name, (_, steps) in plan_items}  # type: ignore
+        return wrapper  # type: ignore
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
+
+
+__all__ = ["bucketed", "pad_to_shape"]
@@ -0,0 +1,108 @@
+"""
+Per-function memoization of validated shape signatures.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from shapeguard.core import UnificationContext
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of a ShapeCache's counters."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ShapeCache:
+    """
+    Bounded LRU cache of shape signatures that already passed validation.
+
+    Keys are tuples of the actual input shapes (and, for PyTree specs, the
+    flat tuple of leaf shapes). Each entry stores the UnificationContext
+    produced by the input checks, so output checks (@ensures, @contract)
+    still see the input bindings on a cache hit.
+
+    PyTree arguments keep a second ShapeCache of their own (see
+    ``CompiledPyTree``), keyed on that argument's leaf shapes alone.
+
+    Enabled per function with ``cache=``:
+
+        @expects(x=(n, m), cache=64)
+        def f(x): ...
+
+        f.__shapeguard_cache__.info()  # CacheInfo(hits=..., misses=..., ...)
+
+    Only successful validations are cached; a failing call always raises.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_entries")
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be a positive integer, got {maxsize!r}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, UnificationContext] = OrderedDict()
+
+    def get(self, key: Any) -> UnificationContext | None:
+        """
+        Look up a shape signature, counting a hit or a miss.
+
+        Returns the cached input context (do not mutate it; copy first),
+        or None if the signature has not been validated yet.
+        """
+        ctx = self._entries.get(key)
+        if ctx is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return ctx
+
+    def put(self, key: Any, ctx: UnificationContext) -> None:
+        """Remember a validated signature, evicting the least recently used."""
+        self._entries[key] = ctx
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss counters and current size."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"ShapeCache(hits={self.hits}, misses={self.misses}, "
+            f"maxsize={self.maxsize}, currsize={len(self._entries)})"
+        )
+
+
+def clear_caches(fn: Any) -> None:
+    """
+    Drop every shape cache attached to a decorated function.
+
+    Clears both the signature cache (``fn.__shapeguard_cache__``) and the
+    per-argument PyTree caches (``fn.__shapeguard_tree_caches__``), releasing
+    their memory. Functions decorated without ``cache=`` are left as-is.
+    """
+    shape_cache = getattr(fn, "__shapeguard_cache__", None)
+    if shape_cache is not None:
+        shape_cache.clear()
+    for tree_cache in getattr(fn, "__shapeguard_tree_caches__", {}).values():
+        tree_cache.clear()
@@ -4,9 +4,53 @@ Global configuration for ShapeGuard.
 
 from __future__ import annotations
 
-from typing import Literal
+import os
+import random
+import warnings
+from typing import Any, Literal
 
-JitMode = Literal["check", "warn", "skip"]
+JitMode = Literal["check", "warn", "skip", "trace"]
+
+# How wrappers detect that they run under a JAX trace
+TraceDetection = Literal["probe", "arguments"]
+
+# Sampling policy: int N checks every Nth call, float p checks with probability p
+SampleRate = int | float
+
+# Environment variable read once at import time: "on" or "off"
+MODE_ENV_VAR = "SHAPEGUARD_MODE"
+
+
+def _enabled_from_env() -> bool:
+    """
+    Decide whether decorators install wrappers, from the environment.
+
+    ``SHAPEGUARD_MODE=off`` disables them, ``SHAPEGUARD_MODE=on`` forces them
+    on. When unset, they follow ``__debug__`` (off under ``python -O``).
+    """
+    mode = os.environ.get(MODE_ENV_VAR, "").strip().lower()
+    if mode == "off":
+        return False
+    if mode == "on":
+        return True
+    if mode:
+        warnings.warn(
+            f"Ignoring invalid {MODE_ENV_VAR}={mode!r}; expected 'on' or 'off'",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return __debug__
+
+
+def _validate_sample(value: SampleRate, name: str = "sample") -> SampleRate:
+    """Check a sampling policy: an int >= 1 or a float in (0, 1]."""
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        raise ValueError(f"Invalid {name}: {value!r}. Must be an int >= 1 or a float in (0, 1]")
+    if isinstance(value, int) and value < 1:
+        raise ValueError(f"Invalid {name}: {value!r}. Every-Nth sampling needs N >= 1")
+    if isinstance(value, float) and not 0.0 < value <= 1.0:
+        raise ValueError(f"Invalid {name}: {value!r}. Probability must be in (0, 1]")
+    return value
 
 
 class Config:
@@ -18,6 +62,29 @@ class Config:
             - "check": Always validate, raise on mismatch (default)
             - "warn": Validate, log warning on mismatch, continue
             - "skip": Skip validation entirely under JIT
+            - "trace": Validate only under JIT tracing (once per compilation);
+              calls that are not being traced skip all checks
+        enabled: Whether @expects/@ensures/@contract install a checking
+            wrapper. When False they return the decorated function unchanged
+            (zero call overhead), only attaching ``__shapeguard_*__`` metadata.
+            Initialized from ``SHAPEGUARD_MODE`` ("on"/"off") or, if unset,
+            ``__debug__``. Read at decoration time, so changing it does not
+            affect functions that are already decorated.
+        sample: Fraction of calls that decorated functions validate.
+            - 1 (default): check every call
+            - int N: check every Nth call (the 1st, N+1th, ...)
+            - float p: check each call with probability p
+            Can be overridden per function with ``sample=``.
+        trace_detection: How jit_mode decides that a call is under a JAX trace.
+            - "probe": Ask JAX whether it is tracing (default)
+            - "arguments": Check whether any argument is a ``jax.core.Tracer``;
+              cheaper and independent of JAX internals, but misses traces
+              where all arrays are closed over rather than passed in
+        broadcast_max_bytes: Size in bytes above which ``broadcast_shape``
+            warns (``BroadcastCostWarning``) that materializing the broadcast
+            result is expensive, and the default threshold of
+            ``analyze_broadcast``/``explain_broadcast``. Needs dtypes, so only
+            applies when arrays are passed. None (default) disables the check.
 
     Example:
         ```python
@@ -27,10 +94,26 @@ class Config:
         ```
     """
 
-    __slots__ = ("_jit_mode",)
+    __slots__ = (
+        "_jit_mode",
+        "_enabled",
+        "_sample",
+        "_trace_detection",
+        "_broadcast_max_bytes",
+        "_dry_run",
+        "_monitor",
+    )
 
     def __init__(self) -> None:
         self._jit_mode: JitMode = "check"
+        self._enabled: bool = _enabled_from_env()
+        self._sample: SampleRate = 1
+        self._trace_detection: TraceDetection = "probe"
+        self._broadcast_max_bytes: int | None = None
+        # Set by shapeguard.dryrun.checking(): validate every call as "check"
+        self._dry_run: bool = False
+        # Active shapeguard.recompile.RecompileMonitor, told about traced calls
+        self._monitor: Any = None
 
     @property
     def jit_mode(self) -> JitMode:
@@ -40,14 +123,123 @@ class Config:
     @jit_mode.setter
     def jit_mode(self, value: JitMode) -> None:
         """Set JIT mode with validation."""
-        valid_modes = ("check", "warn", "skip")
+        valid_modes = ("check", "warn", "skip", "trace")
         if value not in valid_modes:
             raise ValueError(f"Invalid jit_mode: {value!r}. Must be one of: {valid_modes}")
         self._jit_mode = value
 
+    @property
+    def enabled(self) -> bool:
+        """Whether decorators install checking wrappers."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        """Enable or disable wrappers for functions decorated from now on."""
+        if not isinstance(value, bool):
+            raise ValueError(f"Invalid enabled: {value!r}. Must be True or False")
+        self._enabled = value
+
+    @property
+    def sample(self) -> SampleRate:
+        """Get the global sampling policy."""
+        return self._sample
+
+    @sample.setter
+    def sample(self, value: SampleRate) -> None:
+        """Set the global sampling policy with validation."""
+        self._sample = _validate_sample(value)
+
+    @property
+    def trace_detection(self) -> TraceDetection:
+        """Get the JAX trace detection strategy."""
+        return self._trace_detection
+
+    @trace_detection.setter
+    def trace_detection(self, value: TraceDetection) -> None:
+        """Set the JAX trace detection strategy with validation."""
+        valid = ("probe", "arguments")
+        if value not in valid:
+            raise ValueError(f"Invalid trace_detection: {value!r}. Must be one of: {valid}")
+        self._trace_detection = value
+
+    @property
+    def broadcast_max_bytes(self) -> int | None:
+        """Get the broadcast result size threshold, in bytes."""
+        return self._broadcast_max_bytes
+
+    @broadcast_max_bytes.setter
+    def broadcast_max_bytes(self, value: int | None) -> None:
+        """Set the broadcast result size threshold with validation."""
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, int) or value < 0
+        ):
+            raise ValueError(
+                f"Invalid broadcast_max_bytes: {value!r}. Must be a non-negative int or None"
+            )
+        self._broadcast_max_bytes = value
+
     def __repr__(self) -> str:
-        return f"Config(jit_mode={self._jit_mode!r})"
+        return (
+            f"Config(jit_mode={self._jit_mode!r}, enabled={self._enabled!r}, "
+            f"sample={self._sample!r}, trace_detection={self._trace_detection!r}, "
+            f"broadcast_max_bytes={self._broadcast_max_bytes!r})"
+        )
 
 
 # Global singleton instance
 config = Config()
+
+
+class Sampler:
+    """
+    Per-function sampling decision with coverage counters.
+
+    Each decorated function owns one, exposed as ``fn.__shapeguard_sampler__``.
+    Wrappers ask ``should_check()`` before doing any shape work.
+
+    Attributes:
+        sample: Per-function policy, or None to follow ``config.sample``
+        checked: Number of calls that were validated
+        skipped: Number of calls that were sampled out
+    """
+
+    __slots__ = ("sample", "checked", "skipped", "_calls")
+
+    def __init__(self, sample: SampleRate | None = None) -> None:
+        self.sample = None if sample is None else _validate_sample(sample)
+        self.checked = 0
+        self.skipped = 0
+        self._calls = 0
+
+    def should_check(self) -> bool:
+        """Decide whether this call is validated, updating the counters."""
+        sample = config._sample if self.sample is None else self.sample
+        if sample == 1:
+            hit = True
+        elif isinstance(sample, int):
+            hit = self._calls % sample == 0
+            self._calls += 1
+        else:
+            hit = random.random() < sample
+
+        if hit:
+            self.checked += 1
+        else:
+            self.skipped += 1
+        return hit
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of calls validated so far (1.0 before any call)."""
+        total = self.checked + self.skipped
+        return self.checked / total if total else 1.0
+
+    def reset(self) -> None:
+        """Reset the counters."""
+        self.checked = 0
+        self.skipped = 0
+        self._calls = 0
+
+    def __repr__(self) -> str:
+        return f"Sampler(sample={self.sample!r}, checked={self.checked}, skipped={self.skipped})"
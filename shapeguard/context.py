@@ -9,7 +9,7 @@ from typing import Any
 from shapeguard._compat import get_shape
 from shapeguard.core import UnificationContext
 from shapeguard.errors import ShapeGuardError
-from shapeguard.spec import ShapeSpec, match_shape
+from shapeguard.spec import CompiledSpec, ShapeSpec, match_shape
 
 
 class ShapeContext:
@@ -53,7 +53,7 @@ class ShapeContext:
     def check(
         self,
         x: Any,
-        spec: ShapeSpec,
+        spec: ShapeSpec | CompiledSpec,
         name: str = "array",
     ) -> ShapeContext:
         """
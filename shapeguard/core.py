@@ -4,11 +4,19 @@ Core abstractions: Dim and UnificationContext.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass
 
-if TYPE_CHECKING:
-    pass
+
+def _validate_buckets(buckets: Iterable[int], name: str) -> tuple[int, ...]:
+    """Sorted, de-duplicated bucket sizes; each must be a positive int."""
+    sizes = tuple(buckets)
+    if not sizes or any(isinstance(b, bool) or not isinstance(b, int) or b < 1 for b in sizes):
+        raise ValueError(
+            f"Invalid buckets for dim {name!r}: {sizes!r}. Must be non-empty positive ints"
+        )
+    return tuple(sorted(set(sizes)))
 
 
 class Dim:
@@ -25,12 +33,34 @@ class Dim:
         def f(x, y): ...
 
     The name is used for error messages only.
+
+    A Dim may declare ``buckets``, the sizes it is padded up to by
+    ``@bucketed`` (see ``shapeguard.buckets``):
+
+        T = Dim("T", buckets=(128, 256, 512, 1024))
     """
 
-    __slots__ = ("name",)
+    __slots__ = ("name", "buckets")
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, buckets: Iterable[int] | None = None) -> None:
         self.name = name
+        self.buckets = _validate_buckets(buckets, name) if buckets is not None else None
+
+    def bucket(self, size: int) -> int:
+        """
+        The smallest bucket that holds ``size``.
+
+        Raises:
+            ValueError: If the Dim has no buckets, or size exceeds the largest
+        """
+        if self.buckets is None:
+            raise ValueError(f"Dim {self.name!r} has no buckets")
+        i = bisect.bisect_left(self.buckets, size)
+        if i == len(self.buckets):
+            raise ValueError(
+                f"Size {size} of dim {self.name!r} exceeds its largest bucket {self.buckets[-1]}"
+            )
+        return self.buckets[i]
 
     def __repr__(self) -> str:
         return self.name
@@ -68,8 +98,8 @@ class Batch(Dim):
 
     __slots__ = ()
 
-    def __init__(self, name: str = "batch") -> None:
-        super().__init__(name)
+    def __init__(self, name: str = "batch", buckets: Iterable[int] | None = None) -> None:
+        super().__init__(name, buckets)
 
 
 # Sentinel for ellipsis in shape specs
@@ -101,18 +131,30 @@ class Binding:
     source: str  # e.g., "x.shape[1]"
 
 
+def _format_source(source: str, index: int) -> str:
+    """Materialize a binding source; index -1 means the source is used as-is."""
+    return source if index < 0 else f"{source}[{index}]"
+
+
 class UnificationContext:
     """
     Tracks dimension bindings during shape checking.
 
     Maintains a mapping from Dim objects to their bound integer values,
     along with source information for error messages.
+
+    Binding a dimension stores only its value plus the (source, index) pair
+    it came from; source strings such as ``"x[1]"`` are formatted only when
+    an error or a caller asks for them.
     """
 
-    bindings: dict[Dim, Binding] = field(default_factory=dict)
+    __slots__ = ("_values", "_sources", "_indices")
 
     def __init__(self) -> None:
-        self.bindings: dict[Dim, Binding] = {}
+        self._values: dict[Dim, int] = {}
+        # Binding origins, parallel to the insertion order of _values
+        self._sources: list[str] = []
+        self._indices: list[int] = []
 
     def bind(self, dim: Dim, value: int, source: str) -> None:
         """
@@ -126,36 +168,90 @@ class UnificationContext:
         Raises:
             UnificationError: If dim is already bound to a different value
         """
-        from shapeguard.errors import UnificationError
-
-        if dim in self.bindings:
-            existing = self.bindings[dim]
-            if existing.value != value:
-                raise UnificationError(
-                    dim=dim,
-                    expected_value=existing.value,
-                    expected_source=existing.source,
-                    actual_value=value,
-                    actual_source=source,
-                )
-        else:
-            self.bindings[dim] = Binding(value=value, source=source)
+        self.bind_indexed(dim, value, source, -1)
+
+    def bind_indexed(self, dim: Dim, value: int, source: str, index: int) -> None:
+        """
+        Bind a dimension read from ``source[index]``.
+
+        Same as ``bind(dim, value, f"{source}[{index}]")`` without building
+        the string unless it ends up in an error message.
+
+        Raises:
+            UnificationError: If dim is already bound to a different value
+        """
+        existing = self._values.get(dim)
+        if existing is None:
+            self._values[dim] = value
+            self._sources.append(source)
+            self._indices.append(index)
+        elif existing != value:
+            from shapeguard.errors import UnificationError
+
+            raise UnificationError(
+                dim=dim,
+                expected_value=existing,
+                expected_source=self.get_binding_source(dim),  # type: ignore[arg-type]
+                actual_value=value,
+                actual_source=_format_source(source, index),
+            )
+
+    def update(self, other: UnificationContext) -> None:
+        """
+        Bind every dimension bound in other, in other's binding order.
+
+        Raises:
+            UnificationError: If a dimension is already bound here to a different value
+        """
+        for (dim, value), source, index in zip(
+            other._values.items(), other._sources, other._indices, strict=True
+        ):
+            self.bind_indexed(dim, value, source, index)
+
+    @property
+    def bindings(self) -> dict[Dim, Binding]:
+        """
+        Current bindings as Binding records.
+
+        The dict is a snapshot built on each access: modifying it does not
+        change the context (use ``bind``), and it doesn't reflect later
+        bindings.
+        """
+        return {
+            dim: Binding(value=value, source=self._source_at(pos))
+            for pos, (dim, value) in enumerate(self._values.items())
+        }
+
+    def copy(self) -> UnificationContext:
+        """Return a new context with the same bindings."""
+        ctx = UnificationContext()
+        ctx._values = dict(self._values)
+        ctx._sources = list(self._sources)
+        ctx._indices = list(self._indices)
+        return ctx
 
     def resolve(self, dim: Dim) -> int | None:
         """
         Get the bound value for a dimension, or None if unbound.
         """
-        binding = self.bindings.get(dim)
-        return binding.value if binding else None
+        return self._values.get(dim)
 
     def get_binding_source(self, dim: Dim) -> str | None:
         """Get the source description for a dimension's binding."""
-        binding = self.bindings.get(dim)
-        return binding.source if binding else None
+        for pos, bound in enumerate(self._values):
+            if bound is dim:
+                return self._source_at(pos)
+        return None
 
     def format_bindings(self) -> str:
         """Format current bindings for error messages."""
-        if not self.bindings:
+        if not self._values:
             return "{}"
-        parts = [f"{dim.name}={b.value} (from {b.source})" for dim, b in self.bindings.items()]
+        parts = [
+            f"{dim.name}={value} (from {self._source_at(pos)})"
+            for pos, (dim, value) in enumerate(self._values.items())
+        ]
         return "{" + ", ".join(parts) + "}"
+
+    def _source_at(self, pos: int) -> str:
+        return _format_source(self._sources[pos], self._indices[pos])
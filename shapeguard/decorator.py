@@ -7,80 +7,48 @@ from __future__ import annotations
 import functools
 import inspect
 import logging
-from collections.abc import Callable
+import warnings
+from collections.abc import Callable, Iterable
 from typing import Any, TypeVar
 
-from shapeguard._compat import get_shape, is_array, is_jax_tracing
-from shapeguard.config import JitMode, config
+from shapeguard._compat import any_tracer, array_shape, get_shape, is_array, is_jax_tracing
+from shapeguard.broadcast import BroadcastSpec, CompiledBroadcast
+from shapeguard.cache import ShapeCache
+from shapeguard.config import JitMode, Sampler, SampleRate, config
 from shapeguard.core import UnificationContext
 from shapeguard.errors import OutputShapeError, ShapeGuardError
-from shapeguard.spec import ShapeSpec, match_shape
+from shapeguard.paths import CompiledPathSpec, PathSpec
+from shapeguard.pytree import CompiledPyTree, PyTreeSpec, is_pytree_spec
+from shapeguard.spec import CompiledSpec, compile_spec
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 logger = logging.getLogger("shapeguard")
 
 
-# Type for PyTree shape specs (nested dicts)
-PyTreeSpec = dict[str, Any] | ShapeSpec
+# A compiled PyTree: a container spec or a path-pattern spec
+CompiledTree = CompiledPyTree | CompiledPathSpec
 
+# A PyTreeSpec compiled for validation: a CompiledSpec for a single shape,
+# a CompiledTree for a container of shapes
+CompiledPyTreeSpec = CompiledTree | CompiledSpec
 
-def _check_pytree(
-    value: Any,
-    spec: PyTreeSpec,
-    ctx: UnificationContext,
-    source: str,
-    fn_name: str,
-) -> None:
-    """
-    Recursively check a value against a PyTree spec.
 
-    Handles nested dicts and arrays.
-    """
-    if isinstance(spec, dict):
-        # Spec is a dict - value should be a dict-like with matching keys
-        if not isinstance(value, dict):
-            raise ShapeGuardError(
-                f"Expected dict for {source}, got {type(value).__name__}",
-                function=fn_name,
-                argument=source,
-                expected="dict",
-                actual=type(value).__name__,
-            )
-
-        for key, sub_spec in spec.items():
-            if key not in value:
-                raise ShapeGuardError(
-                    f"Missing key '{key}' in {source}",
-                    function=fn_name,
-                    argument=source,
-                    expected=f"key '{key}'",
-                    actual=f"keys: {list(value.keys())}",
-                )
-            _check_pytree(value[key], sub_spec, ctx, f"{source}[{key!r}]", fn_name)
-
-    elif isinstance(spec, tuple):
-        # Spec is a shape tuple - value should be an array
-        if not is_array(value):
-            raise ShapeGuardError(
-                f"Expected array for {source}, got {type(value).__name__}",
-                function=fn_name,
-                argument=source,
-                expected="array",
-                actual=type(value).__name__,
-            )
-
-        actual = get_shape(value)
-        try:
-            match_shape(actual, spec, ctx, source)
-        except ShapeGuardError as e:
-            e.function = fn_name
-            raise
-
-    else:
-        raise TypeError(
-            f"Invalid spec for {source}: {spec!r}. Expected tuple (shape) or dict (pytree)."
-        )
+def _compile_pytree_spec(
+    spec: PyTreeSpec | PathSpec, source: str, cache: int | None = None
+) -> CompiledPyTreeSpec:
+    """Compile an argument spec: a shape tuple or a PyTree of them (with its own cache)."""
+    tree_cache = ShapeCache(cache) if cache is not None else None
+    if isinstance(spec, PathSpec):
+        return CompiledPathSpec(spec, source, tree_cache)
+    if is_pytree_spec(spec):
+        return CompiledPyTree(spec, source, tree_cache)
+    if isinstance(spec, tuple):
+        return compile_spec(spec)
+    raise TypeError(
+        f"Invalid spec for {source}: {spec!r}. Expected tuple (shape) or "
+        f"dict, list, tuple, NamedTuple or dataclass of specs (pytree)."
+    )
 
 
 def _is_output_tuple_spec(spec: Any) -> bool:
@@ -90,25 +58,44 @@ def _is_output_tuple_spec(spec: Any) -> bool:
     return isinstance(spec[0], (tuple, dict, list))
 
 
+# Compiled output spec: a CompiledSpec (single array), a tuple of per-element
+# plans (tuple output), or a CompiledTree (dicts, other containers, path patterns)
+CompiledOutputSpec = CompiledSpec | tuple[CompiledPyTreeSpec, ...] | CompiledTree
+
+
+def _compile_output_spec(spec: Any) -> CompiledOutputSpec:
+    """Compile an output spec once, at decoration time."""
+    if _is_output_tuple_spec(spec) and type(spec) is tuple:
+        return tuple(
+            _compile_pytree_spec(elem_spec, f"result[{i}]") for i, elem_spec in enumerate(spec)
+        )
+    if isinstance(spec, PathSpec):
+        return CompiledPathSpec(spec, "result")
+    if is_pytree_spec(spec):
+        return CompiledPyTree(spec, "result")
+    return compile_spec(spec)
+
+
 def _check_output(
     output: Any,
-    spec: Any,
+    spec: CompiledOutputSpec,
     ctx: UnificationContext,
     fn_name: str,
 ) -> None:
     """
-    Validate a function's return value against an output spec.
+    Validate a function's return value against a compiled output spec.
 
     Supports:
     - Single array: spec is a flat shape tuple e.g. (n, k)
     - Tuple of arrays: spec is a tuple of shape tuples e.g. ((n, m), (n,))
     - Dict of arrays: spec is a dict e.g. {"logits": (B, vocab), "h": (B, D)}
+    - Other PyTrees: lists, NamedTuples, dataclasses of shape specs
     - Scalar: spec is () (empty tuple)
     """
     try:
-        if isinstance(spec, dict):
-            _check_pytree(output, spec, ctx, "result", fn_name)
-        elif _is_output_tuple_spec(spec):
+        if isinstance(spec, CompiledTree):
+            spec.check(output, ctx, fn_name)
+        elif isinstance(spec, tuple):
             if not isinstance(output, (tuple, list)):
                 raise OutputShapeError(
                     f"Expected tuple output from {fn_name}, got {type(output).__name__}",
@@ -125,29 +112,29 @@ def _check_output(
                 )
             for i, (elem, elem_spec) in enumerate(zip(output, spec, strict=True)):
                 source = f"result[{i}]"
-                if isinstance(elem_spec, dict):
-                    _check_pytree(elem, elem_spec, ctx, source, fn_name)
+                if isinstance(elem_spec, CompiledTree):
+                    elem_spec.check(elem, ctx, fn_name)
                 else:
                     if not is_array(elem):
                         raise OutputShapeError(
                             f"Expected array for {source}, got {type(elem).__name__}",
                             function=fn_name,
-                            expected=elem_spec,
+                            expected=elem_spec.spec,
                             actual=type(elem).__name__,
                         )
                     actual = get_shape(elem)
-                    match_shape(actual, elem_spec, ctx, source)
+                    elem_spec.match(actual, ctx, source)
         else:
             # Single array spec
             if not is_array(output):
                 raise OutputShapeError(
                     f"Expected array output from {fn_name}, got {type(output).__name__}",
                     function=fn_name,
-                    expected=spec,
+                    expected=spec.spec,
                     actual=type(output).__name__,
                 )
             actual = get_shape(output)
-            match_shape(actual, spec, ctx, "result")
+            spec.match(actual, ctx, "result")
     except ShapeGuardError as e:
         e.function = fn_name
         if e.argument is None:
@@ -157,9 +144,316 @@ def _check_output(
         raise
 
 
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_KEYWORD = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+_VARIADIC = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+
+class _ArgExtractor:
+    """
+    Pull checked argument values straight from ``(args, kwargs)``.
+
+    Each checked parameter is resolved at decoration time to a positional
+    index and/or keyword name plus its default, so a call costs a few tuple
+    and dict lookups instead of ``Signature.bind`` + ``apply_defaults``.
+    Signatures where a checked parameter is ``*args`` or ``**kwargs`` fall
+    back to ``bind``.
+
+    Calling the extractor returns the values in ``names`` order, or None if
+    the call would not bind (the wrapper then lets the function raise its
+    own TypeError).
+    """
+
+    __slots__ = (
+        "_sig",
+        "_names",
+        "_slots",
+        "_max_positional",
+        "_keyword_names",
+        "_positional_keywords",
+        "_required_positional",
+        "_required_keyword",
+        "_use_bind",
+    )
+
+    def __init__(self, sig: inspect.Signature, names: tuple[str, ...]) -> None:
+        params = list(sig.parameters.values())
+        positional = [p for p in params if p.kind in _POSITIONAL]
+        kinds = {p.kind for p in params}
+
+        self._sig = sig
+        self._names = names
+        self._use_bind = any(sig.parameters[name].kind in _VARIADIC for name in names)
+
+        # Shape of a well-formed call, checked before extraction so
+        # malformed calls still fall through to the function's TypeError
+        self._max_positional = (
+            None if inspect.Parameter.VAR_POSITIONAL in kinds else len(positional)
+        )
+        self._keyword_names = (
+            None
+            if inspect.Parameter.VAR_KEYWORD in kinds
+            else frozenset(p.name for p in params if p.kind in _KEYWORD)
+        )
+        # Names a positional argument may also be given by, in position order
+        # (None for positional-only params, which **kwargs may reuse)
+        self._positional_keywords = tuple(
+            p.name if p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD else None
+            for p in positional
+        )
+        # Required positional params are always the leading ones
+        self._required_positional = tuple(
+            (p.name, p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            for p in positional
+            if p.default is inspect.Parameter.empty
+        )
+        self._required_keyword = tuple(
+            p.name
+            for p in params
+            if p.kind is inspect.Parameter.KEYWORD_ONLY and p.default is inspect.Parameter.empty
+        )
+
+        # (name, positional index or -1, accepts keyword, default)
+        positional_index = {p.name: i for i, p in enumerate(positional)}
+        self._slots = tuple(
+            (
+                name,
+                positional_index.get(name, -1),
+                sig.parameters[name].kind is not inspect.Parameter.POSITIONAL_ONLY,
+                sig.parameters[name].default,
+            )
+            for name in names
+        )
+
+    def __call__(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[Any] | None:
+        if self._use_bind:
+            return self._bind(args, kwargs)
+
+        n_args = len(args)
+        if self._max_positional is not None and n_args > self._max_positional:
+            return None
+        if kwargs and self._keyword_names is not None and not kwargs.keys() <= self._keyword_names:
+            return None
+        if n_args < len(self._required_positional):
+            for name, keyword in self._required_positional[n_args:]:
+                if not keyword or name not in kwargs:
+                    return None
+        for name in self._required_keyword:
+            if name not in kwargs:
+                return None
+        if kwargs and n_args:
+            # Any parameter passed both positionally and by keyword, checked or not
+            for keyword_name in self._positional_keywords[:n_args]:
+                if keyword_name is not None and keyword_name in kwargs:
+                    return None
+
+        values = []
+        for name, index, keyword, default in self._slots:
+            if 0 <= index < n_args:
+                values.append(args[index])
+            elif keyword and name in kwargs:
+                values.append(kwargs[name])
+            else:
+                # Required params were checked above, so a default exists
+                values.append(default)
+        return values
+
+    def _bind(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[Any] | None:
+        try:
+            bound = self._sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+        except TypeError:
+            return None
+        return [bound.arguments[name] for name in self._names]
+
+
+def _is_traced(args: Iterable[Any], kwargs: dict[str, Any] | None = None) -> bool:
+    """Whether this call runs under a JAX trace, per config.trace_detection."""
+    if config.trace_detection == "arguments":
+        return any_tracer(args) or (kwargs is not None and any_tracer(kwargs.values()))
+    return is_jax_tracing()
+
+
+def _signature_key(
+    plan_items: tuple[tuple[str, CompiledPyTreeSpec], ...],
+    values: list[Any],
+) -> tuple[Any, ...] | None:
+    """
+    Build the shape-signature cache key for a call's checked arguments.
+
+    Non-array values for flat specs (which validation skips) contribute None.
+    Returns None if a PyTree value doesn't fit its spec, so the call is
+    validated in full and the error raised as usual.
+    """
+    key: list[Any] = []
+    for (_, plan), value in zip(plan_items, values, strict=True):
+        if isinstance(plan, CompiledTree):
+            sub_key = plan.shape_key(value)
+            if sub_key is None:
+                return None
+            key.append(sub_key)
+        else:
+            key.append(array_shape(value))
+    return tuple(key)
+
+
+def _check_inputs(
+    plan_items: tuple[tuple[str, CompiledPyTreeSpec], ...],
+    values: list[Any],
+    ctx: UnificationContext,
+    fn_name: str,
+    effective_mode: JitMode,
+    key: tuple[Any, ...] | None = None,
+    broadcast: CompiledBroadcast | None = None,
+) -> bool:
+    """
+    Validate checked arguments against their compiled specs.
+
+    ``key`` is the call's ``_signature_key``, if computed, so PyTree
+    arguments don't recompute their leaf shapes. ``broadcast`` is checked
+    once all arguments have matched.
+
+    Returns True if every argument passed, False if a failure was logged
+    and ignored (``"warn"`` mode under JIT). Other failures raise.
+    """
+    passed = True
+    for i, ((arg_name, plan), value) in enumerate(zip(plan_items, values, strict=True)):
+        try:
+            if isinstance(plan, CompiledTree):
+                # PyTree spec
+                plan.check(value, ctx, fn_name, key[i] if key is not None else None)
+            else:
+                # Regular shape spec
+                if not is_array(value):
+                    continue
+
+                actual = get_shape(value)
+                plan.match(actual, ctx, arg_name)
+
+        except ShapeGuardError as e:
+            _input_failure(e, arg_name, ctx, fn_name, effective_mode, values)
+            passed = False
+
+    if broadcast is not None:
+        try:
+            broadcast.check(values, ctx)
+        except ShapeGuardError as e:
+            _input_failure(e, ", ".join(broadcast.names), ctx, fn_name, effective_mode, values)
+            passed = False
+    return passed
+
+
+def _input_failure(
+    e: ShapeGuardError,
+    arg_name: str,
+    ctx: UnificationContext,
+    fn_name: str,
+    effective_mode: JitMode,
+    values: list[Any],
+) -> None:
+    """Enrich an input validation error, then log it (``"warn"`` under JIT) or re-raise."""
+    # Enrich error with function context
+    e.function = fn_name
+    if e.argument is None:
+        e.argument = arg_name
+    if e.bindings is None:
+        e.bindings = ctx.format_bindings()
+
+    # Handle based on JIT mode
+    if effective_mode == "warn" and _is_traced(values):
+        logger.warning(
+            "ShapeGuard validation failed in %s: %s",
+            fn_name,
+            e.reason or str(e),
+        )
+        return
+    raise e
+
+
+def _passthrough(fn: F, **metadata: Any) -> F:
+    """Return fn itself with shapeguard metadata attached (config.enabled is False)."""
+    for name, value in metadata.items():
+        try:
+            setattr(fn, name, value)
+        except (AttributeError, TypeError):
+            # Builtins and some C callables don't accept attributes
+            pass
+    return fn
+
+
+def _warn_if_wrapping_jit(fn: Callable[..., Any], jit_mode: JitMode | None, name: str) -> None:
+    """Warn when jit_mode="trace" is applied outside jax.jit, where it never validates."""
+    if jit_mode == "trace" and hasattr(fn, "lower") and hasattr(fn, "__wrapped__"):
+        warnings.warn(
+            f"{name}(jit_mode='trace') wraps an already-jitted function, so it never runs "
+            f"under a trace and will not validate. Apply jax.jit outermost instead.",
+            stacklevel=3,
+        )
+
+
+def _make_cache(cache: int | None, decorator_name: str) -> ShapeCache | None:
+    """Create the per-function shape cache requested by ``cache=``."""
+    if cache is None:
+        return None
+    if isinstance(cache, bool) or not isinstance(cache, int) or cache < 1:
+        raise ValueError(f"{decorator_name}: cache must be a positive int or None, got {cache!r}")
+    return ShapeCache(cache)
+
+
+def _tree_caches(plans: dict[str, CompiledPyTreeSpec]) -> dict[str, ShapeCache]:
+    """The per-argument verdict caches of PyTree plans, keyed by argument name."""
+    return {
+        arg_name: plan.cache
+        for arg_name, plan in plans.items()
+        if isinstance(plan, CompiledTree) and plan.cache is not None
+    }
+
+
+def _compile_broadcast(
+    broadcast: bool | Iterable[str],
+    plans: dict[str, CompiledPyTreeSpec],
+    decorator_name: str,
+) -> CompiledBroadcast | None:
+    """
+    Compile the ``broadcast=`` group, replacing its members' plans in place.
+
+    ``True`` selects every argument with a flat shape spec.
+    """
+    if broadcast is False:
+        return None
+    if broadcast is True:
+        names = [name for name, plan in plans.items() if not isinstance(plan, CompiledTree)]
+    elif isinstance(broadcast, str):
+        raise TypeError(f"{decorator_name}: broadcast must be a bool or a sequence of names")
+    else:
+        names = list(broadcast)
+
+    group: dict[str, BroadcastSpec] = {}
+    for name in names:
+        plan = plans.get(name)
+        if plan is None:
+            raise ValueError(
+                f"{decorator_name}: broadcast argument '{name}' has no shape spec. "
+                f"Specified: {sorted(plans)}"
+            )
+        if isinstance(plan, CompiledTree):
+            raise ValueError(
+                f"{decorator_name}: broadcast argument '{name}' must have a shape tuple spec"
+            )
+        group[name] = plans[name] = BroadcastSpec(plan.spec)
+
+    if not group:
+        return None
+    order = list(plans)
+    return CompiledBroadcast(group, tuple(order.index(name) for name in group))
+
+
 def expects(
     *,
     jit_mode: JitMode | None = None,
+    cache: int | None = None,
+    sample: SampleRate | None = None,
+    broadcast: bool | Iterable[str] = False,
     **shape_specs: PyTreeSpec,
 ) -> Callable[[F], F]:
     """
@@ -170,6 +464,24 @@ def expects(
             - "check": Always validate, raise on mismatch (default)
             - "warn": Validate, log warning on mismatch, continue
             - "skip": Skip validation under JIT
+            - "trace": Validate only under JIT tracing, never at run time
+        cache: Remember up to this many input shape signatures that passed
+            validation (LRU). Calls with a remembered signature skip input
+            checks; a stacked @ensures still validates the output. Counters
+            are exposed as ``fn.__shapeguard_cache__``. PyTree arguments also
+            get their own cache of the same size, keyed on their leaf shapes,
+            so a stable params tree is matched once even while other
+            arguments change shape (``fn.__shapeguard_tree_caches__``).
+            Disabled by default.
+        sample: Override global config.sample for this function: an int N
+            validates every Nth call, a float p validates with probability p.
+            Checked/skipped counts are exposed as ``fn.__shapeguard_sampler__``.
+        broadcast: Arguments that are broadcast together (``True`` for all
+            arguments with shape tuple specs). Their dimensions may also be
+            1, leading dimensions may be omitted, and they must be mutually
+            broadcastable; Dims bind to the broadcast size, so an output
+            spec using them describes the broadcast result. All other
+            arguments still match exactly.
         **shape_specs: Mapping from argument names to shape specifications
 
     Returns:
@@ -192,17 +504,34 @@ def expects(
         - None: Wildcard that accepts any value
         - ...: Ellipsis for variable leading dimensions
 
-    PyTree specs (nested dicts):
+    PyTree specs (dicts, lists, tuples, NamedTuples, dataclasses):
         @expects(
             params={"weights": (n, m), "bias": (m,)},
             x=(B, n)
         )
         def apply(params, x): ...
 
+    Path-pattern specs for large trees:
+        @expects(params=PathSpec({"layers/*/attn/q_proj/kernel": (D, H, K)}))
+        def apply(params, x): ...
+
     JIT mode control:
         @expects(x=(n, m), jit_mode="skip")
         @jax.jit
         def fast_layer(x): ...
+
+        @jax.jit  # outermost, so the check runs inside the trace
+        @expects(x=(n, m), jit_mode="trace")
+        def traced_layer(x): ...
+
+    Shape-signature cache:
+        @expects(x=(B, n), cache=32)
+        def serve(x): ...
+
+    Broadcasting arguments:
+        @expects(x=(B, T, D), scale=(B, T, D), broadcast=("x", "scale"))
+        @ensures(result=(B, T, D))
+        def rescale(x, scale): ...  # scale may be (D,), (T, 1), (B, 1, D), ...
     """
 
     def decorator(fn: F) -> F:
@@ -219,71 +548,86 @@ def expects(
                     f"Valid parameters: {sorted(param_names)}"
                 )
 
+        # Compile specs once; the wrapper only runs the plans
+        shape_cache = _make_cache(cache, "@expects")
+        plans = {
+            arg_name: _compile_pytree_spec(spec, arg_name, cache)
+            for arg_name, spec in shape_specs.items()
+        }
+        broadcast_plan = _compile_broadcast(broadcast, plans, "@expects")
+        tree_caches = _tree_caches(plans)
+        plan_items = tuple(plans.items())
+        extract_args = _ArgExtractor(sig, tuple(plans))
+
+        # Check if @ensures is stacked — use shared context for output
+        ensures_plan = getattr(fn, "__shapeguard_ensures_plan__", None)
+        if ensures_plan is None and hasattr(fn, "__shapeguard_ensures__"):
+            ensures_plan = _compile_output_spec(fn.__shapeguard_ensures__)
+
+        _warn_if_wrapping_jit(fn, jit_mode, "@expects")
+        sampler = Sampler(sample)
+
+        if not config.enabled:
+            return _passthrough(
+                fn,
+                __shapeguard_specs__=shape_specs,
+                __shapeguard_jit_mode__=jit_mode,
+                __shapeguard_cache__=None,
+                __shapeguard_tree_caches__={},
+                __shapeguard_broadcast__=broadcast_plan,
+                __shapeguard_sampler__=sampler,
+            )
+
         @functools.wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Determine effective JIT mode
             effective_mode = jit_mode if jit_mode is not None else config.jit_mode
+            if effective_mode != "check" and config._dry_run:
+                effective_mode = "check"
 
             # Check if we should skip validation
-            if effective_mode == "skip" and is_jax_tracing():
+            if effective_mode == "skip" and _is_traced(args, kwargs):
+                return fn(*args, **kwargs)
+            if effective_mode == "trace" and not _is_traced(args, kwargs):
                 return fn(*args, **kwargs)
 
-            # Bind arguments to parameter names
-            try:
-                bound = sig.bind(*args, **kwargs)
-                bound.apply_defaults()
-            except TypeError:
+            # Sampled-out calls skip all shape work, including a stacked @ensures
+            if not (config._dry_run or sampler.should_check()):
+                if ensures_plan is not None:
+                    return getattr(fn, "__wrapped__", fn)(*args, **kwargs)
+                return fn(*args, **kwargs)
+
+            # Pull checked arguments out of the call
+            values = extract_args(args, kwargs)
+            if values is None:
                 # Let the original function raise its own error
                 return fn(*args, **kwargs)
 
-            # Create unification context for this call
-            ctx = UnificationContext()
+            # Reuse the verdict for a shape signature that already passed
+            key = _signature_key(plan_items, values) if shape_cache is not None else None
+            cached_ctx = (
+                shape_cache.get(key) if shape_cache is not None and key is not None else None
+            )
 
-            # Check each specified argument
-            for arg_name, spec in shape_specs.items():
-                if arg_name not in bound.arguments:
-                    continue
+            if cached_ctx is not None:
+                ctx = cached_ctx.copy() if ensures_plan is not None else cached_ctx
+            else:
+                # Create unification context for this call
+                ctx = UnificationContext()
+                passed = _check_inputs(
+                    plan_items, values, ctx, fn_name, effective_mode, key, broadcast_plan
+                )
+                if shape_cache is not None and key is not None and passed:
+                    shape_cache.put(key, ctx.copy())
 
-                value = bound.arguments[arg_name]
-
-                try:
-                    if isinstance(spec, dict):
-                        # PyTree spec
-                        _check_pytree(value, spec, ctx, arg_name, fn_name)
-                    else:
-                        # Regular shape spec
-                        if not is_array(value):
-                            continue
-
-                        actual = get_shape(value)
-                        match_shape(actual, spec, ctx, arg_name)
-
-                except ShapeGuardError as e:
-                    # Enrich error with function context
-                    e.function = fn_name
-                    if e.argument is None:
-                        e.argument = arg_name
-                    if e.bindings is None:
-                        e.bindings = ctx.format_bindings()
-
-                    # Handle based on JIT mode
-                    if effective_mode == "warn" and is_jax_tracing():
-                        logger.warning(
-                            "ShapeGuard validation failed in %s: %s",
-                            fn_name,
-                            e.reason or str(e),
-                        )
-                        continue
-                    else:
-                        raise
+            if config._monitor is not None and _is_traced(args, kwargs):
+                config._monitor.record(fn_name, ctx)
 
-            # Check if @ensures is stacked — use shared context for output
-            ensures_spec = getattr(fn, "__shapeguard_ensures__", None)
-            if ensures_spec is not None:
+            if ensures_plan is not None:
                 # Call the original unwrapped function, bypassing ensures wrapper
                 original_fn = getattr(fn, "__wrapped__", fn)
                 result = original_fn(*args, **kwargs)
-                _check_output(result, ensures_spec, ctx, fn_name)
+                _check_output(result, ensures_plan, ctx, fn_name)
                 return result
 
             return fn(*args, **kwargs)
@@ -291,6 +635,10 @@ def expects(
         # Attach metadata for introspection
         wrapper.__shapeguard_specs__ = shape_specs  # type: ignore
         wrapper.__shapeguard_jit_mode__ = jit_mode  # type: ignore
+        wrapper.__shapeguard_cache__ = shape_cache  # type: ignore
+        wrapper.__shapeguard_tree_caches__ = tree_caches  # type: ignore
+        wrapper.__shapeguard_broadcast__ = broadcast_plan  # type: ignore
+        wrapper.__shapeguard_sampler__ = sampler  # type: ignore
 
         return wrapper  # type: ignore
 
@@ -301,6 +649,7 @@ def ensures(
     *,
     result: Any,
     jit_mode: JitMode | None = None,
+    sample: SampleRate | None = None,
 ) -> Callable[[F], F]:
     """
     Decorator to validate output shapes on function return.
@@ -315,6 +664,7 @@ def ensures(
             - A dict of shape specs for dict output: {"logits": (B, V), "h": (B, D)}
             - An empty tuple () for scalar output
         jit_mode: Override global config.jit_mode for this function.
+        sample: Override global config.sample for this function.
 
     Example:
         ```python
@@ -327,14 +677,27 @@ def ensures(
 
     def decorator(fn: F) -> F:
         fn_name = getattr(fn, "__qualname__", str(fn))
+        result_plan = _compile_output_spec(result)
+        _warn_if_wrapping_jit(fn, jit_mode, "@ensures")
+        sampler = Sampler(sample)
+
+        if not config.enabled:
+            return _passthrough(fn, __shapeguard_ensures__=result, __shapeguard_sampler__=sampler)
 
         @functools.wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Determine effective JIT mode
             effective_mode = jit_mode if jit_mode is not None else config.jit_mode
+            if effective_mode != "check" and config._dry_run:
+                effective_mode = "check"
 
             # Check if we should skip validation
-            if effective_mode == "skip" and is_jax_tracing():
+            if effective_mode == "skip" and _is_traced(args, kwargs):
+                return fn(*args, **kwargs)
+            if effective_mode == "trace" and not _is_traced(args, kwargs):
+                return fn(*args, **kwargs)
+
+            if not (config._dry_run or sampler.should_check()):
                 return fn(*args, **kwargs)
 
             output = fn(*args, **kwargs)
@@ -342,9 +705,9 @@ def ensures(
             ctx = UnificationContext()
 
             try:
-                _check_output(output, result, ctx, fn_name)
+                _check_output(output, result_plan, ctx, fn_name)
             except ShapeGuardError as e:
-                if effective_mode == "warn" and is_jax_tracing():
+                if effective_mode == "warn" and _is_traced(args, kwargs):
                     logger.warning(
                         "ShapeGuard output validation failed in %s: %s",
                         fn_name,
@@ -353,10 +716,14 @@ def ensures(
                     return output
                 raise
 
+            if config._monitor is not None and _is_traced(args, kwargs):
+                config._monitor.record(fn_name, ctx)
             return output
 
         # Mark this wrapper so @expects can detect it
         wrapper.__shapeguard_ensures__ = result  # type: ignore
+        wrapper.__shapeguard_ensures_plan__ = result_plan  # type: ignore
+        wrapper.__shapeguard_sampler__ = sampler  # type: ignore
 
         return wrapper  # type: ignore
 
@@ -368,6 +735,9 @@ def contract(
     inputs: dict[str, PyTreeSpec],
     output: Any,
     jit_mode: JitMode | None = None,
+    cache: int | None = None,
+    sample: SampleRate | None = None,
+    broadcast: bool | Iterable[str] = False,
 ) -> Callable[[F], F]:
     """
     Combined input + output validation in a single decorator.
@@ -378,6 +748,11 @@ def contract(
         inputs: Mapping from argument names to shape specifications.
         output: Shape spec for the return value (same format as @ensures).
         jit_mode: Override global config.jit_mode for this function.
+        cache: Remember up to this many input shape signatures that passed
+            validation (same as @expects). The output is always validated.
+        sample: Override global config.sample for this function.
+        broadcast: Input arguments that are broadcast together (same as
+            @expects); the output spec's Dims hold the broadcast sizes.
 
     Example:
         ```python
@@ -400,65 +775,79 @@ def contract(
                     f"Valid parameters: {sorted(param_names)}"
                 )
 
+        shape_cache = _make_cache(cache, "@contract")
+        plans = {
+            arg_name: _compile_pytree_spec(spec, arg_name, cache)
+            for arg_name, spec in inputs.items()
+        }
+        broadcast_plan = _compile_broadcast(broadcast, plans, "@contract")
+        tree_caches = _tree_caches(plans)
+        plan_items = tuple(plans.items())
+        extract_args = _ArgExtractor(sig, tuple(plans))
+        output_plan = _compile_output_spec(output)
+        _warn_if_wrapping_jit(fn, jit_mode, "@contract")
+        sampler = Sampler(sample)
+
+        if not config.enabled:
+            return _passthrough(
+                fn,
+                __shapeguard_specs__=inputs,
+                __shapeguard_output_spec__=output,
+                __shapeguard_jit_mode__=jit_mode,
+                __shapeguard_cache__=None,
+                __shapeguard_tree_caches__={},
+                __shapeguard_broadcast__=broadcast_plan,
+                __shapeguard_sampler__=sampler,
+            )
+
         @functools.wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Determine effective JIT mode
             effective_mode = jit_mode if jit_mode is not None else config.jit_mode
+            if effective_mode != "check" and config._dry_run:
+                effective_mode = "check"
 
             # Check if we should skip validation
-            if effective_mode == "skip" and is_jax_tracing():
+            if effective_mode == "skip" and _is_traced(args, kwargs):
+                return fn(*args, **kwargs)
+            if effective_mode == "trace" and not _is_traced(args, kwargs):
                 return fn(*args, **kwargs)
 
-            # Bind arguments to parameter names
-            try:
-                bound = sig.bind(*args, **kwargs)
-                bound.apply_defaults()
-            except TypeError:
+            if not (config._dry_run or sampler.should_check()):
                 return fn(*args, **kwargs)
 
-            # Single shared context for inputs and output
-            ctx = UnificationContext()
+            # Pull checked arguments out of the call
+            values = extract_args(args, kwargs)
+            if values is None:
+                return fn(*args, **kwargs)
 
-            # Validate inputs
-            for arg_name, spec in inputs.items():
-                if arg_name not in bound.arguments:
-                    continue
+            # Reuse the verdict for a shape signature that already passed
+            key = _signature_key(plan_items, values) if shape_cache is not None else None
+            cached_ctx = (
+                shape_cache.get(key) if shape_cache is not None and key is not None else None
+            )
 
-                value = bound.arguments[arg_name]
-
-                try:
-                    if isinstance(spec, dict):
-                        _check_pytree(value, spec, ctx, arg_name, fn_name)
-                    else:
-                        if not is_array(value):
-                            continue
-                        actual = get_shape(value)
-                        match_shape(actual, spec, ctx, arg_name)
-
-                except ShapeGuardError as e:
-                    e.function = fn_name
-                    if e.argument is None:
-                        e.argument = arg_name
-                    if e.bindings is None:
-                        e.bindings = ctx.format_bindings()
-
-                    if effective_mode == "warn" and is_jax_tracing():
-                        logger.warning(
-                            "ShapeGuard validation failed in %s: %s",
-                            fn_name,
-                            e.reason or str(e),
-                        )
-                        continue
-                    else:
-                        raise
+            if cached_ctx is not None:
+                ctx = cached_ctx.copy()
+            else:
+                # Single shared context for inputs and output
+                ctx = UnificationContext()
+                passed = _check_inputs(
+                    plan_items, values, ctx, fn_name, effective_mode, key, broadcast_plan
+                )
+                if shape_cache is not None and key is not None and passed:
+                    shape_cache.put(key, ctx.copy())
+
+            if config._monitor is not None and _is_traced(args, kwargs):
+                config._monitor.record(fn_name, ctx)
 
             # Call function and validate output
             result = fn(*args, **kwargs)
 
             try:
-                _check_output(result, output, ctx, fn_name)
+                _check_output(result, output_plan, ctx, fn_name)
             except ShapeGuardError as e:
-                if effective_mode == "warn" and is_jax_tracing():
+                if effective_mode == "warn" and _is_traced(args, kwargs):
                     logger.warning(
                         "ShapeGuard output validation failed in %s: %s",
                         fn_name,
@@ -472,6 +861,10 @@ def contract(
         wrapper.__shapeguard_specs__ = inputs  # type: ignore
         wrapper.__shapeguard_output_spec__ = output  # type: ignore
         wrapper.__shapeguard_jit_mode__ = jit_mode  # type: ignore
+        wrapper.__shapeguard_cache__ = shape_cache  # type: ignore
+        wrapper.__shapeguard_tree_caches__ = tree_caches  # type: ignore
+        wrapper.__shapeguard_broadcast__ = broadcast_plan  # type: ignore
+        wrapper.__shapeguard_sampler__ = sampler  # type: ignore
 
         return wrapper  # type: ignore
 
@@ -0,0 +1,245 @@
+"""
+Buffer donation derived from shape contracts.
+
+When a contract proves that an output has exactly the shape of an input,
+as in an optimizer step ``(params, grads) -> params``, the input buffer
+can be donated to XLA and reused for the output, instead of holding both
+at peak. ``donatable`` finds those arguments from the specs, and
+``donating_jit`` is ``jax.jit`` with ``donate_argnames`` filled in from
+them, recording the bytes actually reused at each compilation.
+
+Usage:
+    from shapeguard import Dim, contract
+    from shapeguard.donate import donatable, donating_jit
+
+    N = Dim("N")
+
+    @contract(inputs={"w": (N,), "g": (N,), "lr": ()}, output=(N,))
+    def sgd(w, g, lr):
+        return w - lr * g
+
+    donatable(sgd)              # ("w",)
+    step = donating_jit(sgd)    # jax.jit(sgd, donate_argnames=("w",))
+    w = step(w, g, 0.1)         # the old w is deleted, its buffer reused
+    step.__shapeguard_donations__[-1].bytes_saved
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from shapeguard.core import Dim
+from shapeguard.pytree import _children, _spec_leaves, is_pytree_spec
+
+
+@dataclass(frozen=True)
+class DonationReport:
+    """
+    Buffer reuse of one compilation of a ``donating_jit`` function.
+
+    Attributes:
+        function: Qualified name of the function
+        donated: Names of the donated arguments
+        saved: Argument name -> bytes of its buffers reused by an output
+        unused: Donated leaves (``"name"`` or ``"name[i]"``) that no output
+            has the shape and dtype of; XLA frees them instead of reusing them
+    """
+
+    function: str
+    donated: tuple[str, ...]
+    saved: dict[str, int]
+    unused: tuple[str, ...]
+
+    @property
+    def bytes_saved(self) -> int:
+        """Total bytes of input buffers reused for outputs."""
+        return sum(self.saved.values())
+
+    def format(self) -> str:
+        """Human-readable summary."""
+        names = ", ".join(self.donated) or "nothing"
+        line = f"{self.function}: donated {names}, {self.bytes_saved:,} bytes reused"
+        if self.unused:
+            line += f" ({len(self.unused)} unused: {', '.join(self.unused)})"
+        return line
+
+
+def _exact_keys(spec: Any) -> list[tuple[Any, ...]] | None:
+    """
+    The flat specs inside spec, in order, if all of them pin a shape exactly.
+
+    A flat spec is exact when every entry is an int or a Dim (no ``None``
+    and no ``...``): two exact specs with the same entries describe the same
+    shape whatever the Dims bind to. Returns None if any part of spec is not
+    exact, including path patterns.
+    """
+    if is_pytree_spec(spec):
+        keys = []
+        for *_, child in _children(spec):
+            child_keys = _exact_keys(child)
+            if child_keys is None:
+                return None
+            keys.extend(child_keys)
+        return keys
+    if isinstance(spec, tuple) and _is_exact(spec):
+        return [spec]
+    return None
+
+
+def _is_exact(flat: tuple[Any, ...]) -> bool:
+    return all(isinstance(e, Dim) or (isinstance(e, int) and not isinstance(e, bool)) for e in flat)
+
+
+def _output_spec(fn: Callable[..., Any]) -> Any:
+    spec = getattr(fn, "__shapeguard_output_spec__", None)
+    if spec is None:
+        spec = getattr(fn, "__shapeguard_ensures__", None)
+    return spec
+
+
+def donatable(fn: Callable[..., Any]) -> tuple[str, ...]:
+    """
+    Arguments of a shape-checked function whose buffers an output can reuse.
+
+    An argument is donatable when each array in its spec has an exact spec
+    (ints and Dims only) that also appears in the output spec. Outputs are
+    matched one-to-one, in parameter order: with ``(w, m) -> w`` only ``w``
+    is donatable. Specs don't carry dtypes, so the dtype match is only known
+    at compile time (see ``DonationReport.unused``).
+
+    Args:
+        fn: Function decorated with ``@contract``, or with ``@expects`` and
+            ``@ensures``
+
+    Returns:
+        The donatable argument names, in parameter order
+
+    Raises:
+        ValueError: If fn has no input specs or no output spec
+
+    Example:
+        ```python
+        @contract(inputs={"params": {"w": (D, D)}, "grads": {"w": (D, D)}},
+                  output={"w": (D, D)})
+        def update(params, grads): ...
+
+        donatable(update)   # ("params",)
+        ```
+    """
+    fn_name = getattr(fn, "__qualname__", repr(fn))
+    specs = getattr(fn, "__shapeguard_specs__", None)
+    output = _output_spec(fn)
+    if specs is None or output is None:
+        raise ValueError(
+            f"donatable: {fn_name!r} needs input and output specs; "
+            "decorate it with @contract, or @expects and @ensures"
+        )
+    available = Counter(flat for flat in _spec_leaves(output) if _is_exact(flat))
+    names = []
+    for name in inspect.signature(fn).parameters:
+        keys = _exact_keys(specs[name]) if name in specs else None
+        if not keys:
+            continue
+        needed = Counter(keys)
+        if all(available[key] >= n for key, n in needed.items()):
+            available -= needed
+            names.append(name)
+    return tuple(names)
+
+
+def _reuse(
+    function: str,
+    donated: tuple[str, ...],
+    arguments: dict[str, Any],
+    output: Any,
+) -> DonationReport:
+    """Match donated input leaves to output leaves by shape and dtype, as XLA does."""
+    import jax
+
+    outputs = Counter((tuple(leaf.shape), leaf.dtype) for leaf in jax.tree_util.tree_leaves(output))
+    saved: dict[str, int] = {}
+    unused = []
+    for name in donated:
+        leaves = jax.tree_util.tree_leaves(arguments.get(name))
+        for i, leaf in enumerate(leaves):
+            key = (tuple(leaf.shape), leaf.dtype)
+            if outputs[key] > 0:
+                outputs[key] -= 1
+                saved[name] = saved.get(name, 0) + math.prod(leaf.shape) * leaf.dtype.itemsize
+            else:
+                unused.append(name if len(leaves) == 1 else f"{name}[{i}]")
+    return DonationReport(function, donated, saved, tuple(unused))
+
+
+def donating_jit(fn: Callable[..., Any], **jit_kwargs: Any) -> Any:
+    """
+    ``jax.jit`` a shape-checked function, donating the arguments its contract allows.
+
+    The donated arguments are those of ``donatable(fn)``, minus any marked
+    static. Their arrays are deleted by each call, so the caller must not
+    use them afterwards, as with any donation.
+
+    Each compilation appends a DonationReport to the returned function's
+    ``__shapeguard_donations__`` list, with the bytes of input buffers that
+    outputs of the same shape and dtype reuse. The reports are computed
+    while tracing, so calls that hit the jit cache cost nothing extra.
+
+    Args:
+        fn: Function decorated with ``@contract``, or with ``@expects`` and
+            ``@ensures``
+        **jit_kwargs: Other ``jax.jit`` arguments (e.g. ``static_argnames``)
+
+    Returns:
+        The jitted function, with ``__shapeguard_donate__`` holding the
+        donated argument names
+
+    Raises:
+        ValueError: If fn has no input or output specs
+        TypeError: If ``donate_argnums`` or ``donate_argnames`` is given
+        ImportError: If JAX is not installed
+    """
+    try:
+        import jax
+    except ImportError as err:
+        raise ImportError("shapeguard.donate requires JAX") from err
+
+    for key in ("donate_argnums", "donate_argnames"):
+        if key in jit_kwargs:
+            raise TypeError(f"donating_jit: {key} is derived from the contract; don't pass it")
+
+    fn_name = getattr(fn, "__qualname__", repr(fn))
+    sig = inspect.signature(fn)
+    params = list(sig.parameters)
+    static_nums = jit_kwargs.get("static_argnums", ())
+    static_names = jit_kwargs.get("static_argnames", ())
+    static = {params[i] for i in _as_tuple(static_nums) if -len(params) <= i < len(params)}
+    static.update(_as_tuple(static_names))
+    donated = tuple(name for name in donatable(fn) if name not in static)
+    reports: list[DonationReport] = []
+
+    @functools.wraps(fn)
+    def traced(*args: Any, **kwargs: Any) -> Any:
+        output = fn(*args, **kwargs)
+        arguments = sig.bind(*args, **kwargs).arguments
+        reports.append(_reuse(fn_name, donated, arguments, output))
+        return output
+
+    jitted = jax.jit(traced, donate_argnames=donated, **jit_kwargs)
+    jitted.__shapeguard_donate__ = donated  # type: ignore[attr-defined]
+    jitted.__shapeguard_donations__ = reports  # type: ignore[attr-defined]
+    return jitted
+
+
+def _as_tuple(value: Any) -> tuple[Any, ...]:
+    if isinstance(value, int | str):
+        return (value,)
+    return tuple(value)
+
+
+__all__ = ["donatable", "donating_jit", "DonationReport"]
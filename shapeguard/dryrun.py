@@ -0,0 +1,166 @@
+"""
+Abstract dry runs of shape-checked code.
+
+Runs a function under ``jax.eval_shape`` with ``jax.ShapeDtypeStruct``
+placeholders, so every ``@expects``/``@ensures``/``@contract`` along the way
+validates its shapes without allocating device memory or executing compute.
+A whole model can be checked against a large configuration in the time it
+takes to trace it.
+
+Usage:
+    import jax.numpy as jnp
+    from shapeguard import Dim
+    from shapeguard.dryrun import dry_run, placeholder
+
+    B, T, D = Dim("B"), Dim("T"), Dim("D")
+    sizes = {B: 8, T: 4096, D: 8192}
+
+    x = placeholder((B, T, D), sizes, dtype=jnp.bfloat16)
+    out = dry_run(model, params, x)   # ShapeGuardError on any mismatch
+    out.shape                          # (8, 4096, 8192)
+"""
+
+from __future__ import annotations
+
+import contextlib
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+from shapeguard._compat import get_shape, is_array
+from shapeguard.config import config
+from shapeguard.core import Dim
+
+
+def _require_jax() -> Any:
+    try:
+        import jax
+    except ImportError as err:
+        raise ImportError("shapeguard.dryrun requires JAX") from err
+    return jax
+
+
+@contextlib.contextmanager
+def checking() -> Iterator[None]:
+    """
+    Force every decorated function to validate, for the duration of the block.
+
+    Inside the block, ``jit_mode`` is treated as ``"check"`` (so ``"skip"``
+    does not skip under a trace and ``"warn"`` raises) and sampling is
+    ignored. ``dry_run`` uses this around ``jax.eval_shape``; use it directly
+    to run your own abstract evaluation, e.g. ``jax.jit(f).lower(...)``.
+
+    Functions decorated while ``config.enabled`` was False have no wrapper
+    and are not checked.
+    """
+    previous = config._dry_run
+    config._dry_run = True
+    try:
+        yield
+    finally:
+        config._dry_run = previous
+
+
+def dry_run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run ``fn`` abstractly, validating every shape contract it reaches.
+
+    Array leaves of the arguments (``jax.ShapeDtypeStruct`` placeholders or
+    real arrays) are traced through ``jax.eval_shape``; all other leaves
+    (ints, strings, config objects) are passed through unchanged, as static
+    values. Nothing is allocated on device and nothing is computed.
+
+    Args:
+        fn: Function to evaluate; typically the model's top-level call
+        *args: Positional arguments, with arrays or placeholders as leaves
+        **kwargs: Keyword arguments, with arrays or placeholders as leaves
+
+    Returns:
+        The output of ``fn`` with ``jax.ShapeDtypeStruct`` leaves in place
+        of arrays.
+
+    Raises:
+        ShapeGuardError: From the first contract that fails
+        ImportError: If JAX is not installed
+
+    Example:
+        ```python
+        x = jax.ShapeDtypeStruct((8, 4096, 8192), jnp.bfloat16)
+        out = dry_run(model.apply, params, x, train=False)
+        ```
+    """
+    jax = _require_jax()
+    leaves, treedef = jax.tree_util.tree_flatten((args, kwargs))
+    dynamic = [i for i, leaf in enumerate(leaves) if is_array(leaf)]
+
+    def run(*values: Any) -> Any:
+        filled = list(leaves)
+        for i, value in zip(dynamic, values, strict=True):
+            filled[i] = value
+        call_args, call_kwargs = jax.tree_util.tree_unflatten(treedef, filled)
+        return fn(*call_args, **call_kwargs)
+
+    with checking():
+        return jax.eval_shape(run, *(leaves[i] for i in dynamic))
+
+
+def placeholder(
+    spec: tuple[int | Dim, ...],
+    sizes: Mapping[Dim | str, int] | None = None,
+    dtype: Any = "float32",
+) -> Any:
+    """
+    Build a ``jax.ShapeDtypeStruct`` from a shape spec and dim sizes.
+
+    Args:
+        spec: Shape of ints and Dims (no ``...`` or ``None`` wildcards)
+        sizes: Size of each Dim in spec, keyed by the Dim or its name
+        dtype: Element dtype of the placeholder
+
+    Returns:
+        A ``jax.ShapeDtypeStruct`` of the resolved shape
+
+    Raises:
+        ValueError: If a Dim has no size, or spec holds a wildcard
+
+    Example:
+        ```python
+        placeholder((B, T, D), {"B": 8, "T": 4096, "D": 8192}, jnp.bfloat16)
+        ```
+    """
+    jax = _require_jax()
+    sizes = sizes or {}
+    shape = []
+    for entry in spec:
+        if isinstance(entry, Dim):
+            size = sizes.get(entry, sizes.get(entry.name))
+            if size is None:
+                raise ValueError(f"placeholder: no size given for dim {entry.name!r}")
+            shape.append(size)
+        elif isinstance(entry, int) and not isinstance(entry, bool):
+            shape.append(entry)
+        else:
+            raise ValueError(
+                f"placeholder: spec entries must be ints or Dims, got {entry!r} in {spec!r}"
+            )
+    return jax.ShapeDtypeStruct(tuple(shape), dtype)
+
+
+def abstract(tree: Any) -> Any:
+    """
+    Replace every array leaf of a PyTree with a ``jax.ShapeDtypeStruct``.
+
+    Useful to dry-run with the structure of real parameters (or of
+    ``jax.eval_shape(init, ...)``) without holding on to their memory.
+    Non-array leaves are kept as they are.
+    """
+    jax = _require_jax()
+
+    def to_struct(leaf: Any) -> Any:
+        if is_array(leaf) and not isinstance(leaf, jax.ShapeDtypeStruct):
+            return jax.ShapeDtypeStruct(get_shape(leaf), leaf.dtype)
+        return leaf
+
+    return jax.tree_util.tree_map(to_struct, tree)
+
+
+__all__ = ["checking", "dry_run", "placeholder", "abstract"]
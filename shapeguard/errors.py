@@ -206,3 +206,7 @@ class BroadcastError(ShapeGuardError):
             lines.append(f"  function: {self.function}")
         lines.append(f"  reason:   {self.reason}")
         return "\n".join(lines)
+
+
+class BroadcastCostWarning(UserWarning):
+    """Warned when a broadcast result exceeds ``config.broadcast_max_bytes``."""
@@ -0,0 +1,274 @@
+"""
+Shape-polymorphic export driven by shape contracts.
+
+``@expects``/``@contract`` specs already say which dimensions of each
+argument are free. This module turns them into ``jax.export`` polymorphic
+shapes, so a function is exported (and compiled) once for every size its
+Dims can take, instead of once per batch size.
+
+Usage:
+    import jax
+    from shapeguard import Batch, Dim, expects
+    from shapeguard.export import export, polymorphic_shapes
+
+    B, D = Batch("B"), Dim("D")
+
+    @expects(x=(B, D), w=(D, 10))
+    def head(x, w):
+        return x @ w
+
+    polymorphic_shapes(head)               # {"x": "B, D", "w": "D, 10"}
+    polymorphic_shapes(head, "batch")      # {"x": "B, _", "w": "_, 10"}
+
+    exported = export(head, jax.ShapeDtypeStruct((1, 512), "float32"),
+                      jax.ShapeDtypeStruct((512, 10), "float32"), polymorphic="batch")
+    blob = exported.serialize()            # one artifact for every batch size
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import re
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+from shapeguard._compat import get_shape, is_array
+from shapeguard.core import Batch, Dim
+from shapeguard.paths import PathSpec
+from shapeguard.pytree import _is_dataclass_instance, _is_namedtuple, _spec_leaves, is_pytree_spec
+from shapeguard.spec import _is_ellipsis, format_spec
+
+if TYPE_CHECKING:
+    from jax.export import Exported
+
+# Which Dims become symbolic: all of them, only Batch dims, or the given Dims
+Polymorphic = Literal["all", "batch"] | Iterable[Dim]
+# Polymorphic with the Dims collected into a set
+_Free = Literal["all", "batch"] | frozenset[Dim]
+
+
+def _specs_of(fn: Callable[..., Any]) -> dict[str, Any]:
+    specs = getattr(fn, "__shapeguard_specs__", None)
+    if specs is None:
+        raise ValueError(
+            f"{getattr(fn, '__qualname__', fn)!r} has no shape specs; "
+            "decorate it with @expects or @contract"
+        )
+    return specs  # type: ignore[no-any-return]
+
+
+def _symbol_names(specs: Iterable[Any]) -> dict[Dim, str]:
+    """
+    A jax.export symbol for each Dim, in order of first appearance.
+
+    Names are the Dim names made into identifiers; distinct Dims with the
+    same name get a numeric suffix, since jax identifies dims by name.
+    """
+    names: dict[Dim, str] = {}
+    taken: set[str] = set()
+    for spec in specs:
+        for flat in _spec_leaves(spec):
+            for entry in flat:
+                if not isinstance(entry, Dim) or entry in names:
+                    continue
+                base = re.sub(r"\W", "_", entry.name) or "d"
+                if base[0].isdigit():
+                    base = f"d_{base}"
+                name, suffix = base, 2
+                while name in taken:
+                    name, suffix = f"{base}_{suffix}", suffix + 1
+                names[entry] = name
+                taken.add(name)
+    return names
+
+
+def _free(polymorphic: Polymorphic) -> _Free:
+    if polymorphic == "all" or polymorphic == "batch":
+        return polymorphic
+    return frozenset(cast("Iterable[Dim]", polymorphic))
+
+
+def _is_free(dim: Dim, polymorphic: _Free) -> bool:
+    if polymorphic == "all":
+        return True
+    if polymorphic == "batch":
+        return isinstance(dim, Batch)
+    return dim in polymorphic
+
+
+def _shape_string(
+    spec: tuple[Any, ...],
+    names: dict[Dim, str],
+    polymorphic: _Free,
+    rank: int | None,
+) -> str:
+    """
+    One flat spec as a ``jax.export.symbolic_shape`` string.
+
+    Free Dims become their symbol, other Dims and ``None`` become ``_``
+    (the size of the example argument). A trailing ``...`` is kept; an
+    ellipsis elsewhere is expanded to ``_`` entries when ``rank`` is known.
+    """
+    parts = []
+    for i, entry in enumerate(spec):
+        if _is_ellipsis(entry):
+            if i == len(spec) - 1:
+                parts.append("...")
+            elif rank is not None:
+                parts.extend(["_"] * max(rank - len(spec) + 1, 0))
+            else:
+                raise ValueError(
+                    f"Cannot express {format_spec(spec)} as a polymorphic shape: '...' is only "
+                    "supported as the last entry unless example arguments are given"
+                )
+        elif isinstance(entry, Dim):
+            parts.append(names[entry] if _is_free(entry, polymorphic) else "_")
+        elif entry is None:
+            parts.append("_")
+        else:
+            parts.append(str(entry))
+    return ", ".join(parts)
+
+
+def _polymorphic_spec(
+    spec: Any,
+    names: dict[Dim, str],
+    polymorphic: _Free,
+    like: Any = None,
+) -> Any:
+    """
+    The polymorphic shapes for one argument, mirroring its spec.
+
+    With an example value, containers follow the value's structure (keys
+    the spec doesn't name get None, i.e. static shapes), so the result is a
+    valid pytree prefix of the argument.
+    """
+    if isinstance(spec, PathSpec):
+        return None
+    if not is_pytree_spec(spec):
+        if not isinstance(spec, tuple):
+            return None
+        rank = len(get_shape(like)) if like is not None and is_array(like) else None
+        return _shape_string(spec, names, polymorphic, rank)
+
+    def child(sub: Any, key: Any) -> Any:
+        try:
+            sub_like = like[key] if like is not None else None
+        except (KeyError, IndexError, TypeError):
+            sub_like = None
+        return _polymorphic_spec(sub, names, polymorphic, sub_like)
+
+    if isinstance(spec, dict):
+        if isinstance(like, dict):
+            return {k: child(spec[k], k) if k in spec else None for k in like}
+        return {k: child(sub, k) for k, sub in spec.items()}
+    if _is_namedtuple(spec):
+        return type(spec)(*(child(sub, i) for i, sub in enumerate(spec)))
+    if _is_dataclass_instance(spec):
+        return dataclasses.replace(
+            spec,
+            **{
+                f.name: _polymorphic_spec(
+                    getattr(spec, f.name),
+                    names,
+                    polymorphic,
+                    getattr(like, f.name, None),
+                )
+                for f in dataclasses.fields(spec)
+            },
+        )
+    return type(spec)(child(sub, i) for i, sub in enumerate(spec))
+
+
+def polymorphic_shapes(fn: Callable[..., Any], polymorphic: Polymorphic = "all") -> dict[str, Any]:
+    """
+    Derive ``jax.export`` polymorphic shapes from a function's input specs.
+
+    Args:
+        fn: Function decorated with ``@expects`` or ``@contract``
+        polymorphic: Which Dims become symbolic dimension variables:
+            - "all" (default): every Dim
+            - "batch": only ``Batch`` dims; other Dims keep the size of the
+              example argument (``_``)
+            - an iterable of Dims: only those
+
+    Returns:
+        Argument name -> ``jax.export.symbolic_shape`` string (or a container
+        of them, mirroring a PyTree spec). A Dim shared between arguments
+        gets the same symbol everywhere. ``PathSpec`` arguments map to None
+        (static shapes).
+
+    Raises:
+        ValueError: If fn has no shape specs, or a spec has an ellipsis
+            before its last entry (use ``export`` with example arguments)
+
+    Example:
+        ```python
+        @expects(x=(B, T, D), mask=(B, T))
+        def f(x, mask): ...
+
+        polymorphic_shapes(f)   # {"x": "B, T, D", "mask": "B, T"}
+        ```
+    """
+    specs = _specs_of(fn)
+    free = _free(polymorphic)
+    names = _symbol_names(specs.values())
+    return {name: _polymorphic_spec(spec, names, free) for name, spec in specs.items()}
+
+
+def export(
+    fn: Callable[..., Any],
+    *args: Any,
+    polymorphic: Polymorphic = "all",
+    platforms: Iterable[str] | None = None,
+    **kwargs: Any,
+) -> Exported:
+    """
+    Export a shape-checked function once for all sizes of its free Dims.
+
+    The example arguments (arrays or ``jax.ShapeDtypeStruct``) give dtypes,
+    ranks and the sizes of dims that stay static; the function's specs
+    decide which dims become symbolic (see ``polymorphic_shapes``). The
+    shape contracts run while exporting, on the symbolic shapes.
+
+    Args:
+        fn: Function decorated with ``@expects`` or ``@contract``
+        *args: Example positional arguments
+        polymorphic: Which Dims become symbolic (as ``polymorphic_shapes``)
+        platforms: Platforms to export for (default: the current backend)
+        **kwargs: Example keyword arguments
+
+    Returns:
+        A ``jax.export.Exported``; call ``.serialize()`` for a portable
+        artifact and ``.call(...)`` to run it at any size.
+
+    Raises:
+        ValueError: If fn has no shape specs
+        ShapeGuardError: If the contracts don't hold for all sizes of the
+            symbolic dims (e.g. a Dim made free where the spec needs an int)
+        ImportError: If JAX is not installed
+    """
+    try:
+        import jax
+        from jax import export as jax_export
+    except ImportError as err:
+        raise ImportError("shapeguard.export requires JAX") from err
+
+    specs = _specs_of(fn)
+    free = _free(polymorphic)
+    names = _symbol_names(specs.values())
+
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    scope = jax_export.SymbolicScope()
+    for name, value in bound.arguments.items():
+        shapes = _polymorphic_spec(specs[name], names, free, value) if name in specs else None
+        bound.arguments[name] = jax_export.symbolic_args_specs(value, shapes, scope=scope)
+
+    exporter = jax_export.export(
+        jax.jit(fn), platforms=tuple(platforms) if platforms is not None else None
+    )
+    return exporter(*bound.args, **bound.kwargs)
+
+
+__all__ = ["polymorphic_shapes", "export", "Polymorphic"]
@@ -1,7 +1,8 @@
 """
 ML-specific helpers for common shape patterns.
 
-Pre-defined dimensions, attention shape specs, and convolution output calculators.
+Pre-defined dimensions, attention shape specs, convolution output calculators,
+and einsum contracts.
 
 Usage:
     from shapeguard.ml import B, T, D, attention_shapes, conv_output_shape
@@ -13,8 +14,14 @@ Usage:
 from __future__ import annotations
 
 import math
+import string
+from dataclasses import dataclass
+from typing import Any
 
-from shapeguard.core import Batch, Dim
+from shapeguard._compat import dtype_itemsize, normalize_shape
+from shapeguard.broadcast import broadcast_shape
+from shapeguard.core import ELLIPSIS, Batch, Dim, UnificationContext
+from shapeguard.spec import compile_spec
 
 # ---------------------------------------------------------------------------
 # Pre-defined dimensions
@@ -128,6 +135,436 @@ def conv_output_shape(
     return (batch, channels, *out_spatial)
 
 
+# ---------------------------------------------------------------------------
+# Einsum contracts
+# ---------------------------------------------------------------------------
+
+_ELLIPSIS = "..."
+
+
+def _parse_term(term: str, subscripts: str) -> tuple[str, ...]:
+    """Split one einsum term into labels, keeping ``...`` as a single label."""
+    if term.count(_ELLIPSIS) > 1:
+        raise ValueError(f"einsum term {term!r} in {subscripts!r} has more than one '...'")
+    before, _, after = term.partition(_ELLIPSIS)
+    for label in before + after:
+        if label not in string.ascii_letters:
+            raise ValueError(f"Invalid einsum label {label!r} in {subscripts!r}")
+    if _ELLIPSIS in term:
+        return (*before, _ELLIPSIS, *after)
+    return tuple(term)
+
+
+def _parse_subscripts(subscripts: str) -> tuple[tuple[tuple[str, ...], ...], tuple[str, ...]]:
+    """Parse einsum subscripts into per-operand labels and output labels."""
+    compact = subscripts.replace(" ", "")
+    lhs, arrow, rhs = compact.partition("->")
+    inputs = tuple(_parse_term(term, subscripts) for term in lhs.split(","))
+
+    if arrow:
+        output = _parse_term(rhs, subscripts)
+        seen = {label for term in inputs for label in term}
+        for label in output:
+            if label not in seen:
+                raise ValueError(f"Output label {label!r} of {subscripts!r} is not in any operand")
+            if output.count(label) > 1:
+                raise ValueError(f"Output label {label!r} of {subscripts!r} is repeated")
+    else:
+        # Implicit mode: labels that appear once, in alphabetical order
+        counts: dict[str, int] = {}
+        for term in inputs:
+            for label in term:
+                counts[label] = counts.get(label, 0) + 1
+        once = sorted(label for label, n in counts.items() if n == 1 and label != _ELLIPSIS)
+        output = ((_ELLIPSIS,) if _ELLIPSIS in counts else ()) + tuple(once)
+    return inputs, output
+
+
+@dataclass(frozen=True)
+class EinsumCost:
+    """
+    Cost estimate of an einsum, from ``EinsumSpec.cost``.
+
+    Each contraction is costed as in ``numpy.einsum_path``: the product of
+    the sizes of the indices involved, times the number of operands
+    combined minus one, plus one for an inner product. ``naive_flops``
+    equals numpy's "Naive FLOP count"; numpy adds 1 to the sum of the steps
+    for its "Optimized FLOP count", so that is ``flops + 1``.
+
+    Attributes:
+        naive_flops: FLOPs of one contraction over all indices at once
+            (``numpy.einsum`` without ``optimize``)
+        flops: FLOPs of the cheapest order of pairwise contractions
+        path: That order in ``numpy.einsum_path`` format: each step
+            contracts the operands at these positions and appends the
+            result to the end of the operand list
+        steps: The subscripts of each pairwise contraction
+        output_elements: Elements in the result
+        largest_intermediate: Elements in the largest tensor created along
+            ``path`` (including the result)
+        itemsize: Bytes per element, if a dtype was given or found
+    """
+
+    naive_flops: int
+    flops: int
+    path: tuple[tuple[int, ...], ...]
+    steps: tuple[str, ...]
+    output_elements: int
+    largest_intermediate: int
+    itemsize: int | None = None
+
+    @property
+    def speedup(self) -> float:
+        """How many times fewer FLOPs ``path`` needs than the naive contraction."""
+        return self.naive_flops / self.flops if self.flops else 1.0
+
+    @property
+    def output_bytes(self) -> int | None:
+        """Size of the result in bytes, if the itemsize is known."""
+        return None if self.itemsize is None else self.output_elements * self.itemsize
+
+    @property
+    def largest_intermediate_bytes(self) -> int | None:
+        """Size of the largest tensor along ``path`` in bytes, if the itemsize is known."""
+        return None if self.itemsize is None else self.largest_intermediate * self.itemsize
+
+    @property
+    def einsum_path(self) -> list[Any]:
+        """``path`` as accepted by ``numpy.einsum(..., optimize=...)``."""
+        return ["einsum_path", *self.path]
+
+
+class EinsumSpec:
+    """
+    An einsum subscript string as shape specs sharing Dims.
+
+    Each label becomes a Dim (named after the label, or taken from
+    ``dims``), so the same label unifies across operands and the output.
+    ``...`` becomes an ellipsis.
+
+    Attributes:
+        subscripts: The subscript string
+        inputs: One shape spec per operand
+        output: Shape spec of the result
+        dims: Label -> Dim (or int) used in the specs
+
+    Example:
+        ```python
+        spec = EinsumSpec("bhqd,bhkd->bhqk")
+
+        @contract(inputs=spec.shapes("q", "k"), output=spec.output)
+        def scores(q, k):
+            return jnp.einsum("bhqd,bhkd->bhqk", q, k)
+
+        spec.cost((8, 16, 1024, 64), (8, 16, 1024, 64)).flops
+        ```
+    """
+
+    __slots__ = ("subscripts", "inputs", "output", "dims", "_labels", "_output_labels", "_plans")
+
+    def __init__(self, subscripts: str, dims: dict[str, Dim | int] | None = None) -> None:
+        """
+        Args:
+            subscripts: Einsum subscripts, e.g. ``"bij,bjk->bik"``. Without
+                ``->``, the output is implicit, as in ``numpy.einsum``.
+            dims: Dims (or fixed sizes) to use for some labels, e.g. to
+                share ``B`` with other specs. Other labels get new Dims.
+
+        Raises:
+            ValueError: If the subscripts are malformed
+        """
+        labels, output_labels = _parse_subscripts(subscripts)
+        dims = dict(dims or {})
+        for label in dims:
+            if label not in {x for term in labels for x in term}:
+                raise ValueError(f"dims has label {label!r}, which is not in {subscripts!r}")
+        for term in labels:
+            for label in term:
+                if label != _ELLIPSIS and label not in dims:
+                    dims[label] = Dim(label)
+
+        def to_spec(term: tuple[str, ...]) -> tuple[Any, ...]:
+            return tuple(ELLIPSIS if label == _ELLIPSIS else dims[label] for label in term)
+
+        self.subscripts = subscripts
+        self.inputs = tuple(to_spec(term) for term in labels)
+        self.output = to_spec(output_labels)
+        self.dims = dims
+        self._labels = labels
+        self._output_labels = output_labels
+        self._plans = tuple(compile_spec(spec) for spec in self.inputs)
+
+    def shapes(self, *names: str) -> dict[str, tuple[Any, ...]]:
+        """
+        Operand specs keyed by argument name, for ``@expects(**...)``.
+
+        Raises:
+            ValueError: If the number of names differs from the number of operands
+        """
+        if len(names) != len(self.inputs):
+            raise ValueError(
+                f"{self.subscripts!r} has {len(self.inputs)} operands, got {len(names)} names"
+            )
+        return dict(zip(names, self.inputs, strict=True))
+
+    def _sizes(
+        self, shapes: tuple[Any, ...]
+    ) -> tuple[tuple[tuple[str, ...], ...], tuple[str, ...], dict[str, int]]:
+        """
+        Match operand shapes and size every label.
+
+        Returns the operand and output labels with ``...`` expanded into
+        fresh single-letter labels (right-aligned and broadcast), and the
+        size of every label.
+        """
+        if len(shapes) != len(self.inputs):
+            raise ValueError(
+                f"{self.subscripts!r} has {len(self.inputs)} operands, got {len(shapes)} shapes"
+            )
+        normalized = [normalize_shape(shape) for shape in shapes]
+        ctx = UnificationContext()
+        for i, (plan, shape) in enumerate(zip(self._plans, normalized, strict=True)):
+            plan.match(shape, ctx, f"operand[{i}]")
+
+        sizes: dict[str, int] = {}
+        for label, dim in self.dims.items():
+            if isinstance(dim, Dim):
+                value = ctx.resolve(dim)
+                if value is not None:
+                    sizes[label] = value
+            else:
+                sizes[label] = dim
+
+        # Ellipsis dims: broadcast across operands, labelled with unused letters
+        ellipsis_parts = []
+        for term, shape in zip(self._labels, normalized, strict=True):
+            if _ELLIPSIS in term:
+                start = term.index(_ELLIPSIS)
+                ellipsis_parts.append(shape[start : len(shape) - (len(term) - start - 1)])
+        ellipsis_shape = broadcast_shape(*ellipsis_parts) if ellipsis_parts else ()
+        free = [c for c in string.ascii_letters if c not in sizes and c not in self.dims]
+        ellipsis_labels = tuple(free[: len(ellipsis_shape)])
+        sizes.update(zip(ellipsis_labels, ellipsis_shape, strict=True))
+
+        def expand(term: tuple[str, ...], shape: tuple[int, ...] | None) -> tuple[str, ...]:
+            if _ELLIPSIS not in term:
+                return term
+            start = term.index(_ELLIPSIS)
+            n = len(ellipsis_labels) if shape is None else len(shape) - len(term) + 1
+            part = ellipsis_labels[len(ellipsis_labels) - n :] if n else ()
+            return (*term[:start], *part, *term[start + 1 :])
+
+        labels = tuple(expand(t, s) for t, s in zip(self._labels, normalized, strict=True))
+        return labels, expand(self._output_labels, None), sizes
+
+    def output_shape(self, *shapes: tuple[int, ...] | Any) -> tuple[int, ...]:
+        """
+        Validate operand shapes (tuples or arrays) and compute the result shape.
+
+        Raises:
+            ShapeGuardError: If an operand doesn't match its spec, or a
+                label has different sizes across operands
+            BroadcastError: If the ``...`` dims don't broadcast
+        """
+        _, output, sizes = self._sizes(shapes)
+        return tuple(sizes[label] for label in output)
+
+    def cost(self, *shapes: tuple[int, ...] | Any, dtype: Any = None) -> EinsumCost:
+        """
+        Estimate FLOPs and memory of the naive and the best pairwise order.
+
+        The best order is found exactly, by dynamic programming over subsets
+        of operands, which is fast for the handful of operands einsums have.
+        ``...`` dims are sized by their broadcast across operands.
+
+        Args:
+            *shapes: Operand shapes (tuples or arrays)
+            dtype: Dtype for byte sizes (as in ``analyze_broadcast``).
+                Defaults to the widest dtype among array operands.
+
+        Raises:
+            ShapeGuardError: If the shapes don't fit the subscripts
+        """
+        labels, output, sizes = self._sizes(shapes)
+        itemsize = dtype_itemsize(dtype)
+        if itemsize is None:
+            itemsize = max(
+                (i for i in (dtype_itemsize(getattr(s, "dtype", None)) for s in shapes) if i),
+                default=None,
+            )
+        return _einsum_cost(labels, output, sizes, itemsize)
+
+    def __repr__(self) -> str:
+        return f"EinsumSpec({self.subscripts!r})"
+
+
+def _einsum_cost(
+    labels: tuple[tuple[str, ...], ...],
+    output: tuple[str, ...],
+    sizes: dict[str, int],
+    itemsize: int | None,
+) -> EinsumCost:
+    """Naive and optimal pairwise contraction costs, per step as in numpy.einsum_path."""
+    n = len(labels)
+    output_set = frozenset(output)
+    operand_sets = [frozenset(term) for term in labels]
+    every = frozenset().union(*operand_sets)
+
+    def size(indices: frozenset[str]) -> int:
+        return math.prod(sizes[label] for label in indices)
+
+    output_elements = size(output_set)
+    # As numpy.einsum_path: an inner product if any index is shared by operands
+    shared = sum(len(indices) for indices in operand_sets) > len(every)
+    naive_flops = size(every) * (max(1, n - 1) + (1 if shared else 0))
+    if n == 1:
+        step = f"{''.join(labels[0])}->{''.join(output)}"
+        return EinsumCost(
+            naive_flops, naive_flops, ((0,),), (step,), output_elements, output_elements, itemsize
+        )
+
+    # Indices kept by the contraction of a subset of operands: those still
+    # needed by the output or by an operand outside the subset
+    def kept(subset: int) -> frozenset[str]:
+        inside: frozenset[str] = frozenset()
+        outside = output_set
+        for i in range(n):
+            if subset >> i & 1:
+                inside |= operand_sets[i]
+            else:
+                outside |= operand_sets[i]
+        return inside & outside
+
+    full = (1 << n) - 1
+    # subset -> (flops, largest tensor, indices, split)
+    best: dict[int, tuple[int, int, frozenset[str], tuple[int, int] | None]] = {
+        1 << i: (0, 0, operand_sets[i], None) for i in range(n)
+    }
+    for subset in range(1, full + 1):
+        if subset in best:
+            continue
+        indices = kept(subset) if subset != full else output_set
+        result_size = size(indices)
+        low = subset & -subset
+        choice = None
+        # Enumerate splits where the first part holds the lowest operand
+        part = (subset - 1) & subset
+        while part:
+            if part & low:
+                other = subset ^ part
+                left, right = best[part], best[other]
+                combined = left[2] | right[2]
+                flops = left[0] + right[0] + size(combined) * (2 if combined - indices else 1)
+                largest = max(left[1], right[1], result_size)
+                if choice is None or (flops, largest) < choice[:2]:
+                    choice = (flops, largest, indices, (part, other))
+            part = (part - 1) & subset
+        assert choice is not None
+        best[subset] = choice
+
+    # Replay the contraction tree as a numpy-style path
+    operands: list[int] = [1 << i for i in range(n)]
+    path: list[tuple[int, ...]] = []
+    steps: list[str] = []
+
+    def replay(subset: int) -> None:
+        split = best[subset][3]
+        if split is None:
+            return
+        left, right = split
+        replay(left)
+        replay(right)
+        positions = sorted((operands.index(left), operands.index(right)))
+        path.append(tuple(positions))
+        for position in reversed(positions):
+            del operands[position]
+        operands.append(subset)
+        steps.append(
+            f"{_term(best[left][2], labels, left, n)},{_term(best[right][2], labels, right, n)}"
+            f"->{_term(best[subset][2], labels, subset, n, output if subset == full else None)}"
+        )
+
+    replay(full)
+    flops, largest, _, _ = best[full]
+    return EinsumCost(
+        naive_flops=naive_flops,
+        flops=flops,
+        path=tuple(path),
+        steps=tuple(steps),
+        output_elements=output_elements,
+        largest_intermediate=largest,
+        itemsize=itemsize,
+    )
+
+
+def _term(
+    indices: frozenset[str],
+    labels: tuple[tuple[str, ...], ...],
+    subset: int,
+    n: int,
+    output: tuple[str, ...] | None = None,
+) -> str:
+    """Subscripts of an operand or intermediate, labels in first-seen order."""
+    if output is not None:
+        return "".join(output)
+    if subset & (subset - 1) == 0:
+        # A single operand keeps its own subscripts (repeats included)
+        return "".join(labels[subset.bit_length() - 1])
+    order = [label for i in range(n) if subset >> i & 1 for label in labels[i]]
+    return "".join(dict.fromkeys(label for label in order if label in indices))
+
+
+def einsum_shapes(
+    subscripts: str,
+    *names: str,
+    dims: dict[str, Dim | int] | None = None,
+) -> dict[str, tuple[Any, ...]]:
+    """
+    Return operand shape specs for an einsum, keyed by argument name.
+
+    Each subscript label becomes a Dim shared across operands, so
+    ``@expects(**einsum_shapes(...))`` checks the operands agree. Use
+    ``EinsumSpec`` to also get the output spec and cost estimates.
+
+    Args:
+        subscripts: Einsum subscripts, e.g. ``"bhqd,bhkd->bhqk"``.
+        *names: Argument name of each operand, in order.
+        dims: Dims (or fixed sizes) for some labels, to share them with
+            other specs.
+
+    Returns:
+        Dict mapping each name to its operand's shape spec.
+
+    Example:
+        ```python
+        @expects(**einsum_shapes("bhqd,bhkd->bhqk", "q", "k", dims={"b": B}))
+        def scores(q, k):
+            return jnp.einsum("bhqd,bhkd->bhqk", q, k)
+        ```
+    """
+    return EinsumSpec(subscripts, dims).shapes(*names)
+
+
+def einsum_cost(subscripts: str, *shapes: tuple[int, ...] | Any, dtype: Any = None) -> EinsumCost:
+    """
+    Estimate FLOPs and memory of an einsum for concrete operand shapes.
+
+    Shorthand for ``EinsumSpec(subscripts).cost(*shapes, dtype=dtype)``.
+
+    Example:
+        ```python
+        >>> c = einsum_cost("ij,jk,kl->il", (1000, 2), (2, 1000), (1000, 1000))
+        >>> c.path
+        ((1, 2), (0, 1))
+        >>> c.steps
+        ('jk,kl->jl', 'ij,jl->il')
+        >>> c.speedup
+        750.0
+        ```
+    """
+    return EinsumSpec(subscripts).cost(*shapes, dtype=dtype)
+
+
 __all__ = [
     "B",
     "T",
@@ -137,4 +574,8 @@ __all__ = [
     "D",
     "attention_shapes",
     "conv_output_shape",
+    "EinsumSpec",
+    "EinsumCost",
+    "einsum_shapes",
+    "einsum_cost",
 ]
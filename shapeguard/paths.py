@@ -0,0 +1,399 @@
+"""
+Path-pattern specs for large PyTrees.
+
+Instead of mirroring a whole parameter tree, a PathSpec maps leaf-path
+patterns to shape specs:
+
+    D, H, K = Dim("D"), Dim("H"), Dim("K")
+
+    @expects(params=PathSpec({
+        "layers/*/attn/q_proj/kernel": (D, H, K),
+        "layers/*/mlp/**/bias": (None,),
+        "embed/embedding": (None, D),
+    }))
+    def apply(params, x): ...
+
+A leaf's path is its keys (dict keys, sequence indices, attribute names)
+joined by "/". Dims are shared across every leaf a pattern matches, and
+across patterns.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import fnmatch
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from shapeguard._compat import array_shape, get_tree_flatten
+from shapeguard.cache import ShapeCache
+from shapeguard.core import UnificationContext
+from shapeguard.errors import ShapeGuardError
+from shapeguard.spec import CompiledSpec, ShapeSpec, compile_spec
+
+# Per-value-structure match tables kept by a CompiledPathSpec (JAX only)
+_MAX_STRUCTURES = 32
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+class PathSpec:
+    """
+    Shape specs for the leaves of a PyTree, selected by path pattern.
+
+    Patterns are "/"-separated segments:
+
+    - a literal segment matches itself (``"kernel"``, ``"0"``)
+    - a glob segment matches one segment (``"*"``, ``"layer_*"``, ``"[qk]_proj"``)
+    - ``"**"`` matches any number of segments, including none
+
+    A compiled ``re.Pattern`` key is matched against the whole "/"-joined
+    path instead. Glob and literal patterns are compiled into a trie, so
+    matching a leaf costs one walk down its path whatever the number of
+    patterns; regex patterns are tried one by one.
+
+    Every pattern a leaf matches applies to it. Leaves no pattern matches
+    are not checked. With ``strict=True`` (default), a pattern that matches
+    no leaf at all is an error, which catches typos in paths.
+
+    Args:
+        rules: Mapping from pattern to shape spec
+        strict: Require every pattern to match at least one leaf
+    """
+
+    __slots__ = ("rules", "strict")
+
+    def __init__(self, rules: Mapping[str | re.Pattern[str], ShapeSpec], *, strict: bool = True):
+        self.rules = dict(rules)
+        self.strict = strict
+
+    def __repr__(self) -> str:
+        return f"PathSpec({self.rules!r}, strict={self.strict})"
+
+
+class _TrieNode:
+    __slots__ = ("children", "globs", "deep", "loops", "rules")
+
+    def __init__(self, loops: bool = False) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.globs: list[tuple[re.Pattern[str], _TrieNode]] = []
+        # Node reached through a "**" segment, entered without consuming input
+        self.deep: _TrieNode | None = None
+        # True for "**" nodes, which also consume any segment
+        self.loops = loops
+        self.rules: list[int] = []
+
+
+class _PathTrie:
+    """Segment trie over glob patterns, matched as an NFA over a leaf's path."""
+
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+
+    def add(self, pattern: str, rule: int) -> None:
+        node = self.root
+        for segment in pattern.split("/"):
+            if segment == "**":
+                if node.deep is None:
+                    node.deep = _TrieNode(loops=True)
+                node = node.deep
+            elif _GLOB_CHARS.isdisjoint(segment):
+                node = node.children.setdefault(segment, _TrieNode())
+            else:
+                regex = re.compile(fnmatch.translate(segment))
+                for existing, child in node.globs:
+                    if existing.pattern == regex.pattern:
+                        node = child
+                        break
+                else:
+                    child = _TrieNode()
+                    node.globs.append((regex, child))
+                    node = child
+        node.rules.append(rule)
+
+    def match(self, segments: list[str]) -> list[int]:
+        """Indices of the rules whose pattern matches the whole path."""
+        states = self._closure([self.root])
+        for segment in segments:
+            following = []
+            for node in states:
+                child = node.children.get(segment)
+                if child is not None:
+                    following.append(child)
+                for regex, glob_child in node.globs:
+                    if regex.match(segment):
+                        following.append(glob_child)
+                if node.loops:
+                    following.append(node)
+            if not following:
+                return []
+            states = self._closure(following)
+        return sorted(rule for node in states for rule in node.rules)
+
+    @staticmethod
+    def _closure(nodes: list[_TrieNode]) -> list[_TrieNode]:
+        """Add the "**" nodes reachable without consuming a segment, deduplicated."""
+        seen: dict[int, _TrieNode] = {}
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if id(node) not in seen:
+                seen[id(node)] = node
+                if node.deep is not None:
+                    stack.append(node.deep)
+        return list(seen.values())
+
+
+def _flatten_with_path(value: Any) -> list[tuple[list[str], str, Any]]:
+    """(path segments, source suffix, leaf) for each leaf, in JAX's flattening order."""
+    out: list[tuple[list[str], str, Any]] = []
+
+    def visit(node: Any, segments: list[str], source: str) -> None:
+        if node is None:
+            return
+        if isinstance(node, dict):
+            try:
+                keys = sorted(node)
+            except TypeError:
+                keys = list(node)
+            for key in keys:
+                visit(node[key], [*segments, str(key)], f"{source}[{key!r}]")
+        elif isinstance(node, tuple) and (fields := getattr(type(node), "_fields", None)):
+            for name, child in zip(fields, node, strict=True):
+                visit(child, [*segments, name], f"{source}.{name}")
+        elif isinstance(node, list | tuple):
+            for i, child in enumerate(node):
+                visit(child, [*segments, str(i)], f"{source}[{i}]")
+        elif dataclasses.is_dataclass(node) and not isinstance(node, type):
+            for field in dataclasses.fields(node):
+                visit(getattr(node, field.name), [*segments, field.name], f"{source}.{field.name}")
+        else:
+            out.append((segments, source, node))
+
+    visit(value, [], "")
+    return out
+
+
+def _key_segment(key: Any) -> str:
+    """Path segment for a JAX key-path entry (DictKey, SequenceKey, GetAttrKey, ...)."""
+    for attr in ("key", "idx", "name"):
+        if hasattr(key, attr):
+            return str(getattr(key, attr))
+    return str(key)
+
+
+# (leaf position in the flattened value, rule plan, leaf source) per match
+_Match = tuple[int, CompiledSpec, str]
+
+
+class CompiledPathSpec:
+    """
+    A PathSpec compiled for one argument.
+
+    The trie is built once. With JAX imported, leaves come from
+    ``jax.tree_util.tree_flatten``, and the leaf-to-rule matches are
+    computed once per tree structure (treedef): later calls with the same
+    structure skip path matching entirely. Without JAX, or when JAX
+    leaves an unregistered dataclass as a leaf, the value is flattened and
+    matched in Python on each call; both flatten dataclasses into their
+    fields, so a pattern matches the same leaves either way.
+
+    Matches are checked in flattening order, then rule order.
+    """
+
+    __slots__ = ("spec", "source", "cache", "_plans", "_patterns", "_trie", "_regexes", "_tables")
+
+    def __init__(self, spec: PathSpec, source: str, cache: ShapeCache | None = None) -> None:
+        self.spec = spec
+        self.source = source
+        self.cache = cache
+        self._patterns = tuple(spec.rules)
+        self._plans = tuple(compile_spec(rule) for rule in spec.rules.values())
+        self._trie = _PathTrie()
+        self._regexes: list[tuple[re.Pattern[str], int]] = []
+        for rule, pattern in enumerate(self._patterns):
+            if isinstance(pattern, re.Pattern):
+                self._regexes.append((pattern, rule))
+            elif isinstance(pattern, str):
+                self._trie.add(pattern, rule)
+            else:
+                raise TypeError(
+                    f"Invalid path pattern for {source}: {pattern!r}. "
+                    f"Expected str or compiled re.Pattern."
+                )
+        self._tables: dict[Any, tuple[_Match, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def __repr__(self) -> str:
+        return f"CompiledPathSpec({self.source}, rules={len(self._plans)})"
+
+    def match_path(self, path: str) -> list[int]:
+        """Indices of the rules whose pattern matches a "/"-joined leaf path."""
+        return self._match_segments(path.split("/") if path else [])
+
+    def _match_segments(self, segments: list[str]) -> list[int]:
+        rules = self._trie.match(segments)
+        if self._regexes:
+            joined = "/".join(segments)
+            rules.extend(rule for regex, rule in self._regexes if regex.fullmatch(joined))
+            rules.sort()
+        return rules
+
+    def _table(self, paths: list[tuple[list[str], str]]) -> tuple[_Match, ...]:
+        """Match every leaf path against the rules, checking strictness."""
+        matches = []
+        matched_rules = set()
+        for position, (segments, suffix) in enumerate(paths):
+            for rule in self._match_segments(segments):
+                matches.append((position, self._plans[rule], self.source + suffix))
+                matched_rules.add(rule)
+
+        if self.spec.strict and len(matched_rules) < len(self._plans):
+            missing = next(r for r in range(len(self._plans)) if r not in matched_rules)
+            pattern = self._patterns[missing]
+            shown = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+            raise ShapeGuardError(
+                f"No leaf of {self.source} matches path pattern '{shown}'",
+                argument=self.source,
+                expected=f"a leaf matching '{shown}'",
+                actual=f"{len(paths)} leaves",
+            )
+        return tuple(matches)
+
+    def _matches(self, value: Any) -> tuple[tuple[_Match, ...], list[Any]]:
+        """The match table for value's structure and value's flattened leaves."""
+        tree_flatten = get_tree_flatten()
+        if tree_flatten is not None:
+            try:
+                leaves, treedef = tree_flatten(value)
+            except Exception:
+                pass
+            else:
+                # JAX keeps unregistered dataclasses whole, where the Python
+                # flattener recurses into their fields: defer to the latter
+                if not any(dataclasses.is_dataclass(leaf) for leaf in leaves):
+                    table = self._tables.get(treedef)
+                    if table is None:
+                        from jax.tree_util import keystr, tree_flatten_with_path
+
+                        keyed, _ = tree_flatten_with_path(value)
+                        table = self._table(
+                            [([_key_segment(k) for k in path], keystr(path)) for path, _ in keyed]
+                        )
+                        if len(self._tables) >= _MAX_STRUCTURES:
+                            self._tables.clear()
+                        self._tables[treedef] = table
+                    return table, leaves
+
+        flat = _flatten_with_path(value)
+        table = self._table([(segments, suffix) for segments, suffix, _ in flat])
+        return table, [leaf for _, _, leaf in flat]
+
+    def check(
+        self,
+        value: Any,
+        ctx: UnificationContext,
+        fn_name: str | None = None,
+        shapes: tuple[Any, ...] | None = None,
+    ) -> None:
+        """
+        Validate every leaf of value matched by a pattern, binding Dims in ctx.
+
+        Args:
+            value: The PyTree to check
+            ctx: Unification context for tracking dimension bindings
+            fn_name: Function name to attach to errors
+            shapes: ``shape_key(value)``, if the caller already computed it
+
+        Raises:
+            ShapeGuardError: If a matched leaf is not an array, or (strict)
+                a pattern matches no leaf
+            RankMismatchError, DimensionMismatchError, UnificationError:
+                On a leaf shape mismatch
+        """
+        try:
+            cache = self.cache
+            matched = None
+            if cache is not None:
+                if shapes is None:
+                    # Flatten and match once, for both the key and a cache miss
+                    matched = self._matches(value)
+                    shapes = _shape_key(*matched)
+                verdict = cache.get(shapes) if shapes is not None else None
+                if verdict is not None:
+                    ctx.update(verdict)
+                    return
+
+            table, leaves = matched if matched is not None else self._matches(value)
+            for position, plan, source in table:
+                leaf = leaves[position]
+                shape = array_shape(leaf)
+                if shape is None:
+                    raise ShapeGuardError(
+                        f"Expected array for {source}, got {type(leaf).__name__}",
+                        argument=source,
+                        expected="array",
+                        actual=type(leaf).__name__,
+                    )
+                plan.match(shape, ctx, source)
+        except ShapeGuardError as e:
+            e.function = fn_name
+            raise
+
+        if cache is not None and shapes is not None:
+            cache.put(shapes, self._verdict(table, leaves))
+
+    def _verdict(self, table: tuple[_Match, ...], leaves: list[Any]) -> UnificationContext:
+        """Each Dim's binding at its first occurrence, for leaves that passed."""
+        verdict = UnificationContext()
+        for position, plan, source in table:
+            shape = array_shape(leaves[position])
+            if shape is None:
+                continue  # check() rejects non-array leaves first
+            for index, dim in plan.dims:
+                if verdict.resolve(dim) is None:
+                    verdict.bind_indexed(dim, shape[index], source, index % len(shape))
+        return verdict
+
+    def shape_key(self, value: Any) -> tuple[Any, ...] | None:
+        """
+        Signature of value for caching: the matched leaves' sources and shapes.
+
+        Returns None if value can't be matched (the full check then raises).
+        """
+        try:
+            table, leaves = self._matches(value)
+        except ShapeGuardError:
+            return None
+        return _shape_key(table, leaves)
+
+
+def _shape_key(table: tuple[_Match, ...], leaves: list[Any]) -> tuple[Any, ...] | None:
+    """The matched leaves' sources and shapes, or None if one is not an array."""
+    key = []
+    for position, _, source in table:
+        shape = array_shape(leaves[position])
+        if shape is None:
+            return None
+        key.append((source, shape))
+    return tuple(key)
+
+
+def compile_path_spec(
+    spec: PathSpec, source: str = "value", cache: int | None = None
+) -> CompiledPathSpec:
+    """
+    Compile a PathSpec for a named value.
+
+    Args:
+        spec: The path-pattern spec
+        source: Name of the value, used as the root of leaf sources in errors
+        cache: Remember verdicts for up to this many leaf-shape signatures
+
+    Raises:
+        TypeError: If a pattern or a shape spec is invalid
+    """
+    return CompiledPathSpec(spec, source, ShapeCache(cache) if cache is not None else None)
@@ -0,0 +1,416 @@
+"""
+Compiled PyTree shape specs.
+
+A PyTree spec mirrors the structure of an argument: dicts, lists, tuples,
+NamedTuples and dataclass instances whose leaves are shape tuples:
+
+    @expects(params={"w": (n, m), "b": (m,)})
+    @expects(layers=[{"w": (D, D)}, {"w": (D, V)}])
+    @expects(state=TrainState(params=(n, m), step=()))
+
+The spec is compiled once into a flat list of leaves, each holding its
+access path from the root, a precomputed source string and a CompiledSpec,
+so validation neither recurses nor formats strings unless it fails.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any, cast
+
+from shapeguard._compat import array_shape, get_tree_flatten
+from shapeguard.cache import ShapeCache
+from shapeguard.core import UnificationContext
+from shapeguard.errors import ShapeGuardError
+from shapeguard.spec import CompiledSpec, ShapeSpec, compile_spec
+
+# Type for PyTree shape specs (nested containers of shape tuples)
+PyTreeSpec = dict[str, Any] | list[Any] | tuple[Any, ...] | ShapeSpec
+
+# Container kinds along a leaf's access path
+_DICT = 0
+_SEQUENCE = 1
+_ATTR = 2
+
+# Key of the last step for an empty container spec: check the type only
+_NO_KEY = object()
+_MISSING = object()
+
+# Treedef for specs JAX cannot flatten the same way (e.g. unregistered dataclasses)
+_NO_TREEDEF = object()
+
+# (kind, key, container source, expected sequence length)
+_Step = tuple[int, Any, str, int]
+# (path from the root, leaf plan or None for an empty container, leaf source)
+_Entry = tuple[tuple[_Step, ...], CompiledSpec | None, str]
+
+
+def _is_namedtuple(spec: Any) -> bool:
+    return isinstance(spec, tuple) and hasattr(type(spec), "_fields")
+
+
+def _is_dataclass_instance(spec: Any) -> bool:
+    return dataclasses.is_dataclass(spec) and not isinstance(spec, type)
+
+
+def is_pytree_spec(spec: Any) -> bool:
+    """
+    Whether spec describes a container of specs rather than a single shape.
+
+    Shape tuples hold only ints, Dims, None and ``...``, so a tuple with a
+    tuple, list, dict or dataclass element is a tuple of specs.
+    """
+    if isinstance(spec, dict | list) or _is_namedtuple(spec) or _is_dataclass_instance(spec):
+        return True
+    return isinstance(spec, tuple) and any(
+        isinstance(elem, tuple | list | dict) or _is_dataclass_instance(elem) for elem in spec
+    )
+
+
+def _children(spec: Any) -> list[tuple[int, Any, str, Any]]:
+    """(kind, key, suffix for the child's source, child spec) for a container spec."""
+    if isinstance(spec, dict):
+        return [(_DICT, key, f"[{key!r}]", sub) for key, sub in spec.items()]
+    if _is_namedtuple(spec):
+        return [
+            (_ATTR, name, f".{name}", sub) for name, sub in zip(spec._fields, spec, strict=True)
+        ]
+    if _is_dataclass_instance(spec):
+        return [
+            (_ATTR, field.name, f".{field.name}", getattr(spec, field.name))
+            for field in dataclasses.fields(spec)
+        ]
+    return [(_SEQUENCE, i, f"[{i}]", sub) for i, sub in enumerate(spec)]
+
+
+def _spec_leaves(spec: Any) -> Iterator[tuple[Any, ...]]:
+    """Flat shape specs inside a (possibly nested) spec, in order; PathSpecs are skipped."""
+    if is_pytree_spec(spec):
+        for _, _, _, child in _children(spec):
+            yield from _spec_leaves(child)
+    elif isinstance(spec, tuple):
+        yield spec
+
+
+def _compile_into(spec: Any, source: str, path: tuple[_Step, ...], entries: list[_Entry]) -> None:
+    """Append the flat leaf entries for spec, in depth-first spec order."""
+    if not is_pytree_spec(spec):
+        if isinstance(spec, tuple | CompiledSpec):
+            entries.append((path, compile_spec(spec), source))
+            return
+        raise TypeError(
+            f"Invalid spec for {source}: {spec!r}. Expected tuple (shape) or "
+            f"dict, list, tuple, NamedTuple or dataclass of specs (pytree)."
+        )
+
+    children = _children(spec)
+    if not children:
+        kind = _DICT if isinstance(spec, dict) else _SEQUENCE
+        entries.append((path + ((kind, _NO_KEY, source, 0),), None, source))
+        return
+    for kind, key, suffix, sub_spec in children:
+        step = (kind, key, source, len(spec) if kind == _SEQUENCE else 0)
+        _compile_into(sub_spec, source + suffix, path + (step,), entries)
+
+
+class _Leaf:
+    """Placeholder leaf used to learn JAX's flattening order for a spec."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+
+def _skeleton(spec: Any, counter: list[int]) -> Any:
+    """Rebuild spec's containers with numbered _Leaf objects in place of shapes."""
+    if not is_pytree_spec(spec):
+        leaf = _Leaf(counter[0])
+        counter[0] += 1
+        return leaf
+    if isinstance(spec, dict):
+        return {key: _skeleton(sub, counter) for key, sub in spec.items()}
+    if _is_namedtuple(spec):
+        return type(spec)(*(_skeleton(sub, counter) for sub in spec))
+    if _is_dataclass_instance(spec):
+        changes = {
+            field.name: _skeleton(getattr(spec, field.name), counter)
+            for field in dataclasses.fields(spec)
+        }
+        return dataclasses.replace(spec, **changes)
+    return type(spec)(_skeleton(sub, counter) for sub in spec)
+
+
+def _step(node: Any, step: _Step, fn_name: str | None) -> Any:
+    """Take one step down a leaf's access path, raising on structural mismatch."""
+    kind, key, source, length = step
+    if kind == _DICT:
+        if type(node) is not dict and not isinstance(node, Mapping):
+            raise ShapeGuardError(
+                f"Expected dict for {source}, got {type(node).__name__}",
+                function=fn_name,
+                argument=source,
+                expected="dict",
+                actual=type(node).__name__,
+            )
+        if key is _NO_KEY:
+            return node
+        child = node.get(key, _MISSING)
+        if child is _MISSING:
+            raise ShapeGuardError(
+                f"Missing key '{key}' in {source}",
+                function=fn_name,
+                argument=source,
+                expected=f"key '{key}'",
+                actual=f"keys: {list(node.keys())}",
+            )
+        return child
+
+    if kind == _SEQUENCE:
+        if not isinstance(node, list | tuple) or len(node) != length:
+            actual = (
+                f"{type(node).__name__} of length {len(node)}"
+                if isinstance(node, list | tuple)
+                else type(node).__name__
+            )
+            raise ShapeGuardError(
+                f"Expected sequence of length {length} for {source}, got {actual}",
+                function=fn_name,
+                argument=source,
+                expected=f"sequence of length {length}",
+                actual=actual,
+            )
+        return node if key is _NO_KEY else node[key]
+
+    child = getattr(node, key, _MISSING)
+    if child is _MISSING:
+        raise ShapeGuardError(
+            f"Missing attribute '{key}' in {source}",
+            function=fn_name,
+            argument=source,
+            expected=f"attribute '{key}'",
+            actual=type(node).__name__,
+        )
+    return child
+
+
+def _leaf_shapes(leaves: list[Any]) -> tuple[tuple[int, ...], ...] | None:
+    """Shapes of the given leaves, or None if any leaf is not an array."""
+    shapes = tuple(map(array_shape, leaves))
+    return None if None in shapes else cast("tuple[tuple[int, ...], ...]", shapes)
+
+
+class CompiledPyTree:
+    """
+    A PyTree spec compiled into a flat list of leaf checks.
+
+    When JAX is imported and a value has exactly the spec's tree structure,
+    it is flattened with one ``jax.tree_util.tree_flatten`` call. Otherwise
+    (no JAX, extra dict keys, unregistered dataclasses, structural errors)
+    the leaf paths are walked in spec order, visiting each container once,
+    which also produces the detailed error messages.
+
+    Leaves are matched in spec order either way, so Dim bindings and error
+    precedence do not depend on how the value was flattened. Structural
+    errors are reported before leaf shape errors. Dict values may carry
+    keys the spec doesn't mention; sequences must match in length.
+
+    With a ``cache``, the verdict for each tuple of leaf shapes that passed
+    is remembered (the tree structure was already checked by flattening).
+    A hit replaces per-leaf matching with one lookup plus re-binding the
+    tree's Dims at their first occurrence, so conflicts with other
+    arguments are still reported from the same leaf as a full check.
+    """
+
+    __slots__ = (
+        "spec",
+        "source",
+        "cache",
+        "_walks",
+        "_depth",
+        "_plans",
+        "_treedef",
+        "_positions",
+    )
+
+    def __init__(self, spec: PyTreeSpec, source: str, cache: ShapeCache | None = None) -> None:
+        entries: list[_Entry] = []
+        _compile_into(spec, source, (), entries)
+        self.spec = spec
+        self.source = source
+        self.cache = cache
+
+        # (path, steps shared with the previous path, has a leaf) per entry;
+        # shared steps reuse the containers already reached
+        walks = []
+        previous: tuple[_Step, ...] = ()
+        for path, plan, _ in entries:
+            shared = 0
+            while shared < min(len(path), len(previous)) and path[shared] is previous[shared]:
+                shared += 1
+            walks.append((path, shared, plan is not None))
+            previous = path
+        self._walks = tuple(walks)
+        self._depth = max((len(path) for path, _, _ in entries), default=0)
+
+        # (plan, source) for each leaf with a shape, in spec order
+        self._plans = tuple(
+            (plan, leaf_source) for _, plan, leaf_source in entries if plan is not None
+        )
+        self._treedef: Any = None
+        # Position in JAX's flattened leaves of each entry in _plans
+        self._positions: tuple[int, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def __repr__(self) -> str:
+        return f"CompiledPyTree({self.source}, leaves={len(self._plans)})"
+
+    def check(
+        self,
+        value: Any,
+        ctx: UnificationContext,
+        fn_name: str | None = None,
+        shapes: tuple[tuple[int, ...], ...] | None = None,
+    ) -> None:
+        """
+        Validate value against the spec, binding Dims in ctx.
+
+        Args:
+            value: The PyTree to check
+            ctx: Unification context for tracking dimension bindings
+            fn_name: Function name to attach to errors
+            shapes: ``shape_key(value)``, if the caller already computed it
+
+        Raises:
+            ShapeGuardError: On a structural mismatch or a non-array leaf
+            RankMismatchError, DimensionMismatchError, UnificationError:
+                On a leaf shape mismatch
+        """
+        cache = self.cache
+        if cache is None:
+            self._match(self.leaves(value, fn_name), ctx, fn_name)
+            return
+
+        leaves = None
+        if shapes is None:
+            leaves = self.leaves(value, fn_name)
+            shapes = _leaf_shapes(leaves)
+        verdict = cache.get(shapes) if shapes is not None else None
+        if verdict is not None:
+            ctx.update(verdict)
+            return
+
+        if leaves is None:
+            leaves = self.leaves(value, fn_name)
+        self._match(leaves, ctx, fn_name)
+        if shapes is not None:
+            cache.put(shapes, self._verdict(shapes))
+
+    def _match(self, leaves: list[Any], ctx: UnificationContext, fn_name: str | None) -> None:
+        try:
+            for (plan, source), leaf in zip(self._plans, leaves, strict=True):
+                shape = array_shape(leaf)
+                if shape is None:
+                    raise ShapeGuardError(
+                        f"Expected array for {source}, got {type(leaf).__name__}",
+                        argument=source,
+                        expected="array",
+                        actual=type(leaf).__name__,
+                    )
+                plan.match(shape, ctx, source)
+        except ShapeGuardError as e:
+            e.function = fn_name
+            raise
+
+    def _verdict(self, shapes: tuple[tuple[int, ...], ...]) -> UnificationContext:
+        """Each Dim's binding at its first occurrence, for leaf shapes that passed."""
+        verdict = UnificationContext()
+        for (plan, source), shape in zip(self._plans, shapes, strict=True):
+            for index, dim in plan.dims:
+                if verdict.resolve(dim) is None:
+                    verdict.bind_indexed(dim, shape[index], source, index % len(shape))
+        return verdict
+
+    def leaves(self, value: Any, fn_name: str | None = None) -> list[Any]:
+        """
+        Leaf values of value in spec order.
+
+        Raises:
+            ShapeGuardError: If value doesn't have the spec's structure
+        """
+        leaves = self._jax_leaves(value)
+        if leaves is not None:
+            return leaves
+
+        nodes = [value] * (self._depth + 1)
+        leaves = []
+        for path, shared, has_leaf in self._walks:
+            node = nodes[shared]
+            for depth in range(shared, len(path)):
+                node = _step(node, path[depth], fn_name)
+                nodes[depth + 1] = node
+            if has_leaf:
+                leaves.append(node)
+        return leaves
+
+    def shape_key(self, value: Any) -> tuple[tuple[int, ...], ...] | None:
+        """Flat tuple of leaf shapes, or None if value doesn't fit the spec's structure."""
+        try:
+            leaves = self.leaves(value)
+        except ShapeGuardError:
+            return None
+        return _leaf_shapes(leaves)
+
+    def _jax_leaves(self, value: Any) -> list[Any] | None:
+        """Leaves of value in spec order via JAX, or None to fall back to path walks."""
+        tree_flatten = get_tree_flatten()
+        if tree_flatten is None:
+            return None
+        treedef = self._treedef
+        if treedef is None:
+            treedef = self._resolve_treedef(tree_flatten)
+        if treedef is _NO_TREEDEF:
+            return None
+        try:
+            leaves, value_treedef = tree_flatten(value)
+        except Exception:
+            return None
+        if value_treedef != treedef:
+            return None
+        return [leaves[pos] for pos in self._positions]
+
+    def _resolve_treedef(self, tree_flatten: Callable[[Any], tuple[list[Any], Any]]) -> Any:
+        try:
+            leaves, treedef = tree_flatten(_skeleton(self.spec, [0]))
+        except Exception:
+            # e.g. dataclasses.replace on init=False fields, unsortable dict keys
+            leaves, treedef = [], _NO_TREEDEF
+        if len(leaves) != len(self._plans) or not all(isinstance(leaf, _Leaf) for leaf in leaves):
+            treedef = _NO_TREEDEF
+        else:
+            positions = [0] * len(leaves)
+            for pos, leaf in enumerate(leaves):
+                positions[leaf.index] = pos
+            self._positions = tuple(positions)
+        self._treedef = treedef
+        return treedef
+
+
+def compile_pytree(
+    spec: PyTreeSpec, source: str = "value", cache: int | None = None
+) -> CompiledPyTree:
+    """
+    Compile a PyTree spec into a reusable CompiledPyTree.
+
+    Args:
+        spec: Dict, list, tuple, NamedTuple or dataclass instance of shape specs
+        source: Name of the value, used as the root of leaf sources in errors
+        cache: Remember verdicts for up to this many leaf-shape signatures
+
+    Raises:
+        TypeError: If any leaf is not a valid shape spec
+    """
+    return CompiledPyTree(spec, source, ShapeCache(cache) if cache is not None else None)
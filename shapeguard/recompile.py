@@ -0,0 +1,286 @@
+"""
+Recompilation detector.
+
+Every time JAX (re)traces a jitted computation, the shapeguard wrappers
+inside it run and bind their Dims. ``RecompileMonitor`` records those
+bindings, together with JAX's trace and compile timings from
+``jax.monitoring``, and reports which Dims changed between traces: the
+cause of retrace churn.
+
+Usage:
+    from shapeguard.recompile import RecompileMonitor
+
+    with RecompileMonitor() as monitor:
+        for batch in loader:
+            train_step(state, batch)
+
+    print(monitor.report().format())
+    # train_step: compiled 37 times, 41.20s compiling, 2.10s tracing
+    #   T took 37 distinct values: 97, 113, 128, ... (changed in 36 retraces)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from shapeguard.config import config
+from shapeguard.core import Dim, UnificationContext
+
+# jax.monitoring duration events, by role
+_TRACE_EVENT = "/jax/core/compile/jaxpr_trace_duration"
+_LOWER_EVENT = "/jax/core/compile/jaxpr_to_mlir_module_duration"
+_COMPILE_EVENT = "/jax/core/compile/backend_compile_duration"
+
+# How many distinct values a report lists per Dim
+_MAX_LISTED = 8
+
+
+def _plural(n: int, word: str) -> str:
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def _times(n: int) -> str:
+    return "once" if n == 1 else f"{n} times"
+
+
+@dataclass
+class TraceRecord:
+    """
+    One traced call of a decorated function.
+
+    Attributes:
+        function: Qualified name of the decorated function
+        bindings: Dim -> size bound by its contract during the trace
+        trace_seconds: JAX tracing time of the computation it was traced in
+        compile_seconds: Lowering + backend compile time of that computation
+        compiled: Whether a backend compile followed the trace
+    """
+
+    function: str
+    bindings: dict[Dim, Any]
+    trace_seconds: float = 0.0
+    compile_seconds: float = 0.0
+    compiled: bool = False
+
+
+@dataclass(frozen=True)
+class FunctionRecompiles:
+    """
+    Retrace statistics of one decorated function.
+
+    Attributes:
+        function: Qualified name of the decorated function
+        traces: Number of times it was traced
+        compiles: Number of traces that were followed by a backend compile
+        values: Dim -> distinct sizes it took, in first-seen order
+        changed: Dim -> number of retraces in which its size differed from
+            the previous trace
+        unexplained: Retraces in which no Dim changed (a dtype, a static
+            argument or an unchecked dimension did)
+        trace_seconds: Total tracing time attributed to its traces
+        compile_seconds: Total compile time attributed to its traces
+    """
+
+    function: str
+    traces: int
+    compiles: int
+    values: dict[Dim, tuple[Any, ...]]
+    changed: dict[Dim, int]
+    unexplained: int
+    trace_seconds: float
+    compile_seconds: float
+
+    def format(self) -> str:
+        """Human-readable summary, one line per Dim that took several sizes."""
+        count = (
+            f"compiled {_times(self.compiles)}"
+            if self.compiles
+            else f"traced {_times(self.traces)}"
+        )
+        lines = [
+            f"{self.function}: {count}, {self.compile_seconds:.2f}s compiling, "
+            f"{self.trace_seconds:.2f}s tracing"
+        ]
+        for dim, values in self.values.items():
+            if len(values) < 2:
+                continue
+            listed = ", ".join(str(v) for v in values[:_MAX_LISTED])
+            if len(values) > _MAX_LISTED:
+                listed += ", ..."
+            lines.append(
+                f"  {dim.name} took {len(values)} distinct values: {listed} "
+                f"(changed in {_plural(self.changed.get(dim, 0), 'retrace')})"
+            )
+        if self.unexplained:
+            lines.append(
+                f"  {_plural(self.unexplained, 'retrace')} with no Dim change "
+                "(dtype, static argument or unchecked dimension)"
+            )
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class RecompileReport:
+    """
+    Retrace statistics per decorated function, most-traced first.
+
+    Attributes:
+        functions: Function name -> its statistics
+    """
+
+    functions: dict[str, FunctionRecompiles] = field(default_factory=dict)
+
+    def __getitem__(self, function: str) -> FunctionRecompiles:
+        return self.functions[function]
+
+    def format(self, min_traces: int = 1) -> str:
+        """Summaries of the functions traced at least ``min_traces`` times."""
+        parts = [f.format() for f in self.functions.values() if f.traces >= min_traces]
+        return "\n".join(parts) if parts else "No traced shapeguard functions"
+
+
+def _summarize(function: str, records: list[TraceRecord]) -> FunctionRecompiles:
+    values: dict[Dim, dict[Any, None]] = {}
+    changed: dict[Dim, int] = {}
+    unexplained = 0
+    previous: dict[Dim, Any] | None = None
+    for record in records:
+        for dim, value in record.bindings.items():
+            values.setdefault(dim, {})[value] = None
+        if previous is not None:
+            diff = [
+                dim
+                for dim in record.bindings.keys() | previous.keys()
+                if record.bindings.get(dim) != previous.get(dim)
+            ]
+            for dim in diff:
+                changed[dim] = changed.get(dim, 0) + 1
+            unexplained += not diff
+        previous = record.bindings
+    return FunctionRecompiles(
+        function=function,
+        traces=len(records),
+        compiles=sum(r.compiled for r in records),
+        values={dim: tuple(seen) for dim, seen in values.items()},
+        changed=changed,
+        unexplained=unexplained,
+        trace_seconds=sum(r.trace_seconds for r in records),
+        compile_seconds=sum(r.compile_seconds for r in records),
+    )
+
+
+class RecompileMonitor:
+    """
+    Record the Dim bindings of decorated functions each time JAX traces them.
+
+    While active (between ``start()`` and ``stop()``, or as a context
+    manager), every ``@expects``/``@ensures``/``@contract`` wrapper that runs
+    under a JAX trace reports its bindings here. Timings come from
+    ``jax.monitoring``: each trace and compile event is attributed to the
+    decorated calls traced since the previous one, so a computation that
+    traces several decorated functions counts its compile time for each.
+
+    Decorated functions with ``jit_mode="skip"`` don't validate under a
+    trace and are not recorded. Monitors nest; only the innermost active
+    one records, and they may be stopped in any order.
+
+    Attributes:
+        records: Every recorded trace, in order
+    """
+
+    def __init__(self) -> None:
+        self.records: list[TraceRecord] = []
+        self._pending: list[TraceRecord] = []
+        self._uncompiled: list[TraceRecord] = []
+        self._previous: RecompileMonitor | None = None
+        self._listening = False
+        self._active = False
+
+    def record(self, function: str, ctx: UnificationContext) -> None:
+        """Record a traced call of ``function`` with the bindings in ctx."""
+        bindings = {dim: binding.value for dim, binding in ctx.bindings.items()}
+        record = TraceRecord(function, bindings)
+        self.records.append(record)
+        self._pending.append(record)
+
+    def _on_duration(self, event: str, duration_secs: float, **kwargs: Any) -> None:
+        if config._monitor is not self:
+            return
+        if event == _TRACE_EVENT:
+            for record in self._pending:
+                record.trace_seconds += duration_secs
+            self._uncompiled.extend(self._pending)
+            self._pending = []
+        elif event in (_LOWER_EVENT, _COMPILE_EVENT):
+            for record in self._uncompiled:
+                record.compile_seconds += duration_secs
+                if event == _COMPILE_EVENT:
+                    record.compiled = True
+            if event == _COMPILE_EVENT:
+                self._uncompiled = []
+
+    def start(self) -> RecompileMonitor:
+        """Start recording; returns self."""
+        if self._active:
+            raise RuntimeError("RecompileMonitor is already active")
+        try:
+            import jax.monitoring
+
+            jax.monitoring.register_event_duration_secs_listener(self._on_duration)
+            self._listening = True
+        except ImportError:
+            # Without JAX nothing is traced; records stay empty
+            pass
+        self._previous = config._monitor
+        config._monitor = self
+        self._active = True
+        return self
+
+    def stop(self) -> None:
+        """Stop recording. Records are kept."""
+        if not self._active:
+            return
+        if self._listening:
+            import jax.monitoring
+
+            jax.monitoring.unregister_event_duration_listener(self._on_duration)
+            self._listening = False
+        # Unlink from the stack of active monitors, which may be stopped out of order
+        if config._monitor is self:
+            config._monitor = self._previous
+        else:
+            monitor = config._monitor
+            while monitor is not None and monitor._previous is not self:
+                monitor = monitor._previous
+            if monitor is not None:
+                monitor._previous = self._previous
+        self._previous = None
+        self._active = False
+
+    def reset(self) -> None:
+        """Forget all records."""
+        self.records = []
+        self._pending = []
+        self._uncompiled = []
+
+    def report(self) -> RecompileReport:
+        """Summarize the records per function, most-traced first."""
+        by_function: dict[str, list[TraceRecord]] = {}
+        for record in self.records:
+            by_function.setdefault(record.function, []).append(record)
+        summaries = [_summarize(name, records) for name, records in by_function.items()]
+        summaries.sort(key=lambda s: (-s.traces, s.function))
+        return RecompileReport({s.function: s for s in summaries})
+
+    def __enter__(self) -> RecompileMonitor:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"RecompileMonitor(records={len(self.records)}, active={self._active})"
+
+
+__all__ = ["RecompileMonitor", "RecompileReport", "FunctionRecompiles", "TraceRecord"]
@@ -4,6 +4,7 @@ Shape specification parsing and matching.
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 from shapeguard._compat import get_shape
@@ -20,43 +21,167 @@ from shapeguard.errors import (
 ShapeSpec = tuple[int | Dim | None | _EllipsisType, ...]
 
 
-def _has_ellipsis(spec: ShapeSpec) -> bool:
-    """Check if spec contains an ellipsis."""
-    return any(s is ... or isinstance(s, _EllipsisType) for s in spec)
+def _is_ellipsis(s: Any) -> bool:
+    """Check if a spec element is an ellipsis (``...`` or ``ELLIPSIS``)."""
+    return s is ... or isinstance(s, _EllipsisType)
 
 
-# Type alias for spec parts without ellipsis
-SpecPart = tuple[int | Dim | None, ...]
+class CompiledSpec:
+    """
+    A shape spec compiled once into an immutable matching plan.
 
+    Compiling resolves the ellipsis split and the kind of every element up
+    front, so matching is a rank test followed by a flat loop over the
+    concrete and symbolic slots. Wildcards never appear in the loop.
 
-def _filter_ellipsis(items: ShapeSpec) -> SpecPart:
-    """Filter out ellipsis from spec items."""
-    return tuple(s for s in items if not (s is ... or isinstance(s, _EllipsisType)))
+    Slot indices before the ellipsis (or all indices, if there is none) are
+    non-negative. Slots after the ellipsis use negative indices, so they
+    align from the end of the actual shape whatever its rank.
 
+    Attributes:
+        spec: The original specification (used in error messages)
+        rank: Number of non-ellipsis elements (minimum rank if has_ellipsis)
+        has_ellipsis: Whether the spec contains an ellipsis
+        fixed: ``(index, value)`` pairs for concrete dimensions
+        dims: ``(index, Dim)`` pairs for symbolic dimensions
+        wildcards: Indices of ``None`` elements
 
-def _split_ellipsis_spec(spec: ShapeSpec) -> tuple[SpecPart, SpecPart]:
+    Example:
+        ```python
+        plan = compile_spec((..., n, 128))
+        plan.match((2, 3, 128), ctx, "x")
+        ```
     """
-    Split a spec at the ellipsis into (before, after) parts.
 
-    The returned tuples do not contain ellipsis elements.
+    __slots__ = ("spec", "rank", "has_ellipsis", "fixed", "dims", "wildcards", "_steps")
+
+    def __init__(self, spec: ShapeSpec) -> None:
+        ellipsis_indices = [i for i, s in enumerate(spec) if _is_ellipsis(s)]
+        if len(ellipsis_indices) > 1:
+            raise ValueError("Shape spec cannot contain more than one ellipsis")
+
+        has_ellipsis = bool(ellipsis_indices)
+        split = ellipsis_indices[0] if has_ellipsis else len(spec)
+        rank = len(spec) - len(ellipsis_indices)
+
+        fixed: list[tuple[int, int]] = []
+        dims: list[tuple[int, Dim]] = []
+        wildcards: list[int] = []
+        # (index, Dim or None for concrete, concrete value), in spec order
+        steps: list[tuple[int, Dim | None, int]] = []
+
+        for position, spec_dim in enumerate(spec):
+            if position == split:
+                continue
+            # Slots after the ellipsis are addressed from the end
+            index = position if position < split else position - len(spec)
+
+            if spec_dim is None:
+                wildcards.append(index)
+            elif isinstance(spec_dim, Dim):
+                dims.append((index, spec_dim))
+                steps.append((index, spec_dim, 0))
+            elif isinstance(spec_dim, int):
+                fixed.append((index, spec_dim))
+                steps.append((index, None, spec_dim))
+            else:
+                raise TypeError(
+                    f"Invalid spec element at position {position}: {spec_dim!r} "
+                    f"(expected int, Dim, None, or ...)"
+                )
+
+        self.spec = spec
+        self.rank = rank
+        self.has_ellipsis = has_ellipsis
+        self.fixed = tuple(fixed)
+        self.dims = tuple(dims)
+        self.wildcards = tuple(wildcards)
+        self._steps = tuple(steps)
+
+    def match(
+        self,
+        actual: tuple[int, ...],
+        ctx: UnificationContext,
+        source: str,
+    ) -> None:
+        """
+        Match an actual shape against this plan.
+
+        Args:
+            actual: The actual shape to check
+            ctx: Unification context for tracking dimension bindings
+            source: Description of where this shape came from (for error messages)
+
+        Raises:
+            RankMismatchError: If the number of dimensions doesn't match
+            DimensionMismatchError: If a concrete dimension doesn't match
+            UnificationError: If a symbolic dimension conflicts with prior binding
+        """
+        n = len(actual)
+        if n != self.rank and (not self.has_ellipsis or n < self.rank):
+            raise RankMismatchError(
+                # "2+" means at least 2
+                expected_rank=f"{self.rank}+" if self.has_ellipsis else self.rank,
+                actual_rank=n,
+                expected_shape=self.spec,
+                actual_shape=actual,
+                bindings=ctx.format_bindings(),
+            )
+
+        for index, dim, value in self._steps:
+            actual_dim = actual[index]
+            if dim is None:
+                if actual_dim != value:
+                    raise DimensionMismatchError(
+                        dim_index=index % n,
+                        expected_value=value,
+                        actual_value=actual_dim,
+                        expected_shape=self.spec,
+                        actual_shape=actual,
+                        bindings=ctx.format_bindings(),
+                    )
+            else:
+                ctx.bind_indexed(dim, actual_dim, source, index % n)
+
+    def __repr__(self) -> str:
+        return f"CompiledSpec{format_spec(self.spec)}"
+
 
-    Raises ValueError if more than one ellipsis.
+@functools.lru_cache(maxsize=1024)
+def _compile_cached(spec: ShapeSpec, types: tuple[type, ...]) -> CompiledSpec:
+    # types is part of the key: (1.0, 2) == (1, 2), but only the latter is valid
+    return CompiledSpec(spec)
+
+
+def compile_spec(spec: ShapeSpec | CompiledSpec) -> CompiledSpec:
     """
-    ellipsis_indices = [i for i, s in enumerate(spec) if s is ... or isinstance(s, _EllipsisType)]
+    Compile a shape spec into a reusable matching plan.
 
-    if len(ellipsis_indices) > 1:
-        raise ValueError("Shape spec cannot contain more than one ellipsis")
+    Plans for hashable specs are cached, so repeated calls with the same
+    spec tuple return the same plan. Passing a plan returns it unchanged.
 
-    if not ellipsis_indices:
-        return _filter_ellipsis(spec), ()
+    The cache keeps the most recently used 1024 plans, and each cached plan
+    holds strong references to the Dims in its spec. Dims are normally
+    module-level constants, so this is harmless; code that creates Dims per
+    call keeps at most 1024 specs' worth of them alive.
 
-    idx = ellipsis_indices[0]
-    return _filter_ellipsis(spec[:idx]), _filter_ellipsis(spec[idx + 1 :])
+    Raises:
+        ValueError: If the spec contains more than one ellipsis
+        TypeError: If the spec contains an invalid element
+    """
+    if isinstance(spec, CompiledSpec):
+        return spec
+    try:
+        return _compile_cached(spec, tuple(map(type, spec)))
+    except TypeError:
+        # Unhashable spec (e.g. a list), or an invalid element: compile
+        # directly so the real error surfaces
+        return CompiledSpec(spec)
 
 
 def match_shape(
     actual: tuple[int, ...],
-    spec: ShapeSpec,
+    spec: ShapeSpec | CompiledSpec,
     ctx: UnificationContext,
     source: str,
 ) -> None:
@@ -65,7 +190,8 @@ def match_shape(
 
     Args:
         actual: The actual shape to check
-        spec: The shape specification (can include ... for variable dims)
+        spec: The shape specification (can include ... for variable dims),
+            or a plan from ``compile_spec``
         ctx: Unification context for tracking dimension bindings
         source: Description of where this shape came from (for error messages)
 
@@ -81,91 +207,12 @@ def match_shape(
         match_shape((3, 4), (..., n, m), ctx, "x")     # ellipsis matches ()
         ```
     """
-    # Handle ellipsis in spec
-    if _has_ellipsis(spec):
-        before, after = _split_ellipsis_spec(spec)
-        required_dims = len(before) + len(after)
-
-        if len(actual) < required_dims:
-            raise RankMismatchError(
-                expected_rank=f"{required_dims}+",  # "2+" means at least 2
-                actual_rank=len(actual),
-                expected_shape=spec,
-                actual_shape=actual,
-                bindings=ctx.format_bindings(),
-            )
-
-        # Match the 'before' part (leading fixed dims)
-        for i, spec_dim in enumerate(before):
-            _match_dim(actual[i], spec_dim, i, actual, spec, ctx, source)
-
-        # Match the 'after' part (trailing fixed dims)
-        # These align from the end
-        offset = len(actual) - len(after)
-        for i, spec_dim in enumerate(after):
-            actual_idx = offset + i
-            _match_dim(actual[actual_idx], spec_dim, actual_idx, actual, spec, ctx, source)
-
-        return
-
-    # No ellipsis: require exact rank match
-    if len(actual) != len(spec):
-        raise RankMismatchError(
-            expected_rank=len(spec),
-            actual_rank=len(actual),
-            expected_shape=spec,
-            actual_shape=actual,
-            bindings=ctx.format_bindings(),
-        )
-
-    # Check each dimension (filter for type narrowing, no ellipsis present)
-    spec_dims = _filter_ellipsis(spec)
-    for i, spec_dim in enumerate(spec_dims):
-        _match_dim(actual[i], spec_dim, i, actual, spec, ctx, source)
-
-
-def _match_dim(
-    actual_dim: int,
-    spec_dim: int | Dim | None,
-    index: int,
-    actual_shape: tuple[int, ...],
-    spec: ShapeSpec,
-    ctx: UnificationContext,
-    source: str,
-) -> None:
-    """Match a single dimension against its spec."""
-    dim_source = f"{source}[{index}]"
-
-    if spec_dim is None:
-        # Wildcard: accept any value
-        return
-
-    elif isinstance(spec_dim, Dim):
-        # Symbolic dimension: unify with context
-        ctx.bind(spec_dim, actual_dim, dim_source)
-
-    elif isinstance(spec_dim, int):
-        # Concrete dimension: must match exactly
-        if actual_dim != spec_dim:
-            raise DimensionMismatchError(
-                dim_index=index,
-                expected_value=spec_dim,
-                actual_value=actual_dim,
-                expected_shape=spec,
-                actual_shape=actual_shape,
-                bindings=ctx.format_bindings(),
-            )
-
-    else:
-        raise TypeError(
-            f"Invalid spec element at position {index}: {spec_dim!r} "
-            f"(expected int, Dim, None, or ...)"
-        )
+    compile_spec(spec).match(actual, ctx, source)
 
 
 def check_shape(
     x: Any,
-    spec: ShapeSpec,
+    spec: ShapeSpec | CompiledSpec,
     name: str = "array",
     *,
     ctx: UnificationContext | None = None,
@@ -177,7 +224,7 @@ def check_shape(
 
     Args:
         x: Array-like object to check
-        spec: Shape specification to match against
+        spec: Shape specification (or ``compile_spec`` plan) to match against
         name: Name to use in error messages
         ctx: Optional unification context (created if not provided)
 
@@ -202,7 +249,7 @@ def check_shape(
     actual = get_shape(x)
 
     try:
-        match_shape(actual, spec, ctx, name)
+        compile_spec(spec).match(actual, ctx, name)
     except ShapeGuardError as e:
         # Add name context to error
         e.argument = name
@@ -0,0 +1,325 @@
+"""
+Ahead-of-time compile warm-up driven by shape contracts.
+
+Given the sizes each free Dim of a contract can take (or its buckets),
+``warmup`` enumerates every shape combination, builds
+``jax.ShapeDtypeStruct`` inputs from the specs and compiles the function
+for each of them in a thread pool, so compilation happens at process
+start instead of on the first live requests.
+
+Usage:
+    from shapeguard import Batch, Dim, expects
+    from shapeguard.warmup import warmup
+
+    B = Batch(buckets=(1, 8, 32))
+    T = Dim("T", buckets=(128, 512, 2048))
+
+    @jax.jit
+    @expects(tokens=(B, T))
+    def serve(params, tokens): ...
+
+    report = warmup(serve, dtype={"tokens": "int32"}, fixed={"params": params})
+    print(report.format())   # 9 combinations, compile time of each
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, cast
+
+from shapeguard._compat import get_shape, is_array
+from shapeguard.core import Dim, UnificationContext
+from shapeguard.dryrun import placeholder
+from shapeguard.paths import PathSpec
+from shapeguard.pytree import (
+    _children,
+    _is_dataclass_instance,
+    _is_namedtuple,
+    _spec_leaves,
+    compile_pytree,
+    is_pytree_spec,
+)
+from shapeguard.spec import compile_spec
+
+# jax.monitoring event for a persistent compilation cache hit
+_CACHE_HIT_EVENT = "/jax/compilation_cache/cache_hits"
+
+
+@dataclass
+class WarmupResult:
+    """
+    Outcome of compiling one shape combination.
+
+    Attributes:
+        sizes: Dim -> size for this combination
+        lower_seconds: Time spent tracing and lowering
+        compile_seconds: Time spent compiling (or loading from the cache)
+        cached: Whether the executable came from the persistent cache
+        compiled: The ``jax.stages.Compiled`` executable, None on failure
+        error: The exception raised while lowering or compiling, if any
+    """
+
+    sizes: dict[Dim, int]
+    lower_seconds: float = 0.0
+    compile_seconds: float = 0.0
+    cached: bool = False
+    compiled: Any = None
+    error: BaseException | None = None
+
+    @property
+    def label(self) -> str:
+        """The combination as ``"B=8, T=512"``."""
+        return ", ".join(f"{dim.name}={size}" for dim, size in self.sizes.items())
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """
+    Results of a warm-up, in enumeration order.
+
+    Attributes:
+        results: One result per shape combination
+        seconds: Wall-clock time of the whole warm-up
+    """
+
+    results: tuple[WarmupResult, ...]
+    seconds: float
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def compiled(self) -> int:
+        """Number of combinations compiled from scratch."""
+        return sum(r.error is None and not r.cached for r in self.results)
+
+    @property
+    def cached(self) -> int:
+        """Number of combinations loaded from the persistent compilation cache."""
+        return sum(r.error is None and r.cached for r in self.results)
+
+    def failures(self) -> list[WarmupResult]:
+        """Results whose lowering or compilation raised."""
+        return [r for r in self.results if r.error is not None]
+
+    def raise_if_any(self) -> None:
+        """Re-raise the error of the first failed combination, if any."""
+        for result in self.results:
+            if result.error is not None:
+                raise result.error
+
+    def format(self) -> str:
+        """Human-readable summary with one line per combination."""
+        lines = [
+            f"Warmed up {len(self.results)} shape combinations in {self.seconds:.2f}s "
+            f"({self.compiled} compiled, {self.cached} cached, {len(self.failures())} failed)"
+        ]
+        for r in self.results:
+            if r.error is not None:
+                reason = getattr(r.error, "reason", None) or r.error
+                status = f"failed: {type(r.error).__name__}: {reason}"
+            elif r.cached:
+                status = f"cached, {r.compile_seconds:.2f}s load, {r.lower_seconds:.2f}s lower"
+            else:
+                status = f"{r.compile_seconds:.2f}s compile, {r.lower_seconds:.2f}s lower"
+            lines.append(f"  {r.label}: {status}")
+        return "\n".join(lines)
+
+
+def _jitted(fn: Callable[..., Any]) -> Any:
+    """The first ``jax.jit`` object in fn's ``__wrapped__`` chain, else jax.jit(fn)."""
+    import jax
+
+    inner: Any = fn
+    while inner is not None:
+        if hasattr(inner, "lower"):
+            return inner
+        inner = getattr(inner, "__wrapped__", None)
+    return jax.jit(fn)
+
+
+def _fixed_bindings(specs: Mapping[str, Any], fixed: Mapping[str, Any]) -> UnificationContext:
+    """Bind the Dims of the fixed arguments' specs from their values."""
+    ctx = UnificationContext()
+    for name, value in fixed.items():
+        spec = specs.get(name)
+        if spec is None or isinstance(spec, PathSpec):
+            continue
+        if is_pytree_spec(spec):
+            compile_pytree(spec, name).check(value, ctx)
+        elif isinstance(spec, tuple) and is_array(value):
+            compile_spec(spec).match(get_shape(value), ctx, name)
+    return ctx
+
+
+def _free_dims(
+    specs: Iterable[Any],
+    values: Mapping[Dim | str, Iterable[int]],
+    ctx: UnificationContext,
+) -> dict[Dim, tuple[int, ...]]:
+    """
+    Each Dim of the specs, in first-seen order, with the sizes to warm up.
+
+    Sizes come from ``values``, else the Dim's binding from the fixed
+    arguments, else its buckets.
+    """
+    dims: dict[Dim, tuple[int, ...]] = {}
+    for spec in specs:
+        for flat in _spec_leaves(spec):
+            for entry in flat:
+                if not isinstance(entry, Dim) or entry in dims:
+                    continue
+                sizes = values.get(entry, values.get(entry.name))
+                bound = ctx.resolve(entry)
+                if sizes is None and bound is not None:
+                    sizes = (bound,)
+                if sizes is None:
+                    sizes = entry.buckets
+                if sizes is None:
+                    raise ValueError(
+                        f"warmup: no sizes for dim {entry.name!r}; "
+                        "pass them in values= or declare buckets on the Dim"
+                    )
+                dims[entry] = tuple(sizes)
+    return dims
+
+
+def _placeholders(spec: Any, sizes: Mapping[Dim, int], dtype: Any, name: str) -> Any:
+    """``jax.ShapeDtypeStruct`` inputs for one argument, mirroring its spec."""
+    if is_pytree_spec(spec):
+        children = [_placeholders(sub, sizes, dtype, name) for *_, sub in _children(spec)]
+        if isinstance(spec, dict):
+            return dict(zip(spec, children, strict=True))
+        if _is_dataclass_instance(spec):
+            fields = [f.name for f in dataclasses.fields(spec)]
+            return dataclasses.replace(spec, **dict(zip(fields, children, strict=True)))
+        if _is_namedtuple(spec):
+            return type(spec)(*children)
+        return type(spec)(children)
+    if not isinstance(spec, tuple):
+        raise ValueError(
+            f"warmup: cannot build inputs for argument {name!r} from its spec; pass it in fixed="
+        )
+    # placeholder() also takes names as keys; Mapping keys are invariant
+    return placeholder(spec, cast("Mapping[Dim | str, int]", sizes), dtype)
+
+
+def warmup(
+    fn: Callable[..., Any],
+    values: Mapping[Dim | str, Iterable[int]] | None = None,
+    *,
+    dtype: Any = "float32",
+    fixed: Mapping[str, Any] | None = None,
+    max_workers: int | None = None,
+) -> WarmupReport:
+    """
+    Compile a shape-checked function ahead of time for every shape combination.
+
+    Every Dim in the function's input specs takes the sizes given in
+    ``values`` (keyed by Dim or name) or, failing that, its ``buckets``.
+    For each combination of sizes, inputs are built as
+    ``jax.ShapeDtypeStruct`` from the specs, and the jitted function is
+    lowered and compiled in a thread pool.
+
+    The executables land in JAX's in-memory cache, so the first call at
+    those shapes skips compilation. With JAX's persistent compilation
+    cache enabled, combinations that are already cached are loaded rather
+    than compiled, and reported as cached.
+
+    When ``jax.jit`` is applied outside the decorator, lowering runs the
+    contract checks. When it is applied inside, the inner jitted function
+    is compiled directly (the placeholders satisfy the input specs by
+    construction). An undecorated-by-jit function is wrapped in
+    ``jax.jit``.
+
+    Args:
+        fn: Function decorated with ``@expects`` or ``@contract``, jitted
+            inside or outside the decorator
+        values: Sizes to warm up per Dim. Dims not listed take their size
+            from the ``fixed`` arguments, or else their buckets
+        dtype: Input dtype, or a mapping of argument name -> dtype
+        fixed: Arguments passed as-is to every combination (e.g. parameters,
+            as arrays or ``ShapeDtypeStruct``), including any without a spec
+        max_workers: Thread pool size (default: the executor's default)
+
+    Returns:
+        A WarmupReport. Errors raised by a combination are recorded in its
+        result rather than raised; call ``raise_if_any()`` to surface them.
+
+    Raises:
+        ValueError: If fn has no specs, a Dim has no sizes, or an argument
+            can't be built from its spec and isn't in ``fixed``
+        ShapeGuardError: If a fixed argument doesn't match its spec
+        ImportError: If JAX is not installed
+    """
+    try:
+        import jax.monitoring
+    except ImportError as err:
+        raise ImportError("shapeguard.warmup requires JAX") from err
+
+    specs = getattr(fn, "__shapeguard_specs__", None)
+    if specs is None:
+        raise ValueError(
+            f"warmup: {getattr(fn, '__qualname__', fn)!r} has no shape specs; "
+            "decorate it with @expects or @contract"
+        )
+    fixed = dict(fixed or {})
+    ctx = _fixed_bindings(specs, fixed)
+    free_specs = [spec for name, spec in specs.items() if name not in fixed]
+    dims = _free_dims(free_specs, values or {}, ctx)
+    sig = inspect.signature(fn)
+    jitted = _jitted(fn)
+
+    # Build every combination's inputs up front, so spec errors raise here
+    jobs = []
+    for combo in itertools.product(*dims.values()):
+        sizes = dict(zip(dims, combo, strict=True))
+        arguments = dict(fixed)
+        for name, spec in specs.items():
+            if name not in fixed:
+                arg_dtype = dtype.get(name, "float32") if isinstance(dtype, Mapping) else dtype
+                arguments[name] = _placeholders(spec, sizes, arg_dtype, name)
+        try:
+            bound = sig.bind(**arguments)
+        except TypeError as err:
+            raise ValueError(f"warmup: {err}; pass arguments without a spec in fixed=") from err
+        jobs.append((WarmupResult(sizes), bound))
+
+    local = threading.local()
+
+    def on_event(event: str, **kwargs: Any) -> None:
+        if event == _CACHE_HIT_EVENT:
+            local.hit = True
+
+    def compile_one(job: tuple[WarmupResult, inspect.BoundArguments]) -> None:
+        result, bound = job
+        local.hit = False
+        try:
+            start = time.perf_counter()
+            lowered = jitted.lower(*bound.args, **bound.kwargs)
+            mid = time.perf_counter()
+            result.compiled = lowered.compile()
+            result.compile_seconds = time.perf_counter() - mid
+            result.lower_seconds = mid - start
+            result.cached = local.hit
+        except Exception as err:
+            result.error = err
+
+    jax.monitoring.register_event_listener(on_event)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(compile_one, jobs))
+    finally:
+        jax.monitoring.unregister_event_listener(on_event)
+    return WarmupReport(tuple(result for result, _ in jobs), time.perf_counter() - start)
+
+
+__all__ = ["warmup", "WarmupReport", "WarmupResult"]
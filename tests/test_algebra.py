@@ -0,0 +1,260 @@
+"""
+Tests for shapeguard.algebra — symbolic shape rules.
+"""
+
+import pytest
+
+from shapeguard import Dim, check_shape
+from shapeguard import algebra as sa
+from shapeguard.core import UnificationContext
+from shapeguard.errors import RankMismatchError, ShapeGuardError
+from tests.conftest import requires_numpy
+
+B, T, D, H, K = Dim("B"), Dim("T"), Dim("D"), Dim("H"), Dim("K")
+
+
+class TestSymExpr:
+    """Tests for symbolic expressions."""
+
+    def test_arithmetic_simplifies(self):
+        assert sa.sym(T) * 1 is T
+        assert sa.sym(T) - T == 0
+        assert sa.sym(T) + 2 - 2 is T
+        assert sa.sym(3) == 3
+
+    def test_structural_equality(self):
+        assert sa.sym(T) * D == sa.sym(D) * T
+        assert (sa.sym(T) + 1) * 2 == sa.sym(T) * 2 + 2
+        assert sa.sym(T) * D != sa.sym(T) * H
+
+    def test_hash_agrees_with_equality(self):
+        """Expressions equal to an int or a Dim hash like it."""
+        for expr, value in ((sa.sym(T), T), (sa.SymExpr({(): 3}), 3), (sa.SymExpr({}), 0)):
+            assert expr == value
+            assert hash(expr) == hash(value)
+        assert {sa.sym(T): 1}[T] == 1
+        assert hash(sa.sym(T) * D) == hash(sa.sym(D) * T)
+
+    def test_repr(self):
+        assert repr(sa.sym(T) * T * 2 - K + 3) == "2*T*T - K + 3"
+        assert repr(sa.sym(H) * K) == "H*K"
+
+    def test_evaluate(self):
+        ctx = UnificationContext()
+        ctx.bind(T, 3, "x")
+        assert sa.evaluate((B, sa.sym(T) * D, sa.sym(T) + 1), ctx) == (B, sa.sym(D) * 3, 4)
+
+    def test_invalid_entry(self):
+        with pytest.raises(TypeError):
+            sa.transpose((B, "T"))
+
+
+class TestCheck:
+    """Tests for checking concrete shapes against symbolic ones."""
+
+    def test_solves_linear_dims(self):
+        ctx = sa.check((2, 3, 12), (B, T, sa.sym(T) * K))
+        assert ctx.resolve(K) == 4
+        ctx = sa.check((9,), (sa.sym(T) * 2 + 1,))
+        assert ctx.resolve(T) == 4
+
+    def test_mismatch(self):
+        with pytest.raises(ShapeGuardError) as exc:
+            sa.check((2, 3, 10), (B, T, sa.sym(T) * K))
+        assert exc.value.argument == "array"
+
+    def test_underdetermined(self):
+        with pytest.raises(ShapeGuardError, match="cannot prove"):
+            sa.check((12,), (sa.sym(T) * K,))
+
+    def test_rank(self):
+        with pytest.raises(RankMismatchError):
+            sa.check((2, 3), (B,))
+
+    @requires_numpy
+    def test_shares_context_with_check_shape(self, np_array):
+        ctx = check_shape(np_array((2, 6)), (B, T))
+        out = sa.reshape((B, T), (B, 2, -1), ctx=ctx)
+        assert out == (2, 2, 3)
+        with pytest.raises(ShapeGuardError) as exc:
+            sa.check(np_array((3, 6)), (B, T), ctx=ctx)
+        assert (exc.value.expected, exc.value.actual) == (2, 3)
+
+
+class TestReshape:
+    """Tests for reshape."""
+
+    def test_infer_symbolic(self):
+        assert sa.reshape((B, T, sa.sym(H) * K), (B, T, H, -1)) == (B, T, H, K)
+        assert sa.reshape((B, T, D), (B, -1)) == (B, sa.sym(T) * D)
+
+    def test_concrete(self):
+        assert sa.reshape((4, 6), (-1, 3)) == (8, 3)
+        with pytest.raises(ShapeGuardError):
+            sa.reshape((4, 6), (5, -1))
+        with pytest.raises(ShapeGuardError):
+            sa.reshape((4, 6), (5, 5))
+
+    def test_binds_from_size(self):
+        ctx = UnificationContext()
+        assert sa.reshape((T,), (2, 3), ctx=ctx) == (2, 3)
+        assert ctx.resolve(T) == 6
+
+    def test_solves_factor_after_cancelling_shared_dims(self):
+        ctx = UnificationContext()
+        assert sa.reshape((B, T, 12), (B, T, H, 4), ctx=ctx) == (B, T, 3, 4)
+        assert ctx.resolve(H) == 3 and ctx.resolve(B) is None
+        with pytest.raises(ShapeGuardError, match="cannot be equal"):
+            sa.reshape((B, T, 12), (B, T, H, 5))
+        with pytest.raises(ShapeGuardError, match="cannot prove"):
+            sa.reshape((B, 12), (T, H, 4))
+
+    def test_not_divisible(self):
+        with pytest.raises(ShapeGuardError, match="not a multiple"):
+            sa.reshape((B, T, D), (B, T, 8, -1))
+
+    def test_two_unknowns(self):
+        with pytest.raises(ValueError):
+            sa.reshape((4, 6), (-1, -1))
+
+
+class TestLayoutRules:
+    """Tests for transpose, squeeze, expand_dims, pad and slicing."""
+
+    def test_transpose(self):
+        assert sa.transpose((B, T, D)) == (D, T, B)
+        assert sa.transpose((B, T, D), (0, 2, 1)) == (B, D, T)
+        assert sa.transpose((B, T, D), (-3, -1, -2)) == (B, D, T)
+        with pytest.raises(ValueError):
+            sa.transpose((B, T, D), (0, 0, 1))
+
+    def test_squeeze(self):
+        assert sa.squeeze((B, 1, T, 1)) == (B, T)
+        ctx = UnificationContext()
+        assert sa.squeeze((B, T), 1, ctx=ctx) == (B,)
+        assert ctx.resolve(T) == 1
+        with pytest.raises(ShapeGuardError):
+            sa.squeeze((B, 3), 1)
+
+    def test_expand_dims(self):
+        assert sa.expand_dims((B, T), 1) == (B, 1, T)
+        assert sa.expand_dims((B, T), (0, -1)) == (1, B, T, 1)
+        with pytest.raises(ValueError):
+            sa.expand_dims((B, T), (0, 0))
+
+    def test_pad(self):
+        assert sa.pad((B, T), ((0, 0), (1, 2))) == (B, sa.sym(T) + 3)
+        assert sa.pad((3, 4), 1) == (5, 6)
+        assert sa.pad((3, 4), (0, 2)) == (5, 6)
+        with pytest.raises(ValueError):
+            sa.pad((3, 4), ((1, 1),))
+
+    @requires_numpy
+    @pytest.mark.parametrize(
+        "index",
+        [
+            0,
+            (slice(1, None),),
+            (Ellipsis, slice(None, None, 2)),
+            (None, 1, Ellipsis, slice(-3, None)),
+            (slice(2, -1), None, 3),
+        ],
+    )
+    def test_slice_matches_numpy(self, index):
+        import numpy as np
+
+        shape = (5, 7, 9)
+        assert sa.slice_shape(shape, index) == np.empty(shape)[index].shape
+
+    def test_slice_symbolic(self):
+        assert sa.slice_shape((B, T, D), (0, slice(1, None), None)) == (sa.sym(T) - 1, 1, D)
+        assert sa.slice_shape((B, T), (slice(None), slice(-3, None))) == (B, 3)
+        with pytest.raises(ShapeGuardError):
+            sa.slice_shape((B, T), (slice(None), slice(None, None, 2)))
+        with pytest.raises(IndexError):
+            sa.slice_shape((B, 4), (0, 4))
+        with pytest.raises(ValueError):
+            sa.slice_shape((B, T), (0, 0, 0))
+
+
+class TestCombiningRules:
+    """Tests for concatenate, stack and split."""
+
+    def test_concatenate(self):
+        assert sa.concatenate([(B, T), (B, 5), (B, sa.sym(T) + 1)], axis=1) == (
+            B,
+            sa.sym(T) * 2 + 6,
+        )
+        with pytest.raises(ShapeGuardError):
+            sa.concatenate([(2, T), (3, T)], axis=1)
+        with pytest.raises(ValueError):
+            sa.concatenate([(B, T), (B,)])
+
+    def test_concatenate_binds(self):
+        ctx = UnificationContext()
+        assert sa.concatenate([(B, 4), (2, 1)], axis=1, ctx=ctx) == (2, 5)
+        assert ctx.resolve(B) == 2
+
+    def test_stack(self):
+        assert sa.stack([(B, T), (B, T), (B, T)], axis=-1) == (B, T, 3)
+        with pytest.raises(ShapeGuardError, match="cannot prove"):
+            sa.stack([(B, T), (B, D)])
+
+    def test_split(self):
+        assert sa.split((B, 12), 3, axis=1) == [(B, 4)] * 3
+        assert sa.split((B, sa.sym(T) * 2), 2, axis=1) == [(B, T), (B, T)]
+        assert sa.split((B, T), [2, 5], axis=1) == [(B, 2), (B, 3), (B, sa.sym(T) - 5)]
+        with pytest.raises(ShapeGuardError):
+            sa.split((B, 10), 3, axis=1)
+        with pytest.raises(ShapeGuardError):
+            sa.split((B, 4), [2, 6], axis=1)
+
+
+class TestContractions:
+    """Tests for broadcast, matmul and dot_general."""
+
+    def test_broadcast(self):
+        assert sa.broadcast((B, 1, D), (T, 1)) == (B, T, D)
+        with pytest.raises(ShapeGuardError):
+            sa.broadcast((3,), (4,))
+
+    @requires_numpy
+    @pytest.mark.parametrize(
+        "a, b",
+        [((3,), (3,)), ((3,), (3, 4)), ((2, 3), (3,)), ((5, 1, 2, 3), (4, 3, 6))],
+    )
+    def test_matmul_matches_numpy(self, a, b):
+        import numpy as np
+
+        assert sa.matmul(a, b) == np.matmul(np.empty(a), np.empty(b)).shape
+
+    def test_matmul_symbolic(self):
+        assert sa.matmul((B, T, D), (D, K)) == (B, T, K)
+        assert sa.matmul((B, 1, T, K), (H, K, D)) == (B, H, T, D)
+        with pytest.raises(ShapeGuardError, match="cannot prove T == K"):
+            sa.matmul((B, T), (K, D))
+        with pytest.raises(ValueError):
+            sa.matmul((), (3,))
+
+    def test_matmul_binds_inner(self):
+        ctx = UnificationContext()
+        sa.matmul((B, D), (64, K), ctx=ctx)
+        assert ctx.resolve(D) == 64
+
+    def test_dot_general(self):
+        dims = (((2,), (1,)), ((0,), (0,)))
+        assert sa.dot_general((B, T, K), (B, K, D), dims) == (B, T, D)
+        with pytest.raises(ShapeGuardError):
+            sa.dot_general((B, T, 4), (B, 5, D), dims)
+        with pytest.raises(ValueError):
+            sa.dot_general((B, T, K), (B, K, D), (((2,), ()), ((0,), (0,))))
+
+    @requires_numpy
+    def test_dot_general_matches_jax(self):
+        jax = pytest.importorskip("jax")
+        import numpy as np
+
+        lhs, rhs = np.ones((2, 3, 4, 5)), np.ones((2, 5, 3, 6))
+        dims = (((3, 1), (1, 2)), ((0,), (0,)))
+        expected = jax.lax.dot_general(lhs, rhs, dims).shape
+        assert sa.dot_general(lhs.shape, rhs.shape, dims) == expected
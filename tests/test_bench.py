@@ -0,0 +1,58 @@
+"""
+Tests for the benchmark harness (smoke-level; timings are not asserted).
+"""
+
+from shapeguard import bench
+
+
+def _quick(filter_: str = "") -> list[bench.Result]:
+    cases = [c for c in bench.default_cases() if filter_ in c.name]
+    return bench.run(cases, number=5, repeat=1)
+
+
+class TestBench:
+    """Tests for shapeguard.bench."""
+
+    def test_cases_pass_their_contracts(self):
+        """Every case runs without raising (the inputs satisfy the specs)."""
+        for case in bench.default_cases():
+            case.fn(*case.args)
+            case.baseline(*case.args)
+
+    def test_matrix_covers_axes(self):
+        names = {c.name for c in bench.default_cases()}
+        for expected in (
+            "expects/rank=8",
+            "expects/args=4",
+            "expects/ellipsis",
+            "expects/pytree=2x4",
+            "expects/jit_mode=trace",
+            "ensures",
+            "contract",
+            "check_shape",
+            "ShapeContext/2-checks",
+        ):
+            assert expected in names
+
+    def test_save_and_compare(self, tmp_path):
+        results = _quick("check_shape")
+        path = str(tmp_path / "baseline.json")
+        bench.save_results(results, path)
+
+        loaded = bench.load_results(path)
+        assert list(loaded) == ["check_shape"]
+        assert loaded["check_shape"] == results[0]
+
+        table = bench.format_results(results, loaded)
+        assert "vs baseline" in table
+        assert "tracemalloc bytes/call" in table
+        assert "check_shape" in table
+
+    def test_main(self, tmp_path, capsys):
+        path = str(tmp_path / "out.json")
+        assert (
+            bench.main(["--filter", "ensures", "--number", "5", "--repeat", "1", "--save", path])
+            == 0
+        )
+        assert "ensures" in capsys.readouterr().out
+        assert bench.main(["--filter", "no-such-case"]) == 1
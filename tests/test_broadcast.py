@@ -2,10 +2,20 @@
 Tests for shapeguard.broadcast module.
 """
 
+import warnings
+
 import pytest
 
-from shapeguard.broadcast import broadcast_shape, explain_broadcast
-from shapeguard.errors import BroadcastError
+from shapeguard import config
+from shapeguard.broadcast import (
+    _broadcast_cached,
+    analyze_broadcast,
+    broadcast_shape,
+    broadcast_shapes_batch,
+    explain_broadcast,
+)
+from shapeguard.errors import BroadcastCostWarning, BroadcastError
+from tests.conftest import requires_numpy
 
 
 class TestBroadcastShape:
@@ -73,6 +83,38 @@ class TestBroadcastShape:
         with pytest.raises(BroadcastError):
             broadcast_shape((2, 3), (2, 4), (2, 3))
 
+    def test_error_reports_first_conflict_in_order(self):
+        """The conflict is reported against the broadcast of the earlier shapes."""
+        with pytest.raises(BroadcastError) as exc:
+            broadcast_shape((1, 3), (2, 1), (5, 3), (2, 4))
+
+        err = exc.value
+        assert err.shapes == [(1, 3), (2, 1), (5, 3), (2, 4)]
+        assert err.dim_index == -2
+        assert err.dim_values == [2, 5]
+
+    def test_results_cached(self):
+        """Repeated shape combinations hit the LRU cache."""
+        _broadcast_cached.cache_clear()
+        broadcast_shape((7, 1), (1, 9))
+        broadcast_shape((7, 1), (1, 9))
+        info = _broadcast_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_cache_keeps_equal_shapes_of_other_types_apart(self):
+        """A float shape equal to a cached int shape gets its own entry."""
+        assert broadcast_shape((2, 3), (1, 3)) == (2, 3)
+        result = broadcast_shape((2.0, 3), (1, 3))
+        assert type(result[0]) is float
+
+    @requires_numpy
+    def test_numpy_delegation(self):
+        """use_numpy gives the same results and the same errors."""
+        assert broadcast_shape((8, 1, 6, 1), (7, 1, 5), use_numpy=True) == (8, 7, 6, 5)
+        with pytest.raises(BroadcastError) as exc:
+            broadcast_shape((3, 4), (5, 4), use_numpy=True)
+        assert exc.value.dim_values == [3, 5]
+
     def test_no_shapes_raises(self):
         """No shapes raises ValueError."""
         with pytest.raises(ValueError) as exc:
@@ -219,3 +261,163 @@ class TestEdgeCases:
         assert broadcast_shape((15, 3, 5), (15, 1, 5)) == (15, 3, 5)
         assert broadcast_shape((15, 3, 5), (3, 5)) == (15, 3, 5)
         assert broadcast_shape((15, 3, 5), (3, 1)) == (15, 3, 5)
+
+
+@requires_numpy
+class TestBroadcastShapesBatch:
+    """Tests for broadcast_shapes_batch."""
+
+    def test_matches_broadcast_shape(self):
+        """Every row agrees with broadcast_shape, including error dims."""
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        features = rng.integers(0, 4, size=(500, 3))
+        labels = rng.integers(0, 4, size=(500, 2))
+        batch = broadcast_shapes_batch(features, labels)
+
+        assert len(batch) == 500
+        for row in range(500):
+            shapes = batch.row_shapes(row)
+            try:
+                expected = broadcast_shape(*shapes)
+            except BroadcastError as err:
+                assert not batch.ok[row]
+                assert batch.dim_index[row] == err.dim_index
+            else:
+                assert batch.ok[row]
+                assert tuple(batch.shapes[row]) == expected
+
+    def test_masks(self):
+        """Failing rows are flagged with their incompatible dims."""
+        import numpy as np
+
+        batch = broadcast_shapes_batch(
+            np.array([[32, 1], [32, 10], [7, 3]]),
+            np.array([[10], [10], [4]]),
+        )
+        assert batch.ok.tolist() == [True, True, False]
+        assert batch.incompatible.tolist() == [[False, False], [False, False], [False, True]]
+        assert batch.shapes.tolist() == [[32, 10], [32, 10], [7, -1]]
+        assert batch.dim_index.tolist() == [0, 0, -1]
+        assert batch.failures().tolist() == [2]
+        assert not batch.all_ok
+
+    def test_errors(self):
+        """error() and raise_if_any() give broadcast_shape's diagnostics."""
+        batch = broadcast_shapes_batch([[1, 4], [3, 4]], [[5, 4], [5, 4]])
+        assert batch.error(0) is None
+        err = batch.error(1)
+        assert err.shapes == [(3, 4), (5, 4)]
+        assert err.dim_values == [3, 5]
+
+        with pytest.raises(BroadcastError) as exc:
+            batch.raise_if_any()
+        assert exc.value.reason.startswith("row 1 of 2:")
+
+    def test_zero_sized_and_scalar_operands(self):
+        """Size 0 broadcasts like any size; rank-0 operands are all 1s."""
+        import numpy as np
+
+        batch = broadcast_shapes_batch([[0, 1], [0, 2]], [[1, 3], [1, 2]], np.zeros((2, 0), int))
+        assert batch.all_ok
+        assert batch.shapes.tolist() == [[0, 3], [0, 2]]
+
+    def test_only_scalar_operands(self):
+        """When every operand is rank 0, each row broadcasts to ()."""
+        import numpy as np
+
+        batch = broadcast_shapes_batch(np.zeros((3, 0), int), np.zeros((3, 0), int))
+        assert batch.all_ok
+        assert batch.shapes.shape == (3, 0)
+        assert batch.dim_index.tolist() == [0, 0, 0]
+        batch.raise_if_any()
+
+    @pytest.mark.parametrize(
+        "operands",
+        [
+            (),
+            ([1, 2],),
+            ([[1.5, 2.0]],),
+            ([[-1, 2]],),
+            ([[1, 2]], [[1, 2], [3, 4]]),
+        ],
+    )
+    def test_invalid_operands(self, operands):
+        with pytest.raises(ValueError):
+            broadcast_shapes_batch(*operands)
+
+
+class TestAnalyzeBroadcast:
+    """Tests for broadcast expansion cost analysis."""
+
+    def test_expansion_per_input(self):
+        report = analyze_broadcast((32, 1, 64), (1, 4096, 64))
+        assert report.shape == (32, 4096, 64)
+        assert report.elements == 32 * 4096 * 64
+        first, second = report.inputs
+        assert first.expansion == 4096.0
+        assert first.expanded_dims == (-2,)
+        assert second.expansion == 32.0
+        assert second.expanded_dims == (-3,)
+        assert report.max_expansion == 4096.0
+
+    def test_missing_dims_count_as_expanded(self):
+        report = analyze_broadcast((5, 4), (4,))
+        assert report.inputs[0].expanded_dims == ()
+        assert report.inputs[0].expansion == 1.0
+        assert report.inputs[1].expanded_dims == (-2,)
+
+    def test_bytes_need_a_dtype(self):
+        assert analyze_broadcast((3, 1), (1, 4)).nbytes is None
+        assert analyze_broadcast((3, 1), (1, 4), dtype=2).nbytes == 24
+
+    @requires_numpy
+    def test_bytes_from_arrays_and_dtypes(self):
+        import numpy as np
+
+        report = analyze_broadcast(np.zeros((3, 1), np.float64), np.zeros(4, np.float32))
+        assert report.itemsize == 8
+        assert report.nbytes == 96
+        assert [item.nbytes for item in report.inputs] == [24, 16]
+        assert analyze_broadcast((3, 1), (1, 4), dtype="float16").nbytes == 24
+
+    def test_threshold(self):
+        assert analyze_broadcast((10, 1), (1, 10), dtype=4, max_bytes=400).exceeds is False
+        assert analyze_broadcast((10, 1), (1, 10), dtype=4, max_bytes=399).exceeds is True
+        # Unknown size is never flagged
+        assert analyze_broadcast((10, 1), (1, 10), max_bytes=0).exceeds is False
+
+    def test_zero_sized(self):
+        report = analyze_broadcast((0, 1), (1, 5))
+        assert report.elements == 0
+        assert report.inputs[0].expansion == 1.0
+
+    def test_incompatible_raises(self):
+        with pytest.raises(BroadcastError):
+            analyze_broadcast((3,), (4,))
+
+    def test_explain_costs(self):
+        text = explain_broadcast((32, 1, 64), (1, 4096, 64), dtype="float32", max_bytes=1 << 20)
+        assert "Step 3: Expansion cost" in text
+        assert "x4096, stretched on dim -2" in text
+        assert "32.0 MiB" in text
+        assert "WARNING: result exceeds the 1.0 MiB threshold" in text
+        assert "Step 3" not in explain_broadcast((3, 1), (1, 4))
+
+    @requires_numpy
+    def test_broadcast_shape_warns_over_threshold(self):
+        import numpy as np
+
+        original = config.broadcast_max_bytes
+        try:
+            config.broadcast_max_bytes = 100
+            with pytest.warns(BroadcastCostWarning, match="x40"):
+                broadcast_shape(np.zeros((3, 1)), np.zeros((1, 40)))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                # Shape tuples have no dtype; small results are fine
+                broadcast_shape((3, 1), (1, 40))
+                broadcast_shape(np.zeros((3, 1)), np.zeros((1, 4)))
+        finally:
+            config.broadcast_max_bytes = original
@@ -0,0 +1,172 @@
+"""
+Tests for broadcasting arguments in contracts (broadcast=).
+"""
+
+import pytest
+
+from shapeguard import Dim, contract, ensures, expects
+from shapeguard.broadcast import BroadcastSpec, CompiledBroadcast
+from shapeguard.core import UnificationContext
+from shapeguard.errors import (
+    BroadcastError,
+    DimensionMismatchError,
+    RankMismatchError,
+    UnificationError,
+)
+from tests.conftest import requires_numpy
+
+B, T, D = Dim("B"), Dim("T"), Dim("D")
+
+
+class TestBroadcastSpec:
+    """Tests for matching a single shape under broadcasting rules."""
+
+    def test_ones_and_missing_leading_dims(self):
+        plan = BroadcastSpec((B, T, 4))
+        for shape in [(2, 3, 4), (1, 3, 1), (3, 4), (4,), (1,), ()]:
+            plan.match(shape, UnificationContext(), "x")
+
+    def test_ones_do_not_bind(self):
+        ctx = UnificationContext()
+        BroadcastSpec((B, T)).match((1, 7), ctx, "x")
+        assert ctx.resolve(B) is None
+        assert ctx.resolve(T) == 7
+
+    def test_concrete_mismatch(self):
+        with pytest.raises(DimensionMismatchError):
+            BroadcastSpec((B, 4)).match((2, 5), UnificationContext(), "x")
+
+    def test_too_many_dims(self):
+        with pytest.raises(RankMismatchError):
+            BroadcastSpec((B, 4)).match((2, 3, 4), UnificationContext(), "x")
+
+    def test_ellipsis(self):
+        plan = BroadcastSpec((..., D))
+        ctx = UnificationContext()
+        plan.match((5, 6, 1), ctx, "x")
+        assert ctx.resolve(D) is None
+        with pytest.raises(RankMismatchError):
+            plan.match((), ctx, "x")
+
+
+class TestCompiledBroadcast:
+    """Tests for the precompiled group check."""
+
+    def test_shared_dims_need_no_runtime_columns(self):
+        group = CompiledBroadcast(
+            {"x": BroadcastSpec((B, T, D)), "y": BroadcastSpec((T, D))}, (0, 1)
+        )
+        assert group._columns == ()
+
+    def test_distinct_dims_are_compared(self):
+        n, m = Dim("n"), Dim("m")
+        group = CompiledBroadcast(
+            {"x": BroadcastSpec((B, n)), "y": BroadcastSpec((None, m))}, (0, 1)
+        )
+        assert group._columns == ((-2, (0, 1)), (-1, (0, 1)))
+
+
+@requires_numpy
+class TestBroadcastContracts:
+    """Tests for broadcast= on @expects and @contract."""
+
+    def test_output_uses_broadcast_sizes(self, np_array):
+        @expects(x=(B, T, D), scale=(B, T, D), broadcast=("x", "scale"))
+        @ensures(result=(B, T, D))
+        def rescale(x, scale):
+            return x * scale
+
+        for scale_shape in [(4,), (3, 1), (2, 1, 4), (1, 1, 1)]:
+            assert rescale(np_array((2, 3, 4)), np_array(scale_shape)).shape == (2, 3, 4)
+
+    def test_dims_still_unify(self, np_array):
+        @expects(x=(B, D), y=(B, D), broadcast=True)
+        def add(x, y):
+            return x + y
+
+        with pytest.raises(UnificationError):
+            add(np_array((2, 4)), np_array((5,)))
+
+    def test_incompatible_distinct_dims(self, np_array):
+        n, m = Dim("n"), Dim("m")
+
+        @contract(inputs={"a": (n,), "b": (m,)}, output=(None,), broadcast=True)
+        def add(a, b):
+            return a + b
+
+        assert add(np_array((3,)), np_array((1,))).shape == (3,)
+        with pytest.raises(BroadcastError) as exc:
+            add(np_array((3,)), np_array((4,)))
+        assert exc.value.function.endswith("add")
+        assert exc.value.argument == "a, b"
+        assert exc.value.dim_values == [3, 4]
+
+    def test_ellipsis_group(self, np_array):
+        @expects(x=(..., D), y=(..., D), broadcast=True)
+        def add(x, y):
+            return x + y
+
+        add(np_array((2, 3, 4)), np_array((3, 1)))
+        with pytest.raises(BroadcastError):
+            add(np_array((2, 3, 4)), np_array((2, 1)))
+
+    def test_dim_seen_only_as_one_binds_to_one(self, np_array):
+        @contract(inputs={"x": (T, D), "y": (T, D)}, output=(T, D), broadcast=True)
+        def add(x, y):
+            return x + y
+
+        assert add(np_array((3, 1)), np_array((1,))).shape == (3, 1)
+
+        @contract(inputs={"x": (T, D), "y": (T, D)}, output=(T, D), broadcast=True)
+        def tile(x, y):
+            return (x + y).repeat(2, axis=1)
+
+        with pytest.raises(UnificationError):
+            tile(np_array((3, 1)), np_array((1,)))
+
+    def test_other_arguments_stay_strict(self, np_array):
+        """Accidental broadcasting outside the group is still caught."""
+
+        @expects(x=(B, D), bias=(D,), w=(D, D), broadcast=("x", "bias"))
+        def layer(x, bias, w):
+            return (x + bias) @ w
+
+        layer(np_array((2, 4)), np_array((1,)), np_array((4, 4)))
+        with pytest.raises(UnificationError):
+            layer(np_array((2, 4)), np_array((4,)), np_array((1, 4)))
+
+    def test_with_cache(self, np_array):
+        @expects(x=(B, D), y=(B, D), broadcast=True, cache=4)
+        def add(x, y):
+            return x + y
+
+        add(np_array((2, 4)), np_array((4,)))
+        add(np_array((2, 4)), np_array((4,)))
+        assert add.__shapeguard_cache__.hits == 1
+        with pytest.raises(UnificationError):
+            add(np_array((2, 4)), np_array((3,)))
+
+    def test_metadata(self):
+        @expects(x=(B,), y=(B,), z=(B,), broadcast=("x", "z"))
+        def f(x, y, z):
+            pass
+
+        assert f.__shapeguard_broadcast__.names == ("x", "z")
+        assert f.__shapeguard_broadcast__.positions == (0, 2)
+
+        @expects(x=(B,))
+        def g(x):
+            pass
+
+        assert g.__shapeguard_broadcast__ is None
+
+    @pytest.mark.parametrize(
+        "broadcast, error",
+        [(("x", "nope"), ValueError), (("x", "params"), ValueError), ("x", TypeError)],
+    )
+    def test_invalid_groups(self, broadcast, error):
+        with pytest.raises(error):
+
+            @expects(x=(B,), params={"w": (B,)}, broadcast=broadcast)
+            def f(x, params):
+                pass
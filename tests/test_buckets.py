@@ -0,0 +1,154 @@
+"""
+Tests for Dim buckets and shapeguard.buckets — padding to bounded shape sets.
+"""
+
+import pytest
+
+from shapeguard import Batch, Dim, bucketed, contract, expects
+from shapeguard.buckets import pad_to_shape
+from shapeguard.errors import ShapeGuardError, UnificationError
+from tests.conftest import requires_jax, requires_numpy
+
+B, D = Batch(), Dim("D")
+T = Dim("T", buckets=(4, 8, 16))
+
+
+class TestDimBuckets:
+    """Tests for declaring buckets on a Dim."""
+
+    def test_sorted_and_deduplicated(self):
+        assert Dim("S", buckets=[8, 2, 8, 4]).buckets == (2, 4, 8)
+        assert Dim("S").buckets is None
+        assert Batch("N", buckets=(1, 2)).buckets == (1, 2)
+
+    def test_bucket(self):
+        assert [T.bucket(n) for n in (1, 4, 5, 16)] == [4, 4, 8, 16]
+        with pytest.raises(ValueError, match="largest bucket"):
+            T.bucket(17)
+        with pytest.raises(ValueError, match="no buckets"):
+            D.bucket(3)
+
+    @pytest.mark.parametrize("buckets", [(), (0, 4), (2.5,), (True,)])
+    def test_invalid(self, buckets):
+        with pytest.raises(ValueError):
+            Dim("S", buckets=buckets)
+
+
+@requires_numpy
+class TestPadToShape:
+    """Tests for pad_to_shape."""
+
+    def test_numpy(self, np_array):
+        import numpy as np
+
+        x = np.arange(6.0).reshape(2, 3)
+        out = pad_to_shape(x, (2, 5), value=-1)
+        assert out.shape == (2, 5) and out.dtype == x.dtype
+        assert (out[:, :3] == x).all() and (out[:, 3:] == -1).all()
+        assert pad_to_shape(x, (2, 3)) is x
+
+    def test_invalid_target(self, np_array):
+        with pytest.raises(ValueError):
+            pad_to_shape(np_array((2, 3)), (2, 2))
+        with pytest.raises(ValueError):
+            pad_to_shape(np_array((2, 3)), (2, 3, 1))
+
+    @requires_jax
+    def test_jax(self, jax_array):
+        out = pad_to_shape(jax_array((2, 3)), (4, 3), value=1)
+        assert out.shape == (4, 3) and float(out.sum()) == 6.0
+
+
+@requires_numpy
+class TestBucketed:
+    """Tests for the @bucketed decorator."""
+
+    def test_pads_to_bucket(self, np_array):
+        seen = []
+
+        @bucketed(lengths="lengths")
+        @expects(x=(B, T, D), mask=(B, T))
+        def f(x, mask, lengths=None):
+            seen.append((x.shape, mask.shape, lengths["T"]))
+
+        f(np_array((2, 5, 3)), np_array((2, 5)))
+        f(np_array((2, 8, 3)), mask=np_array((2, 8)))
+        assert seen == [((2, 8, 3), (2, 8), 5), ((2, 8, 3), (2, 8), 8)]
+
+    def test_ellipsis_and_multiple_axes(self, np_array):
+        S = Dim("S", buckets=(10,))
+
+        @bucketed
+        @contract(inputs={"x": (..., T, S)}, output=(..., T, S))
+        def f(x):
+            return x
+
+        assert f(np_array((3, 2, 7))).shape == (3, 4, 10)
+
+    def test_disagreeing_sizes(self, np_array):
+        @bucketed
+        @expects(x=(B, T), y=(B, T))
+        def f(x, y): ...
+
+        with pytest.raises(UnificationError) as exc:
+            f(np_array((2, 5)), np_array((2, 6)))
+        assert exc.value.function.endswith("f")
+
+    def test_exceeds_largest_bucket(self, np_array):
+        @bucketed
+        @expects(x=(B, T))
+        def f(x): ...
+
+        with pytest.raises(ShapeGuardError) as exc:
+            f(np_array((2, 17)))
+        assert (exc.value.argument, exc.value.actual) == ("x", 17)
+
+    def test_rank_mismatch_left_to_contract(self, np_array):
+        @bucketed
+        @expects(x=(B, T, D))
+        def f(x): ...
+
+        with pytest.raises(ShapeGuardError, match="rank"):
+            f(np_array((2, 5)))
+
+    def test_decoration_errors(self):
+        with pytest.raises(ValueError, match="above @expects"):
+            bucketed(lambda x: x)
+        with pytest.raises(ValueError, match="buckets"):
+            bucketed(expects(x=(B, D))(lambda x: x))
+        with pytest.raises(ValueError, match="lengths"):
+            bucketed(lengths="n")(expects(x=(B, T))(lambda x: x))
+        with pytest.raises(ValueError, match="named 'T'"):
+            bucketed(lengths="n")(expects(x=(T, Dim("T", buckets=(2,))))(lambda x, n: x))
+
+    @requires_jax
+    def test_bounds_jit_traces(self, np_array):
+        import jax
+
+        traces = []
+
+        @bucketed
+        @expects(x=(B, T))
+        @jax.jit
+        def f(x):
+            traces.append(x.shape)
+            return x.sum()
+
+        for length in range(1, 17):
+            f(np_array((2, length)))
+        assert traces == [(2, 4), (2, 8), (2, 16)]
+
+    @requires_jax
+    def test_lengths_under_jit(self, np_array):
+        """lengths with several bucketed Dims is a valid jit argument."""
+        import jax
+
+        S = Dim("S", buckets=(10,))
+
+        @bucketed(lengths="lengths")
+        @expects(x=(T, S))
+        @jax.jit
+        def f(x, lengths):
+            return lengths["T"] * 100 + lengths["S"]
+
+        assert int(f(np_array((5, 7)))) == 507
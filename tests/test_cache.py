@@ -0,0 +1,245 @@
+"""
+Tests for the per-function shape-signature cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from shapeguard import Dim, contract, ensures, expects
+from shapeguard.cache import ShapeCache, clear_caches
+from shapeguard.core import UnificationContext
+from shapeguard.errors import DimensionMismatchError, UnificationError
+from tests.conftest import requires_numpy
+
+
+class TestShapeCache:
+    """Tests for the ShapeCache container."""
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted first."""
+        cache = ShapeCache(2)
+        cache.put("a", UnificationContext())
+        cache.put("b", UnificationContext())
+        cache.get("a")  # 'a' is now most recent
+        cache.put("c", UnificationContext())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
+
+    def test_info_and_clear(self):
+        """info() reports counters; clear() resets them."""
+        cache = ShapeCache(4)
+        cache.get("a")
+        cache.put("a", UnificationContext())
+        cache.get("a")
+
+        info = cache.info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 1, 4, 1)
+
+        cache.clear()
+        assert cache.info() == (0, 0, 4, 0)
+
+    def test_invalid_size(self):
+        """Size must be positive."""
+        with pytest.raises(ValueError):
+            ShapeCache(0)
+
+
+class TestExpectsCache:
+    """Tests for @expects(cache=...)."""
+
+    def test_disabled_by_default(self):
+        """No cache is attached unless requested."""
+
+        @expects(x=(3,))
+        def f(x):
+            return x
+
+        assert f.__shapeguard_cache__ is None
+
+    def test_invalid_cache_arg(self):
+        """Non-positive cache sizes are rejected at decoration time."""
+        with pytest.raises(ValueError, match="cache"):
+
+            @expects(x=(3,), cache=0)
+            def f(x):
+                return x
+
+    @requires_numpy
+    def test_repeated_signature_hits(self, np_array):
+        """Identical shapes skip validation after the first call."""
+        n = Dim("n")
+
+        @expects(x=(n, 4), cache=8)
+        def f(x):
+            return x
+
+        f(np_array((2, 4)))
+        with patch("shapeguard.decorator._check_inputs") as check:
+            f(np_array((2, 4)))
+            f(np_array((2, 4)))
+            check.assert_not_called()
+
+        info = f.__shapeguard_cache__.info()
+        assert info.hits == 2
+        assert info.misses == 1
+
+    @requires_numpy
+    def test_new_signature_validated(self, np_array):
+        """A different shape is a miss and is still checked."""
+        n = Dim("n")
+
+        @expects(x=(n, 4), cache=8)
+        def f(x):
+            return x
+
+        f(np_array((2, 4)))
+        with pytest.raises(DimensionMismatchError):
+            f(np_array((2, 5)))
+
+        # Failures are never remembered
+        with pytest.raises(DimensionMismatchError):
+            f(np_array((2, 5)))
+        assert len(f.__shapeguard_cache__) == 1
+
+    @requires_numpy
+    def test_stacked_ensures_still_checked(self, np_array):
+        """Output checks run on a hit, with input bindings restored."""
+        n = Dim("n")
+
+        @expects(x=(n, 4), cache=8)
+        @ensures(result=(n,))
+        def f(x, out):
+            return np_array((out,))
+
+        f(np_array((3, 4)), 3)
+        with pytest.raises(UnificationError):
+            f(np_array((3, 4)), 5)  # cache hit, but output n=5 conflicts with n=3
+        assert f.__shapeguard_cache__.hits == 1
+
+    @requires_numpy
+    def test_pytree_signature(self, np_array):
+        """PyTree leaf shapes are part of the signature."""
+        n = Dim("n")
+
+        @expects(params={"w": (n, 2), "b": (n,)}, cache=8)
+        def f(params):
+            return params
+
+        f({"w": np_array((3, 2)), "b": np_array((3,))})
+        f({"w": np_array((3, 2)), "b": np_array((3,)), "extra": 1})
+        assert f.__shapeguard_cache__.hits == 1
+
+        with pytest.raises(UnificationError):
+            f({"w": np_array((3, 2)), "b": np_array((4,))})
+
+
+class TestContractCache:
+    """Tests for @contract(cache=...)."""
+
+    @requires_numpy
+    def test_output_checked_on_hit(self, np_array):
+        """Contract output spec is enforced on cached signatures."""
+        n = Dim("n")
+
+        @contract(inputs={"x": (n,)}, output=(n,), cache=4)
+        def f(x, size):
+            return np_array((size,))
+
+        f(np_array((3,)), 3)
+        with pytest.raises(UnificationError):
+            f(np_array((3,)), 4)
+
+        info = f.__shapeguard_cache__.info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+
+class TestTreeCache:
+    """Tests for per-argument PyTree verdict caches."""
+
+    @requires_numpy
+    def test_params_hit_while_batch_changes(self, np_array):
+        """The params tree is matched once even when other arguments vary."""
+        D, B = Dim("D"), Dim("B")
+
+        @expects(params={"w": (D, D), "b": (D,)}, x=(B, D), cache=8)
+        def step(params, x):
+            return x
+
+        params = {"w": np_array((4, 4)), "b": np_array((4,))}
+        for batch in (1, 2, 3):
+            step(params, np_array((batch, 4)))
+
+        tree_cache = step.__shapeguard_tree_caches__["params"]
+        assert tree_cache.info().hits == 2
+        assert tree_cache.info().misses == 1
+        assert step.__shapeguard_cache__.info().hits == 0
+
+    @requires_numpy
+    def test_hit_rebinds_dims(self, np_array):
+        """A cached tree still unifies with the other arguments."""
+        D = Dim("D")
+
+        @expects(x=(D,), params={"w": (D, D)}, cache=8)
+        def f(x, params):
+            return x
+
+        params = {"w": np_array((4, 4))}
+        f(np_array((4,)), params)
+        with pytest.raises(UnificationError) as exc_info:
+            f(np_array((5,)), params)
+        assert exc_info.value.actual_source == "params['w'][0]"
+        assert f.__shapeguard_tree_caches__["params"].hits == 1
+
+    @requires_numpy
+    def test_hit_binding_index_with_ellipsis(self, np_array):
+        """Re-bound sources use the concrete index of the cached shape."""
+        D = Dim("D")
+
+        @expects(params={"w": (..., D)}, y=(D,), cache=8)
+        def f(params, y):
+            return y
+
+        params = {"w": np_array((2, 3, 4))}
+        f(params, np_array((4,)))
+        with pytest.raises(UnificationError) as exc_info:
+            f(params, np_array((5,)))
+        assert exc_info.value.expected_source == "params['w'][2]"
+
+    @requires_numpy
+    def test_failures_not_cached(self, np_array):
+        D = Dim("D")
+
+        @expects(params={"w": (D, D)}, cache=8)
+        def f(params):
+            return params
+
+        for _ in range(2):
+            with pytest.raises(UnificationError):
+                f({"w": np_array((3, 4))})
+        assert len(f.__shapeguard_tree_caches__["params"]) == 0
+
+    @requires_numpy
+    def test_clear_caches(self, np_array):
+        """clear_caches empties the signature and tree caches."""
+
+        @expects(params={"w": (2,)}, cache=8)
+        def f(params):
+            return params
+
+        f({"w": np_array((2,))})
+        clear_caches(f)
+        assert len(f.__shapeguard_cache__) == 0
+        assert len(f.__shapeguard_tree_caches__["params"]) == 0
+
+    def test_no_tree_caches_without_cache(self):
+        @expects(params={"w": (2,)})
+        def f(params):
+            return params
+
+        assert f.__shapeguard_tree_caches__ == {}
+        clear_caches(f)  # no-op
@@ -0,0 +1,96 @@
+"""
+Tests for shapeguard._compat shape extraction.
+"""
+
+import pytest
+
+from shapeguard import _compat
+from shapeguard._compat import get_shape, is_array
+from tests.conftest import requires_jax, requires_numpy
+
+
+class FakeArray:
+    """Array-like with class-level shape/dtype."""
+
+    dtype = "float32"
+
+    def __init__(self, shape):
+        self._shape = shape
+
+    @property
+    def shape(self):
+        return self._shape
+
+
+class Duck:
+    """Object whose instances may or may not carry array attributes."""
+
+
+class TestTypeDispatch:
+    """Tests for the per-type adapter table."""
+
+    @requires_numpy
+    def test_numpy_native_shape(self, np_array):
+        """NumPy shapes are returned as-is (already tuples of ints)."""
+        x = np_array((2, 3))
+        assert get_shape(x) == (2, 3)
+        assert _compat._type_info[type(x)][0] is _compat._native_shape
+        assert is_array(x)
+
+    @requires_numpy
+    def test_numpy_scalar(self):
+        import numpy as np
+
+        assert get_shape(np.float32(1.0)) == ()
+        assert is_array(np.float32(1.0))
+
+    @requires_jax
+    def test_jax_array_and_shape_dtype_struct(self, jax_array):
+        import jax
+        import jax.numpy as jnp
+
+        assert get_shape(jax_array((4, 5))) == (4, 5)
+        spec = jax.ShapeDtypeStruct((2, 3), jnp.float32)
+        assert get_shape(spec) == (2, 3)
+        assert is_array(spec)
+
+    @requires_jax
+    def test_symbolic_dims_kept(self):
+        """Shape-polymorphic dims have no int value and pass through as-is."""
+        import jax
+        from jax import export
+
+        (b,) = export.symbolic_shape("b")
+        assert get_shape(jax.ShapeDtypeStruct((b, 3), "float32")) == (b, 3)
+
+    def test_generic_shape_converted_to_ints(self):
+        """Unknown array-likes still get int-converted dims."""
+
+        class Dim64(int):
+            pass
+
+        x = FakeArray((Dim64(3), 4))
+        shape = get_shape(x)
+        assert shape == (3, 4)
+        assert all(type(d) is int for d in shape)
+        assert is_array(x)
+
+    @pytest.mark.parametrize("value", [1, 2.5, "abc", [1, 2], {"a": 1}, None])
+    def test_non_arrays_cached_negative(self, value):
+        """Builtins are remembered as non-arrays."""
+        assert is_array(value) is False
+        assert _compat._type_info[type(value)] == (None, False)
+        with pytest.raises(TypeError, match="no 'shape' attribute"):
+            get_shape(value)
+
+    def test_instance_attributes_not_cached(self):
+        """Types whose instances decide for themselves are not cached."""
+        plain = Duck()
+        shaped = Duck()
+        shaped.shape = (3,)
+        shaped.dtype = "int8"
+
+        assert is_array(plain) is False
+        assert is_array(shaped) is True
+        assert get_shape(shaped) == (3,)
+        assert Duck not in _compat._type_info
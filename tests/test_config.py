@@ -2,10 +2,15 @@
 Tests for ShapeGuard configuration.
 """
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
-from shapeguard import config
-from shapeguard.config import Config
+from shapeguard import Dim, config, contract, ensures, expects
+from shapeguard.config import Config, _enabled_from_env
 
 
 class TestConfig:
@@ -29,6 +34,9 @@ class TestConfig:
         c.jit_mode = "check"
         assert c.jit_mode == "check"
 
+        c.jit_mode = "trace"
+        assert c.jit_mode == "trace"
+
     def test_set_jit_mode_invalid(self):
         """Invalid JIT mode raises ValueError."""
         c = Config()
@@ -39,6 +47,22 @@ class TestConfig:
         with pytest.raises(ValueError):
             c.jit_mode = "SKIP"  # Case sensitive
 
+    def test_set_enabled_invalid(self):
+        """enabled only accepts booleans."""
+        c = Config()
+        with pytest.raises(ValueError, match="Invalid enabled"):
+            c.enabled = "off"
+
+    def test_broadcast_max_bytes(self):
+        """broadcast_max_bytes is None by default and takes non-negative ints."""
+        c = Config()
+        assert c.broadcast_max_bytes is None
+        c.broadcast_max_bytes = 1 << 30
+        assert c.broadcast_max_bytes == 1 << 30
+        for value in (-1, 1.5, True, "1GB"):
+            with pytest.raises(ValueError, match="Invalid broadcast_max_bytes"):
+                c.broadcast_max_bytes = value
+
     def test_config_repr(self):
         """Config has readable repr."""
         c = Config()
@@ -59,3 +83,88 @@ class TestConfig:
             assert config.jit_mode == "skip"
         finally:
             config.jit_mode = original
+
+
+class TestModeSwitch:
+    """Tests for the import-time on/off switch."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("off", False), ("OFF", False), ("on", True), (" on ", True)],
+    )
+    def test_env_values(self, monkeypatch, value, expected):
+        """SHAPEGUARD_MODE selects on/off, case-insensitively."""
+        monkeypatch.setenv("SHAPEGUARD_MODE", value)
+        assert _enabled_from_env() is expected
+
+    def test_env_unset_follows_debug(self, monkeypatch):
+        """Without SHAPEGUARD_MODE, checks follow __debug__."""
+        monkeypatch.delenv("SHAPEGUARD_MODE", raising=False)
+        assert _enabled_from_env() is __debug__
+
+    def test_env_invalid_warns(self, monkeypatch):
+        """Unknown values warn and fall back to the default."""
+        monkeypatch.setenv("SHAPEGUARD_MODE", "sometimes")
+        with pytest.warns(RuntimeWarning, match="SHAPEGUARD_MODE"):
+            assert _enabled_from_env() is __debug__
+
+    def test_optimized_interpreter_disables(self):
+        """python -O turns wrappers off at import time."""
+        code = "import shapeguard; print(shapeguard.config.enabled)"
+        env = {k: v for k, v in os.environ.items() if k != "SHAPEGUARD_MODE"}
+        env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1])
+        out = subprocess.run(
+            [sys.executable, "-O", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        assert out.stdout.strip() == "False"
+
+
+class TestDisabledDecorators:
+    """Decorators return the original function when disabled."""
+
+    @pytest.fixture
+    def disabled(self):
+        original = config.enabled
+        config.enabled = False
+        yield
+        config.enabled = original
+
+    def test_expects_returns_original(self, disabled):
+        n = Dim("n")
+
+        def f(x):
+            return x
+
+        g = expects(x=(n, 3), jit_mode="skip")(f)
+
+        assert g is f
+        assert g.__shapeguard_specs__ == {"x": (n, 3)}
+        assert g.__shapeguard_jit_mode__ == "skip"
+
+    def test_ensures_returns_original(self, disabled):
+        def f(x):
+            return x
+
+        assert ensures(result=(3,))(f) is f
+        assert f.__shapeguard_ensures__ == (3,)
+
+    def test_contract_returns_original(self, disabled):
+        def f(x):
+            return x
+
+        g = contract(inputs={"x": (3,)}, output=(3,))(f)
+
+        assert g is f
+        assert g.__shapeguard_output_spec__ == (3,)
+
+    def test_spec_errors_still_raised(self, disabled):
+        """Bad specs fail at decoration time regardless of the switch."""
+        with pytest.raises(ValueError):
+
+            @expects(y=(3,))
+            def f(x):
+                return x
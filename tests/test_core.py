@@ -4,7 +4,7 @@ Tests for shapeguard.core module.
 
 import pytest
 
-from shapeguard.core import Dim, UnificationContext
+from shapeguard.core import Binding, Dim, UnificationContext
 from shapeguard.errors import UnificationError
 
 
@@ -111,3 +111,74 @@ class TestUnificationContext:
         ctx = UnificationContext()
         n = Dim("n")
         assert ctx.get_binding_source(n) is None
+
+    def test_bind_indexed_source(self):
+        """Indexed bindings report a formatted source."""
+        ctx = UnificationContext()
+        n = Dim("n")
+        ctx.bind_indexed(n, 42, "x", 1)
+        assert ctx.get_binding_source(n) == "x[1]"
+        assert "n=42 (from x[1])" in ctx.format_bindings()
+
+    def test_bind_indexed_conflict_sources(self):
+        """UnificationError carries both formatted sources."""
+        ctx = UnificationContext()
+        n = Dim("n")
+        ctx.bind_indexed(n, 3, "x", 0)
+
+        with pytest.raises(UnificationError) as exc_info:
+            ctx.bind_indexed(n, 4, "y", 2)
+
+        err = exc_info.value
+        assert err.expected_source == "x[0]"
+        assert err.actual_source == "y[2]"
+
+    def test_bindings_records(self):
+        """bindings exposes Binding records in binding order."""
+        ctx = UnificationContext()
+        n, m = Dim("n"), Dim("m")
+        ctx.bind(m, 2, "a.shape[0]")
+        ctx.bind_indexed(n, 5, "b", 3)
+
+        assert list(ctx.bindings) == [m, n]
+        assert ctx.bindings[n] == Binding(value=5, source="b[3]")
+
+    def test_bindings_is_a_snapshot(self):
+        """Writing to the bindings dict does not change the context."""
+        ctx = UnificationContext()
+        n = Dim("n")
+        ctx.bindings[n] = Binding(value=3, source="x[0]")
+        assert ctx.resolve(n) is None
+        assert ctx.bindings == {}
+
+    def test_update_replays_bindings(self):
+        """update() binds the other context's dims with their original sources."""
+        n, m = Dim("n"), Dim("m")
+        other = UnificationContext()
+        other.bind_indexed(n, 3, "w", 0)
+        other.bind_indexed(m, 4, "w", 1)
+
+        ctx = UnificationContext()
+        ctx.bind(m, 4, "x")
+        ctx.update(other)
+        assert ctx.resolve(n) == 3
+        assert ctx.get_binding_source(n) == "w[0]"
+        assert ctx.get_binding_source(m) == "x"
+
+        conflicting = UnificationContext()
+        conflicting.bind(n, 5, "y")
+        with pytest.raises(UnificationError) as exc_info:
+            conflicting.update(other)
+        assert exc_info.value.actual_source == "w[0]"
+
+    def test_copy_is_independent(self):
+        """Binding in a copy doesn't affect the original."""
+        ctx = UnificationContext()
+        n, m = Dim("n"), Dim("m")
+        ctx.bind(n, 1, "x")
+
+        other = ctx.copy()
+        other.bind(m, 2, "y")
+
+        assert other.resolve(n) == 1
+        assert ctx.resolve(m) is None
@@ -184,6 +184,100 @@ class TestExpectsDecorator:
         f(np_array((5, 10)), "anything", [1, 2, 3])
 
 
+class TestArgumentExtraction:
+    """Tests for argument lookup across call styles and signatures."""
+
+    @requires_numpy
+    def test_keyword_argument(self, np_array):
+        """Checked arguments passed by keyword are validated."""
+        n = Dim("n")
+
+        @expects(x=(n, 3), y=(n,))
+        def f(x, y):
+            return x
+
+        with pytest.raises(UnificationError):
+            f(np_array((2, 3)), y=np_array((5,)))
+
+    @requires_numpy
+    def test_default_argument(self, np_array):
+        """Default values are validated when the argument is omitted."""
+        default = np_array((5,))
+
+        @expects(x=(3,), y=(4,))
+        def f(x, y=default):
+            return x
+
+        with pytest.raises(DimensionMismatchError):
+            f(np_array((3,)))
+
+    @requires_numpy
+    def test_keyword_only_argument(self, np_array):
+        """Keyword-only parameters are looked up in kwargs."""
+
+        @expects(mask=(2, 2))
+        def f(x, *, mask):
+            return x
+
+        with pytest.raises(DimensionMismatchError):
+            f(1, mask=np_array((2, 3)))
+
+    @requires_numpy
+    def test_positional_only_argument(self, np_array):
+        """Positional-only parameters are looked up in args."""
+
+        @expects(x=(2,))
+        def f(x, /, **kwargs):
+            return kwargs
+
+        # 'x' in kwargs belongs to **kwargs, not the checked parameter
+        result = f(np_array((2,)), x=np_array((7,)))
+        assert result["x"].shape == (7,)
+        with pytest.raises(DimensionMismatchError):
+            f(np_array((3,)))
+
+    @requires_numpy
+    def test_var_positional_falls_back_to_bind(self, np_array):
+        """Checking *args uses Signature.bind semantics."""
+
+        @expects(rest=(2,))
+        def f(x, *rest):
+            return rest
+
+        # *args binds to a tuple, which is not an array, so it is skipped
+        assert f(1, np_array((2,))) is not None
+
+    @requires_numpy
+    def test_malformed_call_raises_type_error(self, np_array):
+        """Calls that don't bind raise the function's own TypeError."""
+
+        @expects(x=(3,))
+        def f(x, y):
+            return x
+
+        bad = np_array((4,))
+        with pytest.raises(TypeError):
+            f(bad)  # missing y
+        with pytest.raises(TypeError):
+            f(bad, 1, 2)  # too many positionals
+        with pytest.raises(TypeError):
+            f(bad, 1, z=2)  # unknown keyword
+        with pytest.raises(TypeError):
+            f(bad, 1, x=bad)  # x passed twice
+
+    @requires_numpy
+    def test_unchecked_argument_passed_twice(self, np_array):
+        """An unchecked parameter given positionally and by keyword still fails."""
+
+        @expects(x=(4,))
+        def f(x, y):
+            return x
+
+        # A bad shape must not surface a contract error instead of the TypeError
+        with pytest.raises(TypeError, match="multiple values"):
+            f(np_array((3,)), 1, y=2)
+
+
 @requires_jax
 class TestExpectsWithJAX:
     """Tests for @expects with JAX arrays."""
@@ -0,0 +1,112 @@
+"""
+Tests for shapeguard.donate — buffer donation derived from contracts.
+"""
+
+import pytest
+
+from shapeguard import Dim, PathSpec, contract, ensures, expects
+from shapeguard.donate import DonationReport, donatable, donating_jit
+from tests.conftest import requires_jax
+
+N, D = Dim("N"), Dim("D")
+
+
+class TestDonatable:
+    """Tests for deriving donatable arguments from specs."""
+
+    def test_matches_outputs_one_to_one(self):
+        @contract(inputs={"w": (N,), "g": (N,), "lr": ()}, output=(N,))
+        def sgd(w, g, lr): ...
+
+        @contract(inputs={"g": (N,), "w": (N,)}, output=((N,), (N,)))
+        def both(g, w): ...
+
+        assert donatable(sgd) == ("w",)
+        assert donatable(both) == ("g", "w")
+
+    def test_pytree_arguments_need_every_leaf(self):
+        params = {"w": (D, D), "b": (D,)}
+
+        @contract(inputs={"params": params, "grads": params, "x": (N, D)}, output=params)
+        def update(params, grads, x): ...
+
+        @contract(inputs={"params": params}, output={"w": (D, D)})
+        def partial(params): ...
+
+        assert donatable(update) == ("params",)
+        assert donatable(partial) == ()
+
+    def test_inexact_specs_are_not_donated(self):
+        @contract(
+            inputs={"a": (N, None), "b": (..., N), "c": PathSpec({"**": (N,)}), "d": (2, N)},
+            output=((N, None), (..., N), (N,), (2, N)),
+        )
+        def f(a, b, c, d): ...
+
+        assert donatable(f) == ("d",)
+
+    def test_stacked_expects_and_ensures(self):
+        @expects(x=(N, D))
+        @ensures(result=(N, D))
+        def f(x, y): ...
+
+        assert donatable(f) == ("x",)
+
+    def test_requires_both_specs(self):
+        @expects(x=(N,))
+        def f(x): ...
+
+        with pytest.raises(ValueError, match="input and output specs"):
+            donatable(f)
+
+
+class TestDonationReport:
+    """Tests for DonationReport."""
+
+    def test_format(self):
+        report = DonationReport("step", ("w", "m"), {"w": 4000}, ("m",))
+        assert report.bytes_saved == 4000
+        assert report.format() == "step: donated w, m, 4,000 bytes reused (1 unused: m)"
+
+
+@requires_jax
+class TestDonatingJit:
+    """Tests for donating_jit."""
+
+    def test_donates_and_reports_bytes(self):
+        import jax.numpy as jnp
+
+        @contract(inputs={"w": (N,), "g": (N,)}, output=(N,))
+        def sgd(w, g, lr):
+            return w - lr * g
+
+        step = donating_jit(sgd)
+        assert step.__shapeguard_donate__ == ("w",)
+        w, g = jnp.ones(1000), jnp.ones(1000)
+        w = step(w, g, 0.5)
+        step(w, g, 0.5)
+        assert g.is_deleted() is False
+        assert len(step.__shapeguard_donations__) == 1
+        assert step.__shapeguard_donations__[0].saved == {"w": 4000}
+
+    def test_dtype_mismatch_is_unused(self):
+        import jax.numpy as jnp
+
+        @contract(inputs={"x": (N,)}, output=(N,))
+        def f(x):
+            return x.astype(jnp.float32)
+
+        step = donating_jit(f)
+        step(jnp.ones(8, jnp.int32))
+        report = step.__shapeguard_donations__[-1]
+        assert report.bytes_saved == 0 and report.unused == ("x",)
+
+    def test_static_arguments_are_not_donated(self):
+        @contract(inputs={"x": (N,), "y": (N,)}, output=((N,), (N,)))
+        def f(x, y, n):
+            return x, y
+
+        assert donating_jit(f, static_argnums=0).__shapeguard_donate__ == ("y",)
+        assert donating_jit(f, static_argnames=("y", "n")).__shapeguard_donate__ == ("x",)
+        with pytest.raises(TypeError, match="derived from the contract"):
+            donating_jit(f, donate_argnums=0)
@@ -0,0 +1,117 @@
+"""
+Tests for shapeguard.dryrun — abstract evaluation with shape contracts.
+"""
+
+import pytest
+
+from shapeguard import Dim, config, contract, ensures, expects
+from shapeguard.dryrun import abstract, checking, dry_run, placeholder
+from shapeguard.errors import ShapeGuardError
+from tests.conftest import requires_jax
+
+B, T, D, F = Dim("B"), Dim("T"), Dim("D"), Dim("F")
+
+SIZES = {B: 8, T: 4096, D: 8192, F: 28672}
+
+
+@requires_jax
+class TestPlaceholder:
+    """Tests for building placeholders from specs."""
+
+    def test_resolves_dims(self):
+        import jax.numpy as jnp
+
+        x = placeholder((B, T, 3), SIZES, jnp.bfloat16)
+        assert x.shape == (8, 4096, 3)
+        assert x.dtype == jnp.bfloat16
+
+    def test_sizes_by_name(self):
+        assert placeholder((B, D), {"B": 2, "D": 5}).shape == (2, 5)
+
+    def test_missing_size(self):
+        with pytest.raises(ValueError, match="'F'"):
+            placeholder((B, F), SIZES | {F: None})
+
+    def test_wildcard_rejected(self):
+        with pytest.raises(ValueError):
+            placeholder((..., D), SIZES)
+
+    def test_abstract(self, jax_array):
+        import jax
+
+        tree = abstract({"w": jax_array((3, 4)), "n": 2})
+        assert tree["w"] == jax.ShapeDtypeStruct((3, 4), tree["w"].dtype)
+        assert tree["n"] == 2
+
+
+@requires_jax
+class TestDryRun:
+    """Tests for dry_run."""
+
+    def _model(self, **options):
+        @expects(x=(B, T, D), w=(D, F), **options)
+        @ensures(result=(B, T, F))
+        def up(x, w):
+            return x @ w
+
+        @contract(inputs={"x": (B, T, D)}, output=(B, T, D), **options)
+        def model(params, x, n_layers):
+            for w1, w2 in params[:n_layers]:
+                x = up(x, w1) @ w2
+            return x
+
+        return model
+
+    def test_returns_abstract_output(self):
+        import jax.numpy as jnp
+
+        params = [(placeholder((D, F), SIZES), placeholder((F, D), SIZES))] * 4
+        x = placeholder((B, T, D), SIZES, jnp.bfloat16)
+        out = dry_run(self._model(), params, x, n_layers=4)
+        assert out.shape == (8, 4096, 8192)
+
+    def test_raises_on_mismatch(self):
+        params = [(placeholder((D, F), SIZES), placeholder((F, F), SIZES))]
+        x = placeholder((B, T, D), SIZES)
+        with pytest.raises(ShapeGuardError) as exc:
+            dry_run(self._model(), params, x, 1)
+        assert exc.value.argument == "result"
+
+    @pytest.mark.parametrize(
+        "options", [{"jit_mode": "skip"}, {"jit_mode": "warn"}, {"sample": 1000}]
+    )
+    def test_forces_checks(self, options):
+        params = [(placeholder((F, D), SIZES), placeholder((F, D), SIZES))]
+        x = placeholder((B, T, D), SIZES)
+        model = self._model(**options)
+        model.__shapeguard_sampler__.should_check()  # use up the sampled call
+        with pytest.raises(ShapeGuardError):
+            dry_run(model, params, x, 1)
+
+    def test_accepts_real_arrays(self, jax_array):
+        @expects(x=(B, D))
+        def f(x, scale):
+            return x * scale
+
+        out = dry_run(f, jax_array((2, 3)), scale=2.0)
+        assert out.shape == (2, 3)
+
+    def test_checking_restores_mode(self):
+        with checking():
+            assert config._dry_run
+            with checking():
+                pass
+            assert config._dry_run
+        assert not config._dry_run
+
+    def test_checking_with_jit_lower(self):
+        import jax
+
+        @expects(x=(B, D), jit_mode="skip")
+        def f(x):
+            return x.sum()
+
+        lowered = jax.jit(f).lower(jax.ShapeDtypeStruct((2, 3), "float32"))
+        assert lowered is not None
+        with checking(), pytest.raises(ShapeGuardError):
+            jax.jit(f).lower(jax.ShapeDtypeStruct((2,), "float32"))
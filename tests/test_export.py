@@ -0,0 +1,132 @@
+"""
+Tests for shapeguard.export — polymorphic shapes from shape contracts.
+"""
+
+from dataclasses import dataclass
+
+import pytest
+
+from shapeguard import Batch, Dim, PathSpec, contract, expects
+from shapeguard.errors import ShapeGuardError
+from shapeguard.export import export, polymorphic_shapes
+from tests.conftest import requires_jax
+
+B, T, D, K = Batch("B"), Dim("T"), Dim("D"), Dim("K")
+
+
+@dataclass
+class Params:
+    w: object
+    b: object
+
+
+class TestPolymorphicShapes:
+    """Tests for deriving polymorphic shape strings."""
+
+    def test_dims_become_symbols(self):
+        @expects(x=(B, T, D), mask=(B, T), w=(D, 10))
+        def f(x, mask, w): ...
+
+        assert polymorphic_shapes(f) == {"x": "B, T, D", "mask": "B, T", "w": "D, 10"}
+
+    def test_batch_only(self):
+        @expects(x=(B, T, D), w=(D, None))
+        def f(x, w): ...
+
+        assert polymorphic_shapes(f, "batch") == {"x": "B, _, _", "w": "_, _"}
+
+    def test_selected_dims(self):
+        @expects(x=(B, T, D))
+        def f(x): ...
+
+        assert polymorphic_shapes(f, [B, T]) == {"x": "B, T, _"}
+
+    def test_same_name_distinct_dims(self):
+        other = Dim("D")
+
+        @expects(x=(D, other), y=(Dim("my dim"), Dim("2d")))
+        def f(x, y): ...
+
+        assert polymorphic_shapes(f) == {"x": "D, D_2", "y": "my_dim, d_2d"}
+
+    def test_pytree_specs(self):
+        @contract(
+            inputs={
+                "params": {"w": (D, K), "layers": [(K,), (K, K)]},
+                "state": Params(w=(B, D), b=(B,)),
+                "extra": PathSpec({"*": (D,)}),
+            },
+            output=(B, K),
+        )
+        def f(params, state, extra): ...
+
+        shapes = polymorphic_shapes(f)
+        assert shapes["params"] == {"w": "D, K", "layers": ["K", "K, K"]}
+        assert shapes["state"] == Params(w="B, D", b="B")
+        assert shapes["extra"] is None
+
+    def test_ellipsis(self):
+        @expects(x=(B, ...), y=(..., D))
+        def f(x, y): ...
+
+        with pytest.raises(ValueError, match="last entry"):
+            polymorphic_shapes(f)
+
+        @expects(x=(B, ...))
+        def g(x): ...
+
+        assert polymorphic_shapes(g) == {"x": "B, ..."}
+
+    def test_undecorated(self):
+        with pytest.raises(ValueError, match="@expects"):
+            polymorphic_shapes(lambda x: x)
+
+
+@requires_jax
+class TestExport:
+    """Tests for exporting with derived polymorphic shapes."""
+
+    def test_one_export_for_all_batch_sizes(self):
+        import jax
+        import numpy as np
+
+        @expects(x=(B, D), w=(D, 10))
+        def head(x, w):
+            return x @ w
+
+        exported = export(
+            head,
+            jax.ShapeDtypeStruct((1, 16), "float32"),
+            jax.ShapeDtypeStruct((16, 10), "float32"),
+            polymorphic="batch",
+        )
+        assert str(exported.in_avals[0]) == "float32[B,16]"
+        for batch in (1, 7, 32):
+            out = exported.call(np.ones((batch, 16), np.float32), np.ones((16, 10), np.float32))
+            assert out.shape == (batch, 10)
+
+    def test_shared_symbols_and_pytrees(self):
+        import numpy as np
+
+        @contract(inputs={"p": {"w": (D, K)}, "x": (..., B, D)}, output=(..., B, K))
+        def f(p, x):
+            return x @ p["w"]
+
+        params = {"w": np.ones((4, 5), np.float32), "b": np.ones(5, np.float32)}
+        exported = export(f, params, x=np.ones((2, 3, 4), np.float32))
+        avals = sorted(str(a) for a in exported.in_avals)
+        assert avals == ["float32[2,B,D]", "float32[5]", "float32[D,K]"]
+        assert str(exported.out_avals[0]) == "float32[2,B,K]"
+
+    def test_contract_violated_for_free_dim(self):
+        import numpy as np
+
+        @contract(inputs={"x": (B, D)}, output=(B, D))
+        def first_row(x):
+            return x[:1]
+
+        static = export(first_row, np.ones((1, 16), np.float32), polymorphic=[])
+        assert str(static.in_avals[0]) == "float32[1,16]"
+        with pytest.raises(ShapeGuardError) as exc:
+            export(first_row, np.ones((1, 16), np.float32), polymorphic="batch")
+        assert exc.value.argument == "result"
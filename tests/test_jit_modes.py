@@ -7,7 +7,7 @@ from unittest.mock import patch
 import pytest
 
 from shapeguard import Dim, config, expects
-from shapeguard._compat import is_jax_installed, is_jax_tracing
+from shapeguard._compat import any_tracer, is_jax_installed, is_jax_tracing, is_tracer
 from shapeguard.errors import DimensionMismatchError
 from tests.conftest import requires_jax, requires_numpy
 
@@ -43,6 +43,56 @@ class TestJitDetection:
         assert True in results
 
 
+class TestTracerDetection:
+    """Tests for argument-based tracer detection."""
+
+    @requires_numpy
+    def test_concrete_arrays_are_not_tracers(self, np_array):
+        assert is_tracer(np_array((3,))) is False
+        assert any_tracer([np_array((3,)), {"w": np_array((2,))}, 1]) is False
+
+    @requires_jax
+    def test_tracers_detected_inside_jit(self, jax_array):
+        """Tracers are found directly and as first leaves of containers."""
+        import jax
+
+        results = []
+
+        @jax.jit
+        def f(x, params):
+            results.append((is_tracer(x), any_tracer([params]), any_tracer([[], (x,)])))
+            return x
+
+        f(jax_array((3,)), {"w": jax_array((2,))})
+
+        assert results == [(True, True, True)]
+
+    @requires_jax
+    def test_skip_with_argument_detection(self, jax_array):
+        """jit_mode='skip' uses tracer arguments when configured."""
+        import jax
+
+        n = Dim("n")
+        original = config.trace_detection
+        try:
+            config.trace_detection = "arguments"
+
+            @expects(x=(n, 128), jit_mode="skip")
+            def f(x):
+                return x
+
+            # Traced call skips the check; concrete calls still validate
+            assert jax.jit(f)(jax_array((3, 64))).shape == (3, 64)
+            with pytest.raises(DimensionMismatchError):
+                f(jax_array((3, 64)))
+        finally:
+            config.trace_detection = original
+
+    def test_invalid_trace_detection(self):
+        with pytest.raises(ValueError, match="Invalid trace_detection"):
+            config.trace_detection = "sometimes"
+
+
 class TestJitModeCheck:
     """Tests for jit_mode='check' (default)."""
 
@@ -162,6 +212,64 @@ class TestJitModeWarn:
             assert "validation failed" in caplog.text.lower() or len(caplog.records) > 0
 
 
+class TestJitModeTrace:
+    """Tests for jit_mode='trace'."""
+
+    @requires_numpy
+    def test_trace_mode_skips_outside_jit(self, np_array):
+        """Non-traced calls are passed straight through."""
+
+        @expects(x=(3,), jit_mode="trace")
+        def f(x):
+            return x.shape
+
+        assert f(np_array((4,))) == (4,)
+
+    @requires_numpy
+    def test_trace_mode_validates_when_tracing(self, np_array):
+        """Traced calls are validated and raise on mismatch."""
+
+        @expects(x=(3,), jit_mode="trace")
+        def f(x):
+            return x
+
+        with patch("shapeguard.decorator.is_jax_tracing", return_value=True):
+            with pytest.raises(DimensionMismatchError):
+                f(np_array((4,)))
+
+    @requires_jax
+    def test_trace_mode_with_real_jit(self, jax_array):
+        """Validation fires once at trace time, not on cached dispatches."""
+        import jax
+
+        calls = []
+
+        @jax.jit
+        @expects(x=(Dim("n"), 128), jit_mode="trace")
+        def f(x):
+            calls.append(x.shape)
+            return x + 1
+
+        f(jax_array((2, 128)))
+        f(jax_array((2, 128)))
+        assert len(calls) == 1
+
+        with pytest.raises(DimensionMismatchError):
+            f(jax_array((2, 64)))
+
+    @requires_jax
+    def test_trace_mode_outside_jit_warns(self):
+        """Applying trace mode on top of jax.jit warns at decoration."""
+        import jax
+
+        with pytest.warns(UserWarning, match="jit_mode='trace'"):
+
+            @expects(x=(3,), jit_mode="trace")
+            @jax.jit
+            def f(x):
+                return x
+
+
 class TestGlobalConfig:
     """Tests for global config affecting jit_mode."""
 
@@ -1,20 +1,24 @@
 """
-Tests for shapeguard.ml — pre-defined dims, attention_shapes, conv_output_shape.
+Tests for shapeguard.ml — pre-defined dims, attention_shapes, conv_output_shape, einsum.
 """
 
 import pytest
 
-from shapeguard import Batch, Dim, expects
-from shapeguard.errors import UnificationError
+from shapeguard import Batch, Dim, contract, expects
+from shapeguard.core import ELLIPSIS
+from shapeguard.errors import BroadcastError, RankMismatchError, UnificationError
 from shapeguard.ml import (
     B,
     C,
     D,
+    EinsumSpec,
     H,
     T,
     W,
     attention_shapes,
     conv_output_shape,
+    einsum_cost,
+    einsum_shapes,
 )
 from tests.conftest import requires_numpy
 
@@ -273,3 +277,160 @@ class TestConvOutputShape:
         """Padding tuple length must match spatial dims."""
         with pytest.raises(ValueError, match="padding has length 1.*expected 2"):
             conv_output_shape(input=(1, 3, 32, 32), kernel=3, padding=(1,))
+
+
+# ---------------------------------------------------------------------------
+# Einsum
+# ---------------------------------------------------------------------------
+
+
+class TestEinsumSpec:
+    """Tests for EinsumSpec parsing and shapes."""
+
+    def test_specs_share_dims(self):
+        spec = EinsumSpec("bhqd,bhkd->bhqk")
+        q, k = spec.inputs
+        assert [d.name for d in q] == ["b", "h", "q", "d"]
+        assert q[0] is k[0] and q[3] is k[3]
+        assert spec.output == (q[0], q[1], q[2], k[2])
+
+    def test_dims_override(self):
+        spec = EinsumSpec("btd,de->bte", dims={"b": B, "e": 16})
+        assert spec.inputs[0][0] is B
+        assert spec.output[2] == 16
+
+    def test_implicit_output(self):
+        assert [d.name for d in EinsumSpec("ij,jk").output] == ["i", "k"]
+        assert EinsumSpec("ii").output == ()
+
+    def test_ellipsis(self):
+        spec = EinsumSpec("...ij,...jk->...ik")
+        assert spec.inputs[0][0] is ELLIPSIS
+        assert spec.output_shape((5, 1, 2, 3), (4, 3, 6)) == (5, 4, 2, 6)
+        with pytest.raises(BroadcastError):
+            spec.output_shape((5, 2, 3), (4, 3, 6))
+
+    @pytest.mark.parametrize("subscripts", ["ij,jk->iz", "ij->ii", "i1,j->ij", "...i...,j"])
+    def test_malformed(self, subscripts):
+        with pytest.raises(ValueError):
+            EinsumSpec(subscripts)
+
+    def test_unknown_dims_label(self):
+        with pytest.raises(ValueError, match="not in"):
+            EinsumSpec("ij->i", dims={"z": 3})
+
+    def test_output_shape_validates(self):
+        spec = EinsumSpec("bij,bjk->bik")
+        assert spec.output_shape((2, 3, 4), (2, 4, 5)) == (2, 3, 5)
+        with pytest.raises(UnificationError):
+            spec.output_shape((2, 3, 4), (2, 3, 5))
+        with pytest.raises(RankMismatchError):
+            spec.output_shape((2, 3, 4), (4, 5))
+        with pytest.raises(ValueError, match="2 operands"):
+            spec.output_shape((2, 3, 4))
+
+    def test_einsum_shapes_names(self):
+        shapes = einsum_shapes("bhqd,bhkd->bhqk", "q", "k")
+        assert list(shapes) == ["q", "k"]
+        with pytest.raises(ValueError, match="2 operands"):
+            einsum_shapes("bhqd,bhkd->bhqk", "q")
+
+    @requires_numpy
+    def test_integration_with_expects(self, np_array):
+        @expects(**einsum_shapes("bhqd,bhkd->bhqk", "q", "k"))
+        def scores(q, k):
+            return q
+
+        scores(np_array((2, 4, 10, 8)), np_array((2, 4, 12, 8)))
+        with pytest.raises(UnificationError):
+            scores(np_array((2, 4, 10, 8)), np_array((2, 4, 12, 16)))
+
+    @requires_numpy
+    def test_integration_with_contract(self, np_array):
+        import numpy as np
+
+        spec = EinsumSpec("bhqd,bhkd->bhqk")
+
+        @contract(inputs=spec.shapes("q", "k"), output=spec.output)
+        def scores(q, k):
+            return np.einsum(spec.subscripts, q, k)
+
+        assert scores(np_array((2, 4, 10, 8)), np_array((2, 4, 12, 8))).shape == (2, 4, 10, 12)
+
+
+class TestEinsumCost:
+    """Tests for einsum FLOP and memory estimates."""
+
+    def test_chain_order(self):
+        cost = einsum_cost("ij,jk,kl->il", (1000, 2), (2, 1000), (1000, 1000))
+        assert cost.naive_flops == 6_000_000_000
+        assert cost.flops == 8_000_000
+        assert cost.path == ((1, 2), (0, 1))
+        assert cost.steps == ("jk,kl->jl", "ij,jl->il")
+        assert cost.speedup == 750.0
+        assert cost.largest_intermediate == 1_000_000
+
+    def test_single_pair(self):
+        cost = einsum_cost("bhqd,bhkd->bhqk", (2, 4, 16, 8), (2, 4, 32, 8))
+        assert cost.path == ((0, 1),)
+        assert cost.flops == cost.naive_flops == 2 * 4 * 16 * 32 * 8 * 2
+        assert cost.output_elements == 2 * 4 * 16 * 32
+
+    def test_single_operand(self):
+        cost = einsum_cost("ii->i", (5, 5))
+        assert cost.path == ((0,),)
+        assert cost.steps == ("ii->i",)
+
+    def test_bytes(self):
+        cost = einsum_cost("ij,jk->ik", (3, 4), (4, 5), dtype="float32")
+        assert cost.itemsize == 4
+        assert cost.output_bytes == 60
+        assert einsum_cost("ij,jk->ik", (3, 4), (4, 5)).output_bytes is None
+
+    @requires_numpy
+    @pytest.mark.parametrize(
+        ("subscripts", "shapes"),
+        [
+            ("ij,jk->ik", [(3, 4), (4, 5)]),
+            ("i,i->", [(5,), (5,)]),
+            ("ij,kl->ijkl", [(2, 3), (4, 5)]),
+            ("ii->i", [(4, 4)]),
+            ("ij,jk,kl->il", [(10, 20), (20, 30), (30, 5)]),
+            ("ab,bc,cd,de->ae", [(2, 30), (30, 4), (4, 3), (3, 5)]),
+        ],
+    )
+    def test_flops_exactly_match_numpy_einsum_path(self, subscripts, shapes):
+        """Naive counts are equal; numpy's optimized count is flops + 1."""
+        import re
+
+        import numpy as np
+
+        operands = [np.ones(s) for s in shapes]
+        path, info = np.einsum_path(subscripts, *operands, optimize="optimal")
+        cost = einsum_cost(subscripts, *shapes)
+
+        # Small enough that numpy's 4 significant digits are exact
+        naive = float(re.search(r"Naive FLOP count:\s+(\S+)", info).group(1))
+        optimal = float(re.search(r"Optimized FLOP count:\s+(\S+)", info).group(1))
+        assert cost.naive_flops == naive
+        assert cost.flops + 1 == optimal
+        assert cost.einsum_path == path
+
+    @requires_numpy
+    def test_matches_numpy_einsum_path(self):
+        """FLOPs match numpy's, and the path is a valid einsum optimize argument."""
+        import re
+
+        import numpy as np
+
+        subscripts = "ab,bc,cd,de->ae"
+        operands = [np.ones(s) for s in [(8, 64), (64, 2), (2, 64), (64, 8)]]
+        _, info = np.einsum_path(subscripts, *operands, optimize="optimal")
+        cost = einsum_cost(subscripts, *operands)
+
+        naive = float(re.search(r"Naive FLOP count:\s+(\S+)", info).group(1))
+        optimal = float(re.search(r"Optimized FLOP count:\s+(\S+)", info).group(1))
+        assert cost.naive_flops == pytest.approx(naive, rel=1e-3)
+        assert cost.flops == pytest.approx(optimal, rel=1e-3)
+        assert cost.itemsize == 8
+        np.einsum(subscripts, *operands, optimize=cost.einsum_path)
@@ -0,0 +1,209 @@
+"""
+Tests for path-pattern PyTree specs.
+"""
+
+import dataclasses
+import re
+from typing import Any, NamedTuple
+from unittest.mock import patch
+
+import pytest
+
+from shapeguard import Dim, PathSpec, ShapeGuardError, contract, expects
+from shapeguard.core import UnificationContext
+from shapeguard.errors import UnificationError
+from shapeguard.paths import CompiledPathSpec, compile_path_spec
+from tests.conftest import HAS_JAX, requires_numpy
+
+
+class Attn(NamedTuple):
+    q: Any
+    k: Any
+
+
+@dataclasses.dataclass
+class Norm:
+    scale: Any
+    bias: Any
+
+
+# Flatten with JAX and with the pure-Python flattener
+@pytest.fixture(params=["jax", "python"])
+def flatten_backend(request):
+    if request.param == "jax":
+        if not HAS_JAX:
+            pytest.skip("JAX not installed")
+        yield request.param
+    else:
+        with patch("shapeguard.paths.get_tree_flatten", return_value=None):
+            yield request.param
+
+
+def _layers(np_array, n_layers, d=8, h=2):
+    return {
+        "embed": np_array((100, d)),
+        "layers": [
+            {
+                "attn": {"q_proj": {"kernel": np_array((d, h, d // h))}},
+                "mlp": {"up": {"bias": np_array((4 * d,))}, "down": {"bias": np_array((d,))}},
+            }
+            for _ in range(n_layers)
+        ],
+    }
+
+
+class TestPathMatching:
+    """Tests for the pattern trie."""
+
+    @pytest.mark.parametrize(
+        ("path", "rules"),
+        [
+            ("layers/0/attn/q_proj/kernel", [0]),
+            ("layers/11/attn/q_proj/kernel", [0]),
+            ("layers/0/attn/k_proj/kernel", [1]),
+            ("layers/0/mlp/up/bias", [2]),
+            ("layers/0/mlp/a/b/c/bias", [2]),
+            ("layers/0/mlp/bias", [2]),
+            ("embed", [3]),
+            ("layers/0/attn", []),
+            ("other/0/attn/q_proj/kernel", []),
+        ],
+    )
+    def test_glob_patterns(self, path, rules):
+        spec = compile_path_spec(
+            PathSpec(
+                {
+                    "layers/*/attn/q_proj/kernel": (None,),
+                    "layers/*/attn/[kv]_proj/kernel": (None,),
+                    "layers/*/mlp/**/bias": (None,),
+                    "embed": (None,),
+                }
+            )
+        )
+        assert spec.match_path(path) == rules
+
+    def test_overlapping_and_regex(self):
+        spec = compile_path_spec(
+            PathSpec({"**/kernel": (None,), re.compile(r"layers/\d+/.*"): (None,)})
+        )
+        assert spec.match_path("layers/3/attn/kernel") == [0, 1]
+        assert spec.match_path("kernel") == [0]
+        assert spec.match_path("layers/x/bias") == []
+
+    def test_invalid_pattern(self):
+        with pytest.raises(TypeError, match="path pattern"):
+            compile_path_spec(PathSpec({3: (None,)}))
+
+
+class TestPathSpec:
+    """Tests for PathSpec in decorators."""
+
+    @requires_numpy
+    def test_dims_shared_across_matches(self, np_array, flatten_backend):
+        D, H, K = Dim("D"), Dim("H"), Dim("K")
+
+        @expects(
+            params=PathSpec(
+                {
+                    "layers/*/attn/q_proj/kernel": (D, H, K),
+                    "layers/*/mlp/down/bias": (D,),
+                    "embed": (None, D),
+                }
+            )
+        )
+        def apply(params):
+            return params
+
+        params = _layers(np_array, 4)
+        apply(params)
+
+        params["layers"][2]["mlp"]["down"]["bias"] = np_array((9,))
+        with pytest.raises(UnificationError) as exc_info:
+            apply(params)
+        assert exc_info.value.actual_source == "params['layers'][2]['mlp']['down']['bias'][0]"
+
+    @requires_numpy
+    def test_strict_unmatched_pattern(self, np_array, flatten_backend):
+        @expects(params=PathSpec({"layers/*/attn/v_proj/kernel": (None, None, None)}))
+        def f(params):
+            return params
+
+        with pytest.raises(ShapeGuardError, match="v_proj"):
+            f(_layers(np_array, 1))
+
+        @expects(params=PathSpec({"layers/*/attn/v_proj/kernel": (None,)}, strict=False))
+        def g(params):
+            return params
+
+        g(_layers(np_array, 1))
+
+    @requires_numpy
+    def test_non_array_leaf(self, np_array, flatten_backend):
+        @expects(cfg=PathSpec({"size": (None,)}))
+        def f(cfg):
+            return cfg
+
+        with pytest.raises(ShapeGuardError) as exc_info:
+            f({"size": 3})
+        assert exc_info.value.argument == "cfg['size']"
+
+    @requires_numpy
+    def test_namedtuple_paths(self, np_array, flatten_backend):
+        n = Dim("n")
+
+        @expects(state=PathSpec({"attn/*": (n,)}))
+        def f(state):
+            return state
+
+        f({"attn": Attn(np_array((3,)), np_array((3,)))})
+        with pytest.raises(UnificationError):
+            f({"attn": Attn(np_array((3,)), np_array((4,)))})
+
+    @requires_numpy
+    def test_dataclass_paths(self, np_array, flatten_backend):
+        """Unregistered dataclasses are recursed into by either flattener."""
+        n = Dim("n")
+        plan = compile_path_spec(PathSpec({"norm/*": (n,)}), "state")
+
+        value = {"norm": Norm(np_array((3,)), np_array((3,)))}
+        assert plan.shape_key(value) == (
+            ("state['norm'].scale", (3,)),
+            ("state['norm'].bias", (3,)),
+        )
+        with pytest.raises(UnificationError):
+            plan.check({"norm": Norm(np_array((3,)), np_array((4,)))}, UnificationContext())
+
+    @requires_numpy
+    def test_cache_miss_matches_once(self, np_array, flatten_backend):
+        plan = compile_path_spec(PathSpec({"*": (2,)}), "x", cache=4)
+        with patch.object(
+            CompiledPathSpec, "_matches", autospec=True, side_effect=CompiledPathSpec._matches
+        ) as matches:
+            plan.check({"a": np_array((2,))}, UnificationContext())
+        assert matches.call_count == 1
+
+    @requires_numpy
+    def test_tree_cache(self, np_array, flatten_backend):
+        D, B = Dim("D"), Dim("B")
+
+        @expects(params=PathSpec({"layers/*/mlp/down/bias": (D,)}), x=(B, D), cache=4)
+        def f(params, x):
+            return x
+
+        params = _layers(np_array, 3)
+        for batch in (1, 2, 3):
+            f(params, np_array((batch, 8)))
+        assert f.__shapeguard_tree_caches__["params"].hits == 2
+
+        with pytest.raises(UnificationError):
+            f(params, np_array((1, 9)))
+
+    @requires_numpy
+    def test_output_path_spec(self, np_array, flatten_backend):
+        n = Dim("n")
+
+        @contract(inputs={"x": (n,)}, output=PathSpec({"*/h": (n,)}))
+        def f(x):
+            return {"a": {"h": x}, "b": {"h": x}}
+
+        f(np_array((3,)))
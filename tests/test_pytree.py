@@ -2,10 +2,16 @@
 Tests for PyTree shape specifications.
 """
 
+import dataclasses
+from typing import Any, NamedTuple
+from unittest.mock import patch
+
 import pytest
 
-from shapeguard import Dim, ShapeGuardError, expects
-from tests.conftest import requires_numpy
+from shapeguard import Dim, ShapeGuardError, UnificationContext, expects
+from shapeguard.errors import UnificationError
+from shapeguard.pytree import compile_pytree
+from tests.conftest import HAS_JAX, requires_jax, requires_numpy
 
 
 class TestPyTreeSpecs:
@@ -159,3 +165,149 @@ class TestPyTreeSpecs:
             }
         )
         assert result == (10, 64)
+
+
+class Pair(NamedTuple):
+    w: Any
+    b: Any
+
+
+@dataclasses.dataclass
+class Layer:
+    kernel: Any
+    bias: Any
+
+
+# Validate both with JAX flattening and with the pure-Python path walk
+@pytest.fixture(params=["jax", "walk"])
+def flatten_backend(request):
+    if request.param == "jax":
+        if not HAS_JAX:
+            pytest.skip("JAX not installed")
+        yield request.param
+    else:
+        with patch("shapeguard.pytree.get_tree_flatten", return_value=None):
+            yield request.param
+
+
+class TestContainerSpecs:
+    """Tests for list, tuple, NamedTuple and dataclass specs."""
+
+    @requires_numpy
+    def test_list_spec(self, np_array, flatten_backend):
+        n = Dim("n")
+
+        @expects(layers=[{"w": (n, 4)}, {"w": (4, n)}])
+        def f(layers):
+            return len(layers)
+
+        assert f([{"w": np_array((3, 4))}, {"w": np_array((4, 3))}]) == 2
+        with pytest.raises(UnificationError) as exc_info:
+            f([{"w": np_array((3, 4))}, {"w": np_array((4, 5))}])
+        assert "layers[1]['w'][1]" in str(exc_info.value)
+
+    @requires_numpy
+    def test_sequence_length_mismatch(self, np_array, flatten_backend):
+        @expects(xs=[(2,), (2,)])
+        def f(xs):
+            return xs
+
+        with pytest.raises(ShapeGuardError) as exc_info:
+            f([np_array((2,))] * 3)
+        assert exc_info.value.expected == "sequence of length 2"
+        assert exc_info.value.actual == "list of length 3"
+
+    @requires_numpy
+    def test_tuple_of_specs(self, np_array, flatten_backend):
+        n = Dim("n")
+
+        @expects(pair=((n,), (n, 2)))
+        def f(pair):
+            return pair
+
+        f((np_array((3,)), np_array((3, 2))))
+        with pytest.raises(UnificationError):
+            f((np_array((3,)), np_array((4, 2))))
+
+    @requires_numpy
+    def test_namedtuple_spec(self, np_array, flatten_backend):
+        n = Dim("n")
+
+        @expects(p=Pair(w=(n, 2), b=(n,)))
+        def f(p):
+            return p
+
+        f(Pair(np_array((5, 2)), np_array((5,))))
+        with pytest.raises(UnificationError) as exc_info:
+            f(Pair(np_array((5, 2)), np_array((6,))))
+        assert "p.b[0]" in str(exc_info.value)
+
+    @requires_numpy
+    def test_dataclass_spec(self, np_array, flatten_backend):
+        d = Dim("d")
+
+        @expects(layer=Layer(kernel=(d, d), bias=(d,)))
+        def f(layer):
+            return layer
+
+        f(Layer(np_array((4, 4)), np_array((4,))))
+        with pytest.raises(UnificationError):
+            f(Layer(np_array((4, 4)), np_array((3,))))
+        with pytest.raises(ShapeGuardError, match="attribute 'kernel'"):
+            f({"kernel": np_array((4, 4))})
+
+    @requires_numpy
+    def test_spec_order_precedence(self, np_array, flatten_backend):
+        """Leaves bind in spec order even though JAX sorts dict keys."""
+        n = Dim("n")
+
+        @expects(params={"w": (n,), "b": (n,)})
+        def f(params):
+            return params
+
+        with pytest.raises(UnificationError) as exc_info:
+            f({"w": np_array((3,)), "b": np_array((4,))})
+        err = exc_info.value
+        assert err.expected_source == "params['w'][0]"
+        assert err.actual_source == "params['b'][0]"
+
+    @requires_numpy
+    def test_non_array_leaf(self, np_array, flatten_backend):
+        @expects(params={"w": (2,)})
+        def f(params):
+            return params
+
+        with pytest.raises(ShapeGuardError) as exc_info:
+            f({"w": 1.0})
+        assert exc_info.value.argument == "params['w']"
+        assert exc_info.value.actual == "float"
+
+    def test_invalid_leaf_rejected_at_decoration(self):
+        with pytest.raises(TypeError, match="Invalid spec for x\\['w'\\]"):
+
+            @expects(x={"w": "bad"})
+            def f(x):
+                return x
+
+
+class TestCompiledPyTree:
+    """Tests for compile_pytree."""
+
+    def test_flattened_leaves(self):
+        n = Dim("n")
+        tree = compile_pytree({"a": {"w": (n, 2), "b": (n,)}, "c": [(1,), ()]}, "p")
+        assert len(tree) == 4
+        assert repr(tree) == "CompiledPyTree(p, leaves=4)"
+
+    @requires_numpy
+    def test_shape_key(self, np_array, flatten_backend):
+        tree = compile_pytree({"w": (None, 2), "b": (None,)}, "p")
+        assert tree.shape_key({"w": np_array((3, 2)), "b": np_array((3,))}) == ((3, 2), (3,))
+        assert tree.shape_key({"w": np_array((3, 2))}) is None
+        assert tree.shape_key({"w": np_array((3, 2)), "b": 1}) is None
+
+    @requires_jax
+    def test_unregistered_dataclass_falls_back(self, jax_array):
+        """JAX treats unregistered dataclasses as leaves; the path walk handles them."""
+        tree = compile_pytree(Layer(kernel=(2, 2), bias=(2,)), "layer")
+        tree.check(Layer(jax_array((2, 2)), jax_array((2,))), UnificationContext())
@@ -0,0 +1,112 @@
+"""
+Tests for shapeguard.recompile — retrace detection from contract bindings.
+"""
+
+import pytest
+
+from shapeguard import Dim, config, contract, ensures, expects
+from shapeguard.recompile import RecompileMonitor
+from tests.conftest import requires_jax
+
+B, T, D = Dim("B"), Dim("T"), Dim("D")
+
+
+@requires_jax
+class TestRecompileMonitor:
+    """Tests for recording traces and reporting churn."""
+
+    def test_reports_changing_dims(self, np_array):
+        import jax
+        import numpy as np
+
+        @jax.jit
+        @expects(x=(B, T, D))
+        def step(x):
+            return x.sum()
+
+        with RecompileMonitor() as monitor:
+            for length in (3, 4, 5, 3, 4, 6):
+                step(np_array((2, length, 4)))
+            step(np.ones((2, 6, 4), np.int32))
+
+        summary = monitor.report()[step.__wrapped__.__qualname__]
+        assert summary.traces == summary.compiles == 5
+        assert summary.values[T] == (3, 4, 5, 6)
+        assert summary.values[B] == (2,)
+        assert summary.changed == {T: 3}
+        assert summary.unexplained == 1
+        assert summary.compile_seconds > 0
+
+        text = summary.format()
+        assert "compiled 5 times" in text
+        assert "T took 4 distinct values: 3, 4, 5, 6 (changed in 3 retraces)" in text
+        assert "1 retrace with no Dim change" in text
+        assert "B took" not in text
+
+    def test_records_only_traced_calls(self, np_array):
+        import jax
+
+        @contract(inputs={"x": (B, D)}, output=(B,))
+        def reduce(x):
+            return x.sum(-1)
+
+        @ensures(result=(T,))
+        def ident(x):
+            return x
+
+        with RecompileMonitor() as monitor:
+            reduce(np_array((2, 3)))
+            jax.jit(reduce)(np_array((2, 3)))
+            jax.eval_shape(ident, np_array((5,)))
+
+        assert [(r.function.split(".")[-1], r.bindings) for r in monitor.records] == [
+            ("reduce", {B: 2, D: 3}),
+            ("ident", {T: 5}),
+        ]
+        assert monitor.records[0].compiled
+        assert not monitor.records[1].compiled
+        assert "traced once" in monitor.report().format()
+
+    def test_start_stop_and_nesting(self, np_array):
+        import jax
+
+        f = jax.jit(expects(x=(T,))(lambda x: x))
+        outer = RecompileMonitor().start()
+        with pytest.raises(RuntimeError):
+            outer.start()
+        with RecompileMonitor() as inner:
+            f(np_array((1,)))
+        f(np_array((2,)))
+        outer.stop()
+        f(np_array((3,)))
+
+        assert [r.bindings[T] for r in inner.records] == [1]
+        assert [r.bindings[T] for r in outer.records] == [2]
+        assert config._monitor is None
+        outer.reset()
+        assert outer.report().format() == "No traced shapeguard functions"
+
+    def test_stop_out_of_order(self, np_array):
+        """Stopping a monitor that isn't innermost leaves the others active."""
+        import jax
+
+        f = jax.jit(expects(x=(T,))(lambda x: x))
+        a, b, c = RecompileMonitor(), RecompileMonitor(), RecompileMonitor()
+        for monitor in (a, b, c):
+            monitor.start()
+
+        b.stop()
+        assert config._monitor is c
+        c.stop()
+        assert config._monitor is a
+        f(np_array((1,)))
+        a.stop()
+        assert config._monitor is None
+        assert [len(m.records) for m in (a, b, c)] == [1, 0, 0]
+
+        a.start()
+        b.start()
+        a.stop()
+        assert config._monitor is b
+        b.stop()
+        assert config._monitor is None
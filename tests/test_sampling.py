@@ -0,0 +1,137 @@
+"""
+Tests for sampled contract checking.
+"""
+
+import random
+
+import pytest
+
+from shapeguard import Dim, config, contract, ensures, expects
+from shapeguard.config import Config, Sampler
+from shapeguard.errors import DimensionMismatchError, UnificationError
+from tests.conftest import requires_numpy
+
+
+class TestSampleConfig:
+    """Tests for the sampling policy setting."""
+
+    def test_default_checks_every_call(self):
+        assert Config().sample == 1
+
+    @pytest.mark.parametrize("value", [1, 10, 0.5, 1.0])
+    def test_valid_values(self, value):
+        c = Config()
+        c.sample = value
+        assert c.sample == value
+
+    @pytest.mark.parametrize("value", [0, -3, 0.0, 1.5, True, "10"])
+    def test_invalid_values(self, value):
+        c = Config()
+        with pytest.raises(ValueError, match="Invalid sample"):
+            c.sample = value
+
+
+class TestSampler:
+    """Tests for the per-function Sampler."""
+
+    def test_every_nth(self):
+        """Int policy checks the 1st, N+1th, ... call."""
+        sampler = Sampler(3)
+        decisions = [sampler.should_check() for _ in range(7)]
+
+        assert decisions == [True, False, False, True, False, False, True]
+        assert (sampler.checked, sampler.skipped) == (3, 4)
+
+    def test_probability(self):
+        """Float policy checks roughly that fraction of calls."""
+        random.seed(0)
+        sampler = Sampler(0.25)
+        for _ in range(2000):
+            sampler.should_check()
+
+        assert 0.2 < sampler.coverage < 0.3
+
+    def test_follows_global(self):
+        """Without an override, the global policy applies at call time."""
+        sampler = Sampler()
+        original = config.sample
+        try:
+            config.sample = 2
+            assert [sampler.should_check() for _ in range(4)] == [True, False, True, False]
+        finally:
+            config.sample = original
+
+    def test_reset(self):
+        sampler = Sampler(2)
+        sampler.should_check()
+        sampler.should_check()
+        sampler.reset()
+
+        assert (sampler.checked, sampler.skipped) == (0, 0)
+        assert sampler.coverage == 1.0
+
+
+class TestSampledDecorators:
+    """Tests for sample= on the decorators."""
+
+    @requires_numpy
+    def test_expects_sampled(self, np_array):
+        """Sampled-out calls are not validated."""
+
+        @expects(x=(3,), sample=2)
+        def f(x):
+            return x
+
+        bad = np_array((4,))
+        with pytest.raises(DimensionMismatchError):
+            f(bad)  # 1st call: checked
+        f(bad)  # 2nd call: skipped
+
+        sampler = f.__shapeguard_sampler__
+        assert (sampler.checked, sampler.skipped) == (1, 1)
+
+    @requires_numpy
+    def test_expects_skips_stacked_ensures(self, np_array):
+        """A sampled-out @expects also skips the stacked output check."""
+        n = Dim("n")
+
+        @expects(x=(n,), sample=2)
+        @ensures(result=(n,))
+        def f(x):
+            return np_array((5,))
+
+        with pytest.raises(UnificationError):
+            f(np_array((3,)))
+        f(np_array((3,)))  # skipped, output not checked either
+
+    @requires_numpy
+    def test_ensures_sampled(self, np_array):
+        @ensures(result=(3,), sample=2)
+        def f(x):
+            return x
+
+        with pytest.raises(DimensionMismatchError):
+            f(np_array((4,)))
+        f(np_array((4,)))
+        assert f.__shapeguard_sampler__.skipped == 1
+
+    @requires_numpy
+    def test_contract_sampled(self, np_array):
+        @contract(inputs={"x": (3,)}, output=(3,), sample=3)
+        def f(x):
+            return x
+
+        bad = np_array((4,))
+        with pytest.raises(DimensionMismatchError):
+            f(bad)
+        f(bad)
+        f(bad)
+        with pytest.raises(DimensionMismatchError):
+            f(bad)
+
+    def test_invalid_sample_arg(self):
+        with pytest.raises(ValueError, match="Invalid sample"):
+
+            @expects(x=(3,), sample=0)
+            def f(x):
+                return x
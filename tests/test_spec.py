@@ -10,7 +10,14 @@ from shapeguard.errors import (
     RankMismatchError,
     UnificationError,
 )
-from shapeguard.spec import check_shape, format_spec, match_shape
+from shapeguard.spec import (
+    CompiledSpec,
+    _compile_cached,
+    check_shape,
+    compile_spec,
+    format_spec,
+    match_shape,
+)
 from tests.conftest import requires_numpy
 
 
@@ -84,6 +91,94 @@ class TestMatchShape:
         assert ctx.resolve(n) == 5
 
 
+class TestCompileSpec:
+    """Tests for precompiled spec plans."""
+
+    def test_plan_slots(self):
+        """Plan records rank, fixed, symbolic and wildcard slots."""
+        n = Dim("n")
+        plan = compile_spec((n, 128, None))
+
+        assert plan.rank == 3
+        assert plan.has_ellipsis is False
+        assert plan.fixed == ((1, 128),)
+        assert plan.dims == ((0, n),)
+        assert plan.wildcards == (2,)
+
+    def test_plan_ellipsis_offsets(self):
+        """Slots after the ellipsis are indexed from the end."""
+        n, m = Dim("n"), Dim("m")
+        plan = compile_spec((n, ..., m, 4))
+
+        assert plan.rank == 3
+        assert plan.has_ellipsis is True
+        assert plan.dims == ((0, n), (-2, m))
+        assert plan.fixed == ((-1, 4),)
+
+    def test_plan_match(self):
+        """Plans match shapes like match_shape."""
+        n = Dim("n")
+        plan = compile_spec((..., n, 4))
+        ctx = UnificationContext()
+
+        plan.match((2, 3, 4), ctx, "x")
+
+        assert ctx.resolve(n) == 3
+        assert ctx.get_binding_source(n) == "x[1]"
+
+    def test_plan_ellipsis_error_index(self):
+        """Mismatch after the ellipsis reports the absolute dim index."""
+        plan = compile_spec((..., 4))
+
+        with pytest.raises(DimensionMismatchError, match=r"dim\[2\] expected 4, got 5"):
+            plan.match((2, 3, 5), UnificationContext(), "x")
+
+    def test_plan_min_rank(self):
+        """Ellipsis plans report the minimum rank."""
+        n = Dim("n")
+        with pytest.raises(RankMismatchError, match=r"expected rank 2\+"):
+            compile_spec((..., n, n)).match((3,), UnificationContext(), "x")
+
+    def test_compile_is_cached(self):
+        """The same spec tuple compiles to the same plan."""
+        n = Dim("n")
+        assert compile_spec((n, 3)) is compile_spec((n, 3))
+
+    def test_cache_is_bounded(self):
+        """The plan cache (and the Dims it pins) has a fixed size."""
+        assert _compile_cached.cache_info().maxsize == 1024
+
+    def test_compile_plan_passthrough(self):
+        """Compiling a plan returns it unchanged."""
+        plan = compile_spec((3, 4))
+        assert compile_spec(plan) is plan
+        assert isinstance(plan, CompiledSpec)
+
+    def test_invalid_element_raises_at_compile(self):
+        """Invalid spec elements are rejected when compiling."""
+        with pytest.raises(TypeError, match="Invalid spec element"):
+            compile_spec((3, "n"))
+
+    def test_cache_does_not_mask_invalid_equal_spec(self):
+        """A float spec equal to a cached int spec is still rejected."""
+        compile_spec((1, 2))
+        with pytest.raises(TypeError, match="Invalid spec element"):
+            compile_spec((1.0, 2))
+
+    def test_multiple_ellipsis_raises_at_compile(self):
+        """More than one ellipsis is rejected when compiling."""
+        with pytest.raises(ValueError, match="more than one ellipsis"):
+            compile_spec((..., 3, ...))
+
+    @requires_numpy
+    def test_check_shape_accepts_plan(self, np_array):
+        """check_shape runs a precompiled plan directly."""
+        n = Dim("n")
+        plan = compile_spec((n, 20))
+        ctx = check_shape(np_array((10, 20)), plan, name="x")
+        assert ctx.resolve(n) == 10
+
+
 class TestCheckShape:
     """Tests for the check_shape standalone function."""
 
@@ -0,0 +1,146 @@
+"""
+Tests for shapeguard.warmup — AOT compilation over contract Dim sizes.
+"""
+
+import pytest
+
+from shapeguard import Batch, Dim, contract, expects
+from shapeguard.errors import ShapeGuardError, UnificationError
+from tests.conftest import requires_jax
+
+B = Batch(buckets=(1, 4))
+T = Dim("T", buckets=(8, 16, 32))
+D = Dim("D")
+
+
+@requires_jax
+class TestWarmup:
+    """Tests for warmup."""
+
+    def test_compiles_bucket_combinations(self, np_array):
+        import jax
+
+        from shapeguard.warmup import warmup
+
+        @jax.jit
+        @expects(x=(B, T))
+        def f(x):
+            return x * 2
+
+        report = warmup(f)
+        assert len(report) == report.compiled == 6
+        assert [r.label for r in report.results[:3]] == [
+            "batch=1, T=8",
+            "batch=1, T=16",
+            "batch=1, T=32",
+        ]
+        result = report.results[0]
+        assert result.sizes == {B: 1, T: 8}
+        assert result.compile_seconds > 0 and result.compiled is not None
+        assert result.compiled(np_array((1, 8))).shape == (1, 8)
+        assert "Warmed up 6 shape combinations" in report.format()
+
+    def test_values_override_buckets(self):
+        import jax
+
+        from shapeguard.warmup import warmup
+
+        @expects(x=(B, T))
+        @jax.jit
+        def f(x):
+            return x
+
+        report = warmup(f, {"T": [5], B: (2, 3)}, max_workers=2)
+        assert [r.sizes for r in report.results] == [{B: 2, T: 5}, {B: 3, T: 5}]
+
+    def test_fixed_arguments_and_dtypes(self, np_array):
+        import jax.numpy as jnp
+        import numpy as np
+
+        from shapeguard.warmup import warmup
+
+        @contract(inputs={"params": {"w": (D, D)}, "tokens": (B, T)}, output=(B, T, D))
+        def embed(params, tokens, scale):
+            return params["w"][tokens] * scale
+
+        params = {"w": np_array((6, 6))}
+        report = warmup(
+            embed,
+            {T: [8]},
+            dtype={"tokens": jnp.int32},
+            fixed={"params": params, "scale": np.float32(2)},
+        )
+        report.raise_if_any()
+        assert [r.sizes for r in report.results] == [{B: 1, T: 8}, {B: 4, T: 8}]
+
+    def test_failures_are_recorded(self):
+        import jax
+
+        from shapeguard.warmup import warmup
+
+        @jax.jit
+        @contract(inputs={"x": (B, T)}, output=(T, B))
+        def f(x):
+            return x
+
+        report = warmup(f, {T: [8]})
+        assert len(report.failures()) == 2 and report.compiled == 0
+        assert isinstance(report.failures()[0].error, UnificationError)
+        assert "failed: UnificationError" in report.format()
+        with pytest.raises(ShapeGuardError):
+            report.raise_if_any()
+
+    def test_input_errors(self, np_array):
+        from shapeguard.warmup import warmup
+
+        @expects(x=(B, D))
+        def f(x): ...
+
+        @expects(x=(T,))
+        def g(x, y): ...
+
+        @expects(w=(D, D), x=(T,))
+        def h(w, x): ...
+
+        with pytest.raises(ValueError, match="'D'"):
+            warmup(f)
+        with pytest.raises(ValueError, match="fixed="):
+            warmup(g)
+        with pytest.raises(ValueError, match="@expects"):
+            warmup(lambda x: x)
+        with pytest.raises(ShapeGuardError):
+            warmup(h, fixed={"w": np_array((2, 3))})
+
+    def test_reports_persistent_cache_hits(self, tmp_path):
+        import jax
+        import jax.numpy as jnp
+        from jax._src import compilation_cache
+
+        from shapeguard.warmup import warmup
+
+        def make():
+            @jax.jit
+            @expects(x=(T,))
+            def f(x):
+                return jnp.sin(x) * 3
+
+            return f
+
+        options = {
+            "jax_compilation_cache_dir": str(tmp_path),
+            "jax_persistent_cache_min_compile_time_secs": 0,
+            "jax_persistent_cache_min_entry_size_bytes": 0,
+        }
+        previous = {name: getattr(jax.config, name) for name in options}
+        try:
+            for name, value in options.items():
+                jax.config.update(name, value)
+            compilation_cache.reset_cache()
+            assert warmup(make()).compiled == 3
+            report = warmup(make())
+            assert report.cached == 3 and report.compiled == 0
+            assert "cached" in report.format()
+        finally:
+            for name, value in previous.items():
+                jax.config.update(name, value)
+            compilation_cache.reset_cache()